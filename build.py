@@ -17,7 +17,7 @@ from argparse import ArgumentParser
 from os import path
 
 from contract_generator.builder import Builder
-from contract_generator.writer import FileWriter
+from contract_generator.writer import FileWriter, PackageWriter
 
 CURRENT_PATH = path.dirname(__file__)
 CONTRACTS_DIR = 'contracts'
@@ -39,11 +39,17 @@ def parse_args() -> 'parser':
             <whitespace-delimited lists of contracts>
             clean 
             
+        Options:
+            --zip       builds a reproducible zip package per contract
+            --jobs N    the number of parallel workers for --zip
+            
         IF YOU DO NOT INSERT ANY WHITESPACE-DELIMITED LISTS OF CONTRACTS, 
         RANGE OF TARGET CONTRACT IS ALL.
         ''')
 
     parser.add_argument('command', nargs='*', default="")
+    parser.add_argument('--zip', action='store_true')
+    parser.add_argument('--jobs', type=int, default=None)
     return parser.parse_args()
 
 
@@ -60,7 +66,7 @@ def clean_build_dir(file_writer: FileWriter) -> None:
 
 
 def write_contracts_to_file_system(file_writer: FileWriter, contracts: list) -> None:
-    """Writes all of the files on path list to the file system
+    """Writes the changed files on path list to the file system
 
     :param file_writer: FileWrite instance
     :param contracts: list of contracts
@@ -69,14 +75,38 @@ def write_contracts_to_file_system(file_writer: FileWriter, contracts: list) ->
     try:
         builder = Builder(path.join(CURRENT_PATH, CONTRACTS_DIR), contracts)
         builder.build(file_writer)
-        print("Built {0} contract successfully".format(contracts if contracts else "all"))
+        if file_writer.written_contracts:
+            print("Built {0} contract successfully".format(file_writer.written_contracts))
+        if file_writer.skipped_contracts:
+            print("Skipped {0} contract which is up-to-date".format(file_writer.skipped_contracts))
+    except KeyError as e:
+        print('Wrong contract name:', e)
+
+
+def write_packages_to_file_system(output_root_path: str, contracts: list, jobs: int) -> None:
+    """Builds a zip package per contract in parallel and writes the changed ones to the file system
+
+    :param output_root_path: the output root directory where packages are set
+    :param contracts: list of contracts
+    :param jobs: the number of parallel workers
+    :return: None
+    """
+    try:
+        builder = Builder(path.join(CURRENT_PATH, CONTRACTS_DIR), contracts)
+        package_writer = PackageWriter(max_workers=jobs)
+        builder.build(package_writer)
+        written = package_writer.store_to_file(output_root_path)
+        for name in package_writer.packages:
+            print("{0}.zip {1}{2}".format(
+                name, package_writer.get_hash(name), "" if name in written else " (up-to-date)"))
     except KeyError as e:
         print('Wrong contract name:', e)
 
 
 def main():
     """Main procedure"""
-    command = parse_args().command
+    args = parse_args()
+    command = args.command
     output_root_path = path.join(CURRENT_PATH, OUTPUT_ROOT_DIR)
     file_writer = FileWriter(output_root_path)
 
@@ -84,6 +114,10 @@ def main():
         clean_build_dir(file_writer)
         return
 
+    if args.zip:
+        write_packages_to_file_system(output_root_path, command, args.jobs)
+        return
+
     write_contracts_to_file_system(file_writer, command)
 
 
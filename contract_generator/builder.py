@@ -18,32 +18,44 @@ from collections import namedtuple
 
 from contract_generator.writer import Writer
 from contract_generator.config import config
+from contract_generator.dependency import DependencyResolver
+from contract_generator.manifest import hash_file
+
+# name : contract name
+# path_list : contract's files and its dependencies path list in tuple
+# file_hashes : content hash of each file keyed by its new file path
+Contract = namedtuple("Contract", "name path_list file_hashes")
 
 
 class Builder:
 
     def __init__(self, contracts_path: str, contracts: list = None):
         """
-        1. Reads the contract and its dependencies info on config
+        1. Derives the contract's dependencies from its relative imports
+            and adds the additional dependencies on config
         2. Sets Contract in namedtuple
             - name : contract name
             - path_list : contract's files and its dependencies path list in tuple
             ex. [(current_file_path, new_file_path), (..), ..]
+            - file_hashes : content hash of each file keyed by its new file path
 
         :param contracts_path: contracts path
         :param contracts: contracts list
         """
         self.contract_list = []
         self._contracts_path = contracts_path
-        Contract = namedtuple("Contract", "name path_list")
+        resolver = DependencyResolver(contracts_path)
         for c in contracts if contracts else config:
-            contract = Contract(name=c, path_list=[])
+            contract = Contract(name=c, path_list=[], file_hashes={})
             self._append_contract_on_path_list(contract)
-            dependencies = config[c]
-            if config[c][-1] == "NOTICE":
-                self._append_notice_on_path_list(contract)
-                dependencies = config[c][:-1]
-            self._append_dependencies_on_path_list(contract, dependencies)
+            dependencies = set(resolver.resolve(c))
+            for dependency in config[c]:
+                if dependency == "NOTICE":
+                    self._append_notice_on_path_list(contract)
+                else:
+                    dependencies.add(dependency)
+            self._append_dependencies_on_path_list(contract, sorted(dependencies))
+            self._hash_path_list(contract)
             self.contract_list.append(contract)
 
     def build(self, writer: Writer) -> None:
@@ -54,6 +66,16 @@ class Builder:
         """
         writer.write(self.contract_list)
 
+    @staticmethod
+    def _hash_path_list(contract) -> None:
+        """Computes the content hash of every file on path list
+
+        :param contract: contract in namedtuple
+        :return: None
+        """
+        for cur_file_path, new_file_path in contract.path_list:
+            contract.file_hashes[new_file_path] = hash_file(cur_file_path)
+
     def _append_contract_on_path_list(self, contract) -> None:
         """Appends the contract and its files on path list as a tuple
 
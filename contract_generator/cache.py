@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hashlib import sha256
+from os import path, makedirs, replace, getpid
+from threading import Lock, get_ident
+
+from contract_generator.manifest import hash_contract
+from contract_generator.writer import ZipWriter, build_package
+
+DIGEST_FILE_EXTENSION = '.sha256'
+
+
+class PackageCache:
+    """
+    Cache of built zip packages keyed by the content hash of the contract.
+
+    Packages are kept in a process-wide memory cache and, if a cache directory is given,
+    in the file system as `<contract name>-<key>.zip` so that they are shared between processes and runs.
+    As the key changes whenever any file of the contract changes, stale entries are never returned.
+    Each package file has a `.sha256` file with its content hash, and entries which do not match it are rebuilt.
+    """
+
+    # key -> bytes of the zip package, shared by every instance in the process
+    _memory_cache = {}
+    _lock = Lock()
+
+    def __init__(self, cache_dir: str = None, compression: str = 'ZIP_DEFLATED') -> None:
+        """Initializes PackageCache
+
+        :param cache_dir: the directory where packages are cached, None to cache in memory only
+        :param compression: ZIP compression
+        """
+        self._cache_dir = cache_dir
+        self._compression_as_str = compression
+        self._compression = ZipWriter._convert_compression(compression)
+
+    def get_key(self, contract) -> str:
+        """Returns the cache key of the contract
+
+        :param contract: contract in namedtuple
+        :return: cache key
+        """
+        return sha256('{0}:{1}'.format(hash_contract(contract), self._compression_as_str).encode()).hexdigest()
+
+    def get(self, contract) -> bytes:
+        """Returns the zip package of the contract, building it only if it is not cached
+
+        :param contract: contract in namedtuple
+        :return: bytes of the zip package
+        """
+        key = self.get_key(contract)
+        package = self._memory_cache.get(key)
+        if package is not None:
+            return package
+
+        package = self._load(contract.name, key)
+        if package is None:
+            package = build_package(contract.path_list, self._compression)
+            self._store(contract.name, key, package)
+
+        with self._lock:
+            self._memory_cache[key] = package
+        return package
+
+    def _get_package_path(self, name: str, key: str) -> str:
+        return path.join(self._cache_dir, '{0}-{1}.zip'.format(name, key))
+
+    def _load(self, name: str, key: str) -> bytes:
+        if self._cache_dir is None:
+            return None
+
+        package_path = self._get_package_path(name, key)
+        digest_path = package_path + DIGEST_FILE_EXTENSION
+        if not path.isfile(package_path) or not path.isfile(digest_path):
+            return None
+        with open(package_path, 'rb') as f:
+            package = f.read()
+        with open(digest_path, 'r') as f:
+            digest = f.read().strip()
+
+        # A corrupted or truncated entry is rebuilt and overwritten instead of being deployed
+        if sha256(package).hexdigest() != digest:
+            return None
+        return package
+
+    def _store(self, name: str, key: str, package: bytes) -> None:
+        if self._cache_dir is None:
+            return
+
+        makedirs(self._cache_dir, exist_ok=True)
+        package_path = self._get_package_path(name, key)
+        # The digest is written after the package, so an entry without its digest is never trusted
+        self._write_atomic(package_path, package)
+        self._write_atomic(package_path + DIGEST_FILE_EXTENSION, sha256(package).hexdigest().encode())
+
+    @staticmethod
+    def _write_atomic(file_path: str, content: bytes) -> None:
+        # Writes to a temporary file and renames it, so concurrent readers never see a partial file
+        tmp_path = '{0}.{1}.{2}.tmp'.format(file_path, getpid(), get_ident())
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        replace(tmp_path, file_path)
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        """Clears the process-wide memory cache
+
+        :return: None
+        """
+        with cls._lock:
+            cls._memory_cache.clear()
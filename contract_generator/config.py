@@ -16,93 +16,32 @@
 """
 It is configuration file about Dex SCOREs and their dependencies.
 The config is the dictionary of which key is the main SCORE name
-and value is the list of the paths of the dependencies.
+and value is the list of the paths of the additional dependencies.
 
 In case of the key, although not writing on paths, all of its files will be imported later.
+The dependencies the SCORE imports are derived from its relative imports by the builder,
+so the value only needs to list the files which can not be found that way such as NOTICE.
 
 key: contract name
-value: list of dependency file paths
+value: list of additional dependency file paths
 
 """
 
 config = {
     "flexible_token": [
-        "interfaces/__init__.py",
-        "interfaces/abc_irc_token.py",
-        "interfaces/abc_token_holder.py",
-        "interfaces/abc_owned.py",
-        "interfaces/abc_flexible_token.py",
-        "irc_token/__init__.py",
-        "irc_token/irc_token.py",
-        "utility/__init__.py",
-        "utility/owned.py",
-        "utility/token_holder.py",
-        "utility/utils.py",
-        "utility/proxy_score.py",
         "NOTICE"
     ],
     "icx_token": [
-        "interfaces/__init__.py",
-        "interfaces/abc_icx_token.py",
-        "interfaces/abc_irc_token.py",
-        "interfaces/abc_token_holder.py",
-        "interfaces/abc_owned.py",
-        "irc_token/__init__.py",
-        "irc_token/irc_token.py",
-        "utility/__init__.py",
-        "utility/owned.py",
-        "utility/token_holder.py",
-        "utility/utils.py",
-        "utility/proxy_score.py",
         "NOTICE"
     ],
-    "irc_token": [
-        "interfaces/__init__.py",
-        "interfaces/abc_irc_token.py",
-    ],
+    "irc_token": [],
     "score_registry": [
-        "interfaces/__init__.py",
-        "interfaces/abc_score_registry.py",
-        "interfaces/abc_owned.py",
-        "utility/__init__.py",
-        "utility/owned.py",
-        "utility/utils.py",
-        "utility/proxy_score.py",
         "NOTICE"
     ],
     "network": [
-        "interfaces/__init__.py",
-        "interfaces/abc_flexible_token.py",
-        "interfaces/abc_irc_token.py",
-        "interfaces/abc_icx_token.py",
-        "interfaces/abc_token_holder.py",
-        "interfaces/abc_owned.py",
-        "interfaces/abc_converter.py",
-        "utility/__init__.py",
-        "utility/owned.py",
-        "utility/token_holder.py",
-        "utility/utils.py",
-        "utility/proxy_score.py",
         "NOTICE"
     ],
     "converter": [
-        "formula/__init__.py",
-        "formula/fixed_map_formula.py",
-        "interfaces/__init__.py",
-        "interfaces/abc_formula.py",
-        "interfaces/abc_converter.py",
-        "interfaces/abc_irc_token.py",
-        "interfaces/abc_score_registry.py",
-        "interfaces/abc_flexible_token.py",
-        "interfaces/abc_token_holder.py",
-        "interfaces/abc_owned.py",
-        "utility/__init__.py",
-        "utility/managed.py",
-        "utility/owned.py",
-        "utility/utils.py",
-        "utility/proxy_score.py",
-        "utility/flexible_token_controller.py",
-        "utility/token_holder.py",
         "NOTICE"
     ]
 }
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+from os import path, walk, sep
+
+
+class DependencyResolver:
+    """
+    Derives the dependencies of a contract by statically parsing the relative imports under the contracts path.
+
+    The dependencies are the minimal closure of the modules the contract's files import,
+    including the `__init__.py` of every package on the way, as the SCORE loader imports them as well.
+    Absolute imports such as `iconservice` are provided by the node and are not followed.
+    """
+
+    def __init__(self, contracts_path: str) -> None:
+        """
+        :param contracts_path: contracts path
+        """
+        self._contracts_path = contracts_path
+        # module path -> set of module paths it imports, relative to the contracts path
+        self._imports_cache = {}
+
+    def resolve(self, contract_name: str) -> list:
+        """Returns the dependency file paths of the contract except its own files
+
+        :param contract_name: contract name
+        :return: sorted list of dependency file paths relative to the contracts path
+            ex. ['interfaces/__init__.py', 'interfaces/abc_irc_token.py', ..]
+        """
+        own_modules = self._get_contract_modules(contract_name)
+        visited = set()
+        stack = list(own_modules)
+        while stack:
+            module = stack.pop()
+            if module in visited:
+                continue
+            visited.add(module)
+            stack.extend(self._get_imports(module))
+
+        return sorted(module for module in visited - own_modules
+                      if module.split('/')[0] != contract_name)
+
+    def _get_contract_modules(self, contract_name: str) -> set:
+        """Returns the python files in the contract directory except tests"""
+        modules = set()
+        contract_path = path.join(self._contracts_path, contract_name)
+        for dir_path, dirs, files in walk(contract_path):
+            dirs[:] = [d for d in dirs if d != 'tests' and d != '__pycache__']
+            for filename in files:
+                if filename.endswith('.py'):
+                    modules.add(self._to_module_path(path.join(dir_path, filename)))
+        return modules
+
+    def _to_module_path(self, file_path: str) -> str:
+        return path.relpath(file_path, self._contracts_path).replace(sep, '/')
+
+    def _exists(self, module: str) -> bool:
+        return path.isfile(path.join(self._contracts_path, module))
+
+    def _get_imports(self, module: str) -> set:
+        """Returns the modules which the module imports relatively, with their package `__init__.py`"""
+        if module in self._imports_cache:
+            return self._imports_cache[module]
+
+        with open(path.join(self._contracts_path, module), 'rb') as f:
+            tree = ast.parse(f.read(), filename=module)
+
+        package = module.split('/')[:-1]
+        imports = self._get_package_inits(package)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ImportFrom) or node.level == 0:
+                continue
+
+            # `from .` is the current package and every extra dot goes up a package
+            base = package[:len(package) - (node.level - 1)] if node.level > 1 else list(package)
+            target = base + (node.module.split('.') if node.module else [])
+            target_module = self._find_module(target)
+            if target_module is None:
+                raise ImportError("cannot resolve relative import in {0}: {1}".format(
+                    module, '.' * node.level + (node.module or '')))
+            imports.add(target_module)
+            imports.update(self._get_package_inits(target_module.split('/')[:-1]))
+
+            # `from package import module` imports a submodule
+            for alias in node.names:
+                submodule = self._find_module(target + [alias.name])
+                if submodule is not None:
+                    imports.add(submodule)
+
+        self._imports_cache[module] = imports
+        return imports
+
+    def _find_module(self, names: list) -> str:
+        """Returns the module file of the dotted names, either a `.py` file or a package `__init__.py`"""
+        if not names:
+            return None
+        module = '/'.join(names) + '.py'
+        if self._exists(module):
+            return module
+        init_module = '/'.join(names + ['__init__.py'])
+        if self._exists(init_module):
+            return init_module
+        return None
+
+    def _get_package_inits(self, package: list) -> set:
+        """Returns the `__init__.py` of the package and its parent packages"""
+        inits = set()
+        for depth in range(1, len(package) + 1):
+            init_module = '/'.join(package[:depth] + ['__init__.py'])
+            if self._exists(init_module):
+                inits.add(init_module)
+        return inits
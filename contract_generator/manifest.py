@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from hashlib import sha256
+from os import path, makedirs, replace
+
+MANIFEST_FILE_NAME = '.build_manifest.json'
+
+
+def hash_file(file_path: str) -> str:
+    """Returns the sha256 hex digest of the file content
+
+    :param file_path: file path
+    :return: hex digest of the file content
+    """
+    digest = sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_contract(contract) -> str:
+    """Returns the content hash of the contract,
+    which changes whenever any of its files is added, removed, moved or modified
+
+    :param contract: contract in namedtuple
+    :return: hex digest of the contract
+    """
+    digest = sha256()
+    for new_file_path in sorted(contract.file_hashes):
+        digest.update(new_file_path.encode())
+        digest.update(contract.file_hashes[new_file_path].encode())
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Records the content hashes of the last build so that unchanged contracts and files can be skipped.
+
+    The manifest is a json file in the output root directory, formatted as below.
+    {
+        [CONTRACT_NAME]: {
+            'hash': [CONTRACT_HASH],
+            'files': {[NEW_FILE_PATH]: [FILE_HASH], ..}
+        },
+        ..
+    }
+    """
+
+    def __init__(self, output_root_dir: str) -> None:
+        """Loads the manifest in the output root directory if exists
+
+        :param output_root_dir: the output root directory where contracts are set
+        :return: None
+        """
+        self._manifest_path = path.join(output_root_dir, MANIFEST_FILE_NAME)
+        self._contracts = {}
+        if path.isfile(self._manifest_path):
+            try:
+                with open(self._manifest_path, 'r') as f:
+                    self._contracts = json.load(f)
+            except ValueError:
+                # A broken manifest only costs a full rebuild
+                self._contracts = {}
+
+    def get_contract_hash(self, name: str) -> str:
+        """Returns the contract hash of the last build
+
+        :param name: contract name
+        :return: contract hash, None if the contract has not been built
+        """
+        return self._contracts.get(name, {}).get('hash')
+
+    def get_file_hashes(self, name: str) -> dict:
+        """Returns the file hashes of the last build
+
+        :param name: contract name
+        :return: file hashes keyed by the new file path, None if the contract has not been built
+        """
+        return self._contracts.get(name, {}).get('files')
+
+    def update(self, name: str, contract_hash: str, file_hashes: dict) -> None:
+        """Records the hashes of the contract just built
+
+        :param name: contract name
+        :param contract_hash: contract hash
+        :param file_hashes: file hashes keyed by the new file path
+        :return: None
+        """
+        self._contracts[name] = {'hash': contract_hash, 'files': dict(file_hashes)}
+
+    def save(self) -> None:
+        """Writes the manifest to the output root directory atomically
+
+        :return: None
+        """
+        makedirs(path.dirname(self._manifest_path), exist_ok=True)
+        tmp_path = self._manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._contracts, f, indent=4, sort_keys=True)
+        replace(tmp_path, self._manifest_path)
@@ -14,10 +14,54 @@
 # limitations under the License.
 
 from io import BytesIO
-from os import path, makedirs
+from os import path, makedirs, remove, rmdir, listdir, sep
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from hashlib import sha256
 from shutil import rmtree, copy
-from zipfile import ZipFile, ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA
+from zipfile import ZipFile, ZipInfo, ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA
+
+from contract_generator.manifest import BuildManifest, hash_contract, hash_file
+
+# Fixed attributes of zip entries for reproducible packages
+# the earliest date time which the zip format supports
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# -rw-r--r-- regular file
+ZIP_EXTERNAL_ATTR = (0o100644 << 16)
+ZIP_CREATE_SYSTEM_UNIX = 3
+
+
+def write_zip_entries(zf: ZipFile, path_list: list) -> None:
+    """
+    Writes the files on path list to the zip file in a reproducible way;
+    entries are sorted by their new file path and have fixed timestamps and permissions,
+    so the same contents always produce the same bytes.
+
+    :param zf: writable ZipFile
+    :param path_list: path list in tuples
+        ex. [(current_file_path, new_file_path), (..), ..]
+    :return: None
+    """
+    for cur_file_path, new_file_path in sorted(path_list, key=lambda path_tuple: path_tuple[1]):
+        zip_info = ZipInfo(new_file_path.replace(sep, '/'), date_time=ZIP_DATE_TIME)
+        zip_info.compress_type = zf.compression
+        zip_info.external_attr = ZIP_EXTERNAL_ATTR
+        zip_info.create_system = ZIP_CREATE_SYSTEM_UNIX
+        with open(cur_file_path, 'rb') as f:
+            zf.writestr(zip_info, f.read())
+
+
+def build_package(path_list: list, compression: int) -> bytes:
+    """Builds a reproducible zip package of the files on path list
+
+    :param path_list: path list in tuples
+    :param compression: ZIP compression as int with zipfile module
+    :return: bytes of the zip package
+    """
+    in_memory = BytesIO()
+    with ZipFile(in_memory, mode="w", compression=compression) as zf:
+        write_zip_entries(zf, path_list)
+    return in_memory.getvalue()
 
 
 class Writer(metaclass=ABCMeta):
@@ -37,25 +81,88 @@ class FileWriter(Writer):
         :return: None
         """
         self.output_root_dir = output_root_dir
+        # names of the contracts written or skipped as up-to-date on the last write
+        self.written_contracts = []
+        self.skipped_contracts = []
 
     def write(self, contract_list: list) -> None:
-        """Writes all of the files on path list to the file system
+        """
+        Writes the files on path list to the file system.
+        Contracts whose content hash matches the build manifest and whose outputs are intact are skipped,
+        and only missing or changed files of the other contracts are copied.
 
         :param contract_list: contracts list composed of contracts in namedtuple
                     - contract.name is contract name
                     - contract.path_list is contracts path list in tuples
                         ex. [(current_file_path, new_file_path), (..), ..]
+                    - contract.file_hashes is content hash of each file keyed by its new file path
         :return: None
         """
+        self.written_contracts = []
+        self.skipped_contracts = []
+        manifest = BuildManifest(self.output_root_dir)
+
         for contract in contract_list:
             contract_path = path.join(self.output_root_dir, contract.name)
-            if path.isdir(contract_path):
-                rmtree(contract_path)
-            for path_tuple in contract.path_list:
-                cur_file_path = path_tuple[0]
-                new_file_path = path.join(self.output_root_dir, path_tuple[1])
-                makedirs(path.dirname(new_file_path), exist_ok=True)
-                copy(cur_file_path, new_file_path)
+            contract_hash = hash_contract(contract)
+            prev_file_hashes = manifest.get_file_hashes(contract.name)
+
+            if path.isdir(contract_path) and prev_file_hashes is not None:
+                self._remove_stale_files(contract, prev_file_hashes)
+            else:
+                # Without a previous build record, the directory can not be trusted
+                if path.isdir(contract_path):
+                    rmtree(contract_path)
+
+            # Outputs may have been deleted or edited since the last build,
+            # so every output is checked against its source even if the contract hash matches
+            outdated_path_list = [(cur_file_path, new_file_path)
+                                  for cur_file_path, new_file_path in contract.path_list
+                                  if not self._is_up_to_date(new_file_path, contract.file_hashes[new_file_path])]
+            if not outdated_path_list and manifest.get_contract_hash(contract.name) == contract_hash:
+                self.skipped_contracts.append(contract.name)
+                continue
+
+            for cur_file_path, new_file_path in outdated_path_list:
+                output_file_path = path.join(self.output_root_dir, new_file_path)
+                makedirs(path.dirname(output_file_path), exist_ok=True)
+                copy(cur_file_path, output_file_path)
+
+            manifest.update(contract.name, contract_hash, contract.file_hashes)
+            self.written_contracts.append(contract.name)
+
+        manifest.save()
+
+    def _is_up_to_date(self, new_file_path: str, file_hash: str) -> bool:
+        """Checks if the output file exists and has the content of its source
+
+        :param new_file_path: new file path of the output file
+        :param file_hash: content hash of the source file
+        :return: True if the output file does not need to be written
+        """
+        output_file_path = path.join(self.output_root_dir, new_file_path)
+        return path.isfile(output_file_path) and hash_file(output_file_path) == file_hash
+
+    def _remove_stale_files(self, contract, prev_file_hashes: dict) -> None:
+        """Removes the files of the last build which are not on path list anymore
+
+        :param contract: contract in namedtuple
+        :param prev_file_hashes: file hashes of the last build keyed by the new file path
+        :return: None
+        """
+        contract_path = path.join(self.output_root_dir, contract.name)
+        for new_file_path in prev_file_hashes:
+            if new_file_path in contract.file_hashes:
+                continue
+            output_file_path = path.join(self.output_root_dir, new_file_path)
+            if path.isfile(output_file_path):
+                remove(output_file_path)
+
+            # Removes the directories left empty up to the contract directory
+            dir_path = path.dirname(output_file_path)
+            while dir_path != contract_path and path.isdir(dir_path) and not listdir(dir_path):
+                rmdir(dir_path)
+                dir_path = path.dirname(dir_path)
 
     def clean(self) -> bool:
         """Cleans output root directory
@@ -104,10 +211,7 @@ class ZipWriter(Writer):
         """
         try:
             for contract in contract_list:
-                for path_tuple in contract.path_list:
-                    cur_file_path = path_tuple[0]
-                    new_file_path = path_tuple[1]
-                    self.zf.write(cur_file_path, new_file_path)
+                write_zip_entries(self.zf, contract.path_list)
         finally:
             self.zf.close()
 
@@ -139,3 +243,72 @@ class ZipWriter(Writer):
         """
         return self.zf.infolist()
 
+
+class PackageWriter(Writer):
+    """
+    Builds one deployable zip package per contract in parallel.
+    The packages are reproducible byte for byte, so they can be cached and compared by their hashes.
+    """
+
+    def __init__(self, compression: str = 'ZIP_DEFLATED', max_workers: int = None, use_processes: bool = False):
+        """Initializes PackageWriter
+
+        :param compression: ZIP compression
+        :param max_workers: the maximum number of workers, default is the executor's default
+        :param use_processes: True to use a process pool, otherwise a thread pool
+        """
+        self._compression = ZipWriter._convert_compression(compression)
+        self._max_workers = max_workers
+        self._use_processes = use_processes
+        # contract name -> bytes of the zip package
+        self.packages = {}
+
+    def write(self, contract_list: list) -> None:
+        """Builds the zip package of each contract in parallel
+
+        :param contract_list: contracts list having contract namedtuple
+        :return: None
+        """
+        executor_class = ProcessPoolExecutor if self._use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=self._max_workers) as executor:
+            futures = [(contract.name, executor.submit(build_package, contract.path_list, self._compression))
+                       for contract in contract_list]
+            for name, future in futures:
+                self.packages[name] = future.result()
+
+    def to_bytes(self, name: str) -> bytes:
+        """Retrieves the zip package of the contract
+
+        :param name: contract name
+        :return: bytes of the zip package
+        """
+        return self.packages[name]
+
+    def get_hash(self, name: str) -> str:
+        """Returns the sha256 hex digest of the zip package of the contract
+
+        :param name: contract name
+        :return: hex digest of the zip package
+        """
+        return sha256(self.packages[name]).hexdigest()
+
+    def store_to_file(self, output_root_dir: str) -> list:
+        """
+        Stores each zip package as `<contract name>.zip` under given path.
+        Packages identical to the stored ones are not rewritten.
+
+        :param output_root_dir: the output root directory where packages are set
+        :return: names of the contracts whose package is written
+        """
+        makedirs(output_root_dir, exist_ok=True)
+        written = []
+        for name, package in self.packages.items():
+            package_path = path.join(output_root_dir, name + '.zip')
+            if path.isfile(package_path):
+                with open(package_path, 'rb') as f:
+                    if f.read() == package:
+                        continue
+            with open(package_path, 'wb') as f:
+                f.write(package)
+            written.append(name)
+        return written
@@ -50,6 +50,9 @@ class Connector:
         self.is_purchase_enabled = VarDB('is_purchase_enabled', db, bool)
         # used to tell if the mapping element is defined
         self.is_set = VarDB('is_set', db, bool)
+        # cumulative price of the flexible token in the connector token over time,
+        # packed with the timestamp of the last update as `cumulative price << 64 | timestamp`
+        self.cumulative_price = VarDB('cumulative_price', db, int)
 
 
 class ConnectorDict:
@@ -93,6 +96,9 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
     _REVISION = 0
     _MAX_WEIGHT = 1000000
     _MAX_CONVERSION_FEE = 1000000
+    _PRICE_PRECISION = 10 ** 18
+    _TIMESTAMP_BITS = 64
+    _TIMESTAMP_MASK = (1 << 64) - 1
 
     # triggered when a conversion between two tokens occurs
     @eventlog(indexed=3)
@@ -119,6 +125,25 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
     def ConversionFeeUpdate(self, _prevFee: int, _newFee: int):
         pass
 
+    # triggered when a connector is added
+    @eventlog(indexed=1)
+    def ConnectorAdd(self, _connectorToken: Address, _weight: int, _enableVirtualBalance: bool):
+        pass
+
+    # triggered when a connector is updated, with the connector balance after the update
+    @eventlog(indexed=1)
+    def ConnectorUpdate(self,
+                        _connectorToken: Address,
+                        _weight: int,
+                        _enableVirtualBalance: bool,
+                        _connectorBalance: int):
+        pass
+
+    # triggered when purchases with a connector are disabled/enabled
+    @eventlog(indexed=1)
+    def ConnectorPurchasesDisable(self, _connectorToken: Address, _disable: bool):
+        pass
+
     # triggered when conversions are enabled/disabled
     @eventlog
     def ConversionsEnable(self, _conversionsEnabled: bool):
@@ -313,10 +338,12 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
             connector_token, flexible_token_address, trader, amount, return_amount, fee_amount)
 
         # dispatch price data update for the flexible token/connector
-        self.PriceDataUpdate(connector_token,
-                             flexible_token.totalSupply(),
-                             self.getConnectorBalance(connector_token),
-                             connector.weight.get())
+        token_supply = flexible_token.totalSupply()
+        connector_balance = self.getConnectorBalance(connector_token)
+        connector_weight = connector.weight.get()
+        self._update_cumulative_price(
+            connector, token_supply, connector_balance, connector_weight, return_amount, amount)
+        self.PriceDataUpdate(connector_token, token_supply, connector_balance, connector_weight)
 
         return return_amount
 
@@ -368,10 +395,12 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
             flexible_token_address, connector_token, trader, amount, return_amount, fee_amount)
 
         # dispatch price data update for the flexible token/connector
-        self.PriceDataUpdate(connector_token,
-                             flexible_token.totalSupply(),
-                             self.getConnectorBalance(connector_token),
-                             connector.weight.get())
+        token_supply = flexible_token.totalSupply()
+        connector_balance = self.getConnectorBalance(connector_token)
+        connector_weight = connector.weight.get()
+        self._update_cumulative_price(
+            connector, token_supply, connector_balance, connector_weight, -amount, -return_amount)
+        self.PriceDataUpdate(connector_token, token_supply, connector_balance, connector_weight)
 
         return return_amount
 
@@ -422,12 +451,63 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
         # dispatch price data updates for the flexible token / both connectors
         flexible_token = self.create_interface_score(self._token.get(), FlexibleToken)
         token_supply = flexible_token.totalSupply()
-        self.PriceDataUpdate(from_token, token_supply, self.getConnectorBalance(from_token),
-                             from_connector.weight.get())
-        self.PriceDataUpdate(to_token, token_supply, self.getConnectorBalance(to_token),
-                             to_connector.weight.get())
+        from_connector_balance = self.getConnectorBalance(from_token)
+        from_connector_weight = from_connector.weight.get()
+        self._update_cumulative_price(
+            from_connector, token_supply, from_connector_balance, from_connector_weight, 0, amount)
+        self.PriceDataUpdate(from_token, token_supply, from_connector_balance, from_connector_weight)
+        to_connector_balance = self.getConnectorBalance(to_token)
+        to_connector_weight = to_connector.weight.get()
+        self._update_cumulative_price(
+            to_connector, token_supply, to_connector_balance, to_connector_weight, 0, -return_amount)
+        self.PriceDataUpdate(to_token, token_supply, to_connector_balance, to_connector_weight)
         return return_amount
 
+    def _get_price(self, token_supply: int, connector_balance: int, connector_weight: int) -> int:
+        """
+        Returns the price of the flexible token in the connector token, multiplied by the price precision
+
+        :param token_supply: flexible token supply
+        :param connector_balance: connector balance
+        :param connector_weight: connector weight, represented in ppm
+        :return: price multiplied by the price precision, 0 if the price is not defined
+        """
+        if token_supply <= 0 or connector_weight <= 0:
+            return 0
+        return connector_balance * self._MAX_WEIGHT * self._PRICE_PRECISION // (token_supply * connector_weight)
+
+    def _update_cumulative_price(self,
+                                 connector: Connector,
+                                 token_supply: int,
+                                 connector_balance: int,
+                                 connector_weight: int,
+                                 supply_change: int,
+                                 balance_change: int):
+        """
+        Accumulates the price which held since the last update times the elapsed time.
+        Only the first conversion in a block updates it, so it costs at most one write per block.
+        The price which held is the one before the conversion, derived from the values after the conversion.
+
+        :param connector: connector to update
+        :param token_supply: flexible token supply after the conversion
+        :param connector_balance: connector balance after the conversion
+        :param connector_weight: connector weight
+        :param supply_change: change of the flexible token supply by the conversion
+        :param balance_change: change of the connector balance by the conversion
+        """
+        packed = connector.cumulative_price.get()
+        last_timestamp = packed & self._TIMESTAMP_MASK
+        now = self.now()
+        if last_timestamp == now:
+            return
+
+        cumulative_price = packed >> self._TIMESTAMP_BITS
+        if last_timestamp > 0:
+            price = self._get_price(
+                token_supply - supply_change, connector_balance - balance_change, connector_weight)
+            cumulative_price += price * (now - last_timestamp)
+        connector.cumulative_price.set(cumulative_price << self._TIMESTAMP_BITS | now)
+
     def get_purchase_return(self, connector_token: Address, amount: int,
                             from_conversion: bool = False) -> dict:
         """
@@ -448,7 +528,8 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
 
         token_supply = flexible_token.totalSupply()
         connector_balance = self.getConnectorBalance(connector_token)
-        if from_conversion:
+        # the deposited amount is already in the actual balance, but not yet in the virtual balance
+        if from_conversion and not connector.is_virtual_balance_enabled.get():
             connector_balance -= amount
 
         calculated_amount = formula.calculate_purchase_return(
@@ -502,7 +583,8 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
         require(to_connector.is_purchase_enabled.get(), 'required purchase enabled')
 
         from_connector_balance = self.getConnectorBalance(from_token)
-        if from_conversion:
+        # the deposited amount is already in the actual balance, but not yet in the virtual balance
+        if from_conversion and not from_connector.is_virtual_balance_enabled.get():
             from_connector_balance -= amount
         to_connector_balance = self.getConnectorBalance(to_token)
 
@@ -545,6 +627,7 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
         self._connector_tokens.put(_token)
 
         self._total_connector_weight.set(self._total_connector_weight.get() + _weight)
+        self.ConnectorAdd(_token, _weight, _enableVirtualBalance)
 
     @external
     def updateConnector(self, _connectorToken: Address, _weight: int, _enableVirtualBalance: bool,
@@ -572,6 +655,8 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
         connector.weight.set(_weight)
         connector.is_virtual_balance_enabled.set(_enableVirtualBalance)
         connector.virtual_balance.set(_virtualBalance)
+        self.ConnectorUpdate(_connectorToken, _weight, _enableVirtualBalance,
+                             self.getConnectorBalance(_connectorToken))
 
     @external
     def disableConnectorPurchases(self, _connectorToken: Address, _disable: bool):
@@ -587,6 +672,7 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
         self._require_valid_connector(_connectorToken)
 
         self._connectors[_connectorToken].is_purchase_enabled.set(not _disable)
+        self.ConnectorPurchasesDisable(_connectorToken, _disable)
 
     @external
     def updateRegistry(self):
@@ -785,6 +871,38 @@ class Converter(ABCConverter, FlexibleTokenController, Managed):
             'isSet': connector.is_set.get(),
         } if connector.is_set.get() else {}
 
+    @external(readonly=True)
+    def getCumulativePrice(self, _connector: Address) -> dict:
+        """
+        Returns the cumulative price of the flexible token in the connector token,
+        which is the sum of the prices multiplied by the time they held, in microseconds.
+        The time-weighted average price between two reads is
+        `(cumulativePrice2 - cumulativePrice1) / (timestamp2 - timestamp1) / pricePrecision`.
+
+        :param _connector: connector token address
+        :return: cumulative price at the current block timestamp, in dict
+            e.g.) {'cumulativePrice': [INT], 'timestamp': [INT], 'pricePrecision': [INT]}
+        """
+        self._require_valid_connector(_connector)
+        connector = self._connectors[_connector]
+
+        packed = connector.cumulative_price.get()
+        last_timestamp = packed & self._TIMESTAMP_MASK
+        cumulative_price = packed >> self._TIMESTAMP_BITS
+        now = self.now()
+        if 0 < last_timestamp < now:
+            # the current price has held since the last update
+            flexible_token = self.create_interface_score(self._token.get(), FlexibleToken)
+            price = self._get_price(
+                flexible_token.totalSupply(), self.getConnectorBalance(_connector), connector.weight.get())
+            cumulative_price += price * (now - last_timestamp)
+
+        return {
+            'cumulativePrice': cumulative_price,
+            'timestamp': now,
+            'pricePrecision': self._PRICE_PRECISION
+        }
+
     @external(readonly=True)
     def getConnectorBalance(self, _connectorToken: Address) -> int:
         """
@@ -17,6 +17,7 @@
 from ..interfaces.abc_flexible_token import ABCFlexibleToken
 from ..irc_token.irc_token import IRCToken
 from ..utility.token_holder import TokenHolder
+from ..utility.checkpointed_token_storage import CheckpointedTokenStorage
 from ..utility.utils import *
 
 TAG = 'FlexibleToken'
@@ -42,9 +43,14 @@ class FlexibleToken(IRCToken, TokenHolder, ABCFlexibleToken):
         super().__init__(db)
         self._version = VarDB('version', db, value_type=str)
         self._transfer_possibility = VarDB('transfer_possibility', db, value_type=bool)
-
-    def on_install(self, _name: str, _symbol: str, _initialSupply: int, _decimals: int) -> None:
-        IRCToken.on_install(self, _name, _symbol, _initialSupply, _decimals)
+        self._token_storage = CheckpointedTokenStorage(
+            self._balances, self._total_supply, db, lambda: self.block_height, self._holder_index)
+
+    def on_install(self, _name: str, _symbol: str, _initialSupply: int, _decimals: int,
+                   _enableHolderIndex: bool = False) -> None:
+        # the initial supply is checkpointed as well
+        self._token_storage.start()
+        IRCToken.on_install(self, _name, _symbol, _initialSupply, _decimals, _enableHolderIndex)
         TokenHolder.on_install(self)
 
         self._version.set(self._VERSION)
@@ -55,6 +61,8 @@ class FlexibleToken(IRCToken, TokenHolder, ABCFlexibleToken):
     def on_update(self) -> None:
         IRCToken.on_update(self)
         TokenHolder.on_update(self)
+        # a token deployed without the checkpoints starts them at the update
+        self._token_storage.start()
 
     def require_transfer_allowed(self):
         require(self._transfer_possibility.get(), "This flexible token cannot transfer")
@@ -72,6 +80,43 @@ class FlexibleToken(IRCToken, TokenHolder, ABCFlexibleToken):
     def getTransferPossibility(self) -> bool:
         return self._transfer_possibility.get()
 
+    @external(readonly=True)
+    def balanceOfAt(self, _owner: Address, _height: int) -> int:
+        """
+        Returns the balance of the owner at the end of the block height
+
+        :param _owner: owner address
+        :param _height: block height, between `getCheckpointStartHeight` and the current block height
+        :return: balance at the block height
+        """
+        self._require_valid_height(_height)
+        return self._token_storage.get_balance_at(_owner, _height)
+
+    @external(readonly=True)
+    def totalSupplyAt(self, _height: int) -> int:
+        """
+        Returns the total supply at the end of the block height
+
+        :param _height: block height, between `getCheckpointStartHeight` and the current block height
+        :return: total supply at the block height
+        """
+        self._require_valid_height(_height)
+        return self._token_storage.get_total_supply_at(_height)
+
+    @external(readonly=True)
+    def getCheckpointStartHeight(self) -> int:
+        """
+        Returns the block height from which balances and the total supply can be queried at.
+        It is the install height, or the update height for a token deployed without the checkpoints.
+
+        :return: start height of the checkpoints
+        """
+        return self._token_storage.get_start_height()
+
+    def _require_valid_height(self, _height: int):
+        require(self._token_storage.get_start_height() <= _height <= self.block_height,
+                "Block height should be between the checkpoint start height and the current block height")
+
     @external
     def issue(self, _to: Address, _amount: int) -> None:
         require_positive_value(_amount)
@@ -79,9 +124,7 @@ class FlexibleToken(IRCToken, TokenHolder, ABCFlexibleToken):
         require_valid_address(_to)
         require_not_this(self.address, _to)
 
-        self._balances[_to] += _amount
-        total_supply = self._total_supply.get()
-        self._total_supply.set(total_supply + _amount)
+        self._token_storage.issue(_to, _amount)
 
         self.Issuance(_amount)
         self.Transfer(self.address, _to, _amount, b'None')
@@ -89,13 +132,11 @@ class FlexibleToken(IRCToken, TokenHolder, ABCFlexibleToken):
     @external
     def destroy(self, _from: Address, _amount: int) -> None:
         require_positive_value(_amount)
-        require(self._balances[_from] >= _amount, "Out of balance")
         require(self.msg.sender == _from or self.msg.sender == self._owner.get(),
                 "You are not token holder or flexible token owner")
 
-        self._balances[_from] -= _amount
-        total_supply = self._total_supply.get()
-        self._total_supply.set(total_supply - _amount)
+        # Checks the balance and decreases it with the total supply
+        self._token_storage.destroy(_from, _amount)
 
         self.Destruction(_amount)
         self.Transfer(_from, self.address, _amount, b'None')
@@ -104,3 +145,8 @@ class FlexibleToken(IRCToken, TokenHolder, ABCFlexibleToken):
     def transfer(self, _to: Address, _value: int, _data: bytes = None):
         self.require_transfer_allowed()
         IRCToken.transfer(self, _to, _value, _data)
+
+    @external
+    def transferBatch(self, _tos: str, _values: str, _data: bytes = None):
+        self.require_transfer_allowed()
+        IRCToken.transferBatch(self, _tos, _values, _data)
@@ -51,9 +51,7 @@ class IcxToken(IRCToken, TokenHolder, ABCIcxToken):
     @payable
     @external
     def deposit(self):
-        self._balances[self.msg.sender] += self.msg.value
-        total_supply = self._total_supply.get()
-        self._total_supply.set(total_supply + self.msg.value)
+        self._token_storage.issue(self.msg.sender, self.msg.value)
 
         self.Issuance(self.msg.value)
         self.Transfer(self.address, self.msg.sender, self.msg.value, b'None')
@@ -65,12 +63,9 @@ class IcxToken(IRCToken, TokenHolder, ABCIcxToken):
     @external
     def withdrawTo(self, _amount: int, _to: Address):
         require_positive_value(_amount)
-        if self._balances[self.msg.sender] < _amount:
-            revert("Out of balance")
 
-        self._balances[self.msg.sender] -= _amount
-        total_supply = self._total_supply.get()
-        self._total_supply.set(total_supply - _amount)
+        # Checks the balance and decreases it with the total supply
+        self._token_storage.destroy(self.msg.sender, _amount)
         self.icx.transfer(_to, _amount)
 
         self.Destruction(_amount)
@@ -79,3 +74,9 @@ class IcxToken(IRCToken, TokenHolder, ABCIcxToken):
     def transfer(self, _to: Address, _value: int, _data: bytes = None):
         require_not_this(self.address, _to)
         IRCToken.transfer(self, _to, _value, _data)
+
+    def _transfer_batch(self, _from: Address, _batch: dict, _data: bytes):
+        # Checks the recipients already parsed by `transferBatch`
+        for to in _batch:
+            require_not_this(self.address, to)
+        IRCToken._transfer_batch(self, _from, _batch, _data)
@@ -15,9 +15,11 @@
 
 from iconservice import *
 
+from .abc_flexible_token_controller import ABCFlexibleTokenController
+
 
 # noinspection PyPep8Naming
-class ABCConverter(ABC):
+class ABCConverter(ABCFlexibleTokenController):
     """
     Converter interface
     """
@@ -54,6 +56,25 @@ class ABCConverter(ABC):
         """
         pass
 
+    @abstractmethod
+    def getConnectorTokenCount(self) -> int:
+        """
+        Returns the number of connector tokens defined
+
+        :return: number of connector tokens
+        """
+        pass
+
+    @abstractmethod
+    def getConnectorAt(self, _index: int) -> Address:
+        """
+        Returns the connector token address at the index
+
+        :param _index: index of the connector token
+        :return: connector token address
+        """
+        pass
+
     @abstractmethod
     def getConnectorBalance(self, _connectorToken: Address) -> int:
         """
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+
+from .abc_token_holder import ABCTokenHolder
+
+
+# noinspection PyPep8Naming
+class ABCFlexibleTokenController(ABCTokenHolder):
+    """
+    FlexibleTokenController interface
+    """
+
+    @abstractmethod
+    def getToken(self) -> Address:
+        """
+        Returns token address for the SCORE to manage
+
+        :return: token address
+        """
+        pass
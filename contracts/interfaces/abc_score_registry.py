@@ -36,3 +36,12 @@ class ABCScoreRegistry(ABC):
         :return:
         """
         pass
+
+    @abstractmethod
+    def getAddresses(self, _scoreNames: str) -> dict:
+        """
+        Returns the score addresses of several score names at once
+        :param _scoreNames: comma separated score names
+        :return: score name -> score address
+        """
+        pass
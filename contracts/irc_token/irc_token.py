@@ -16,6 +16,8 @@
 from iconservice import *
 
 from ..interfaces.abc_irc_token import ABCIRCToken
+from ..utility.holder_index import HolderIndex
+from ..utility.token_storage import TokenStorage
 
 TAG = 'IRCToken'
 
@@ -32,6 +34,8 @@ class IRCToken(IconScoreBase, ABCIRCToken):
     _BALANCES = 'balances'
     _TOTAL_SUPPLY = 'total_supply'
     _DECIMALS = 'decimals'
+    _MAX_HOLDERS_PER_PAGE = 100
+    _MAX_HOLDERS_PER_BACKFILL = 100
 
     @eventlog(indexed=3)
     def Transfer(self, _from: Address, _to: Address, _value: int, _data: bytes):
@@ -44,8 +48,11 @@ class IRCToken(IconScoreBase, ABCIRCToken):
         self._total_supply = VarDB(self._TOTAL_SUPPLY, db, value_type=int)
         self._decimals = VarDB(self._DECIMALS, db, value_type=int)
         self._balances = DictDB(self._BALANCES, db, value_type=int)
+        self._holder_index = HolderIndex(db)
+        self._token_storage = TokenStorage(self._balances, self._total_supply, self._holder_index)
 
-    def on_install(self, _name: str, _symbol: str, _initialSupply: int, _decimals: int) -> None:
+    def on_install(self, _name: str, _symbol: str, _initialSupply: int, _decimals: int,
+                   _enableHolderIndex: bool = False) -> None:
         IconScoreBase.on_install(self)
         if _initialSupply < 0:
             revert("Initial supply cannot be less than zero")
@@ -58,9 +65,10 @@ class IRCToken(IconScoreBase, ABCIRCToken):
 
         self._name.set(_name)
         self._symbol.set(_symbol)
-        self._total_supply.set(total_supply)
         self._decimals.set(_decimals)
-        self._balances[self.msg.sender] = total_supply
+        if _enableHolderIndex:
+            self._holder_index.enable()
+        self._token_storage.issue(self.msg.sender, total_supply)
 
     def on_update(self) -> None:
         IconScoreBase.on_update(self)
@@ -85,22 +93,141 @@ class IRCToken(IconScoreBase, ABCIRCToken):
     def balanceOf(self, _owner: Address) -> int:
         return self._balances[_owner]
 
+    @external(readonly=True)
+    def getHolderCount(self) -> int:
+        """
+        Returns the number of accounts holding a positive balance
+
+        :return: the number of holders
+        """
+        self._require_holder_index_enabled()
+        return len(self._holder_index.holders)
+
+    @external(readonly=True)
+    def getHolders(self, _offset: int, _limit: int) -> list:
+        """
+        Returns a page of the accounts holding a positive balance.
+        The order is not kept across transactions, as a removed holder is replaced by the last one,
+        so a snapshot should be taken at a fixed block height.
+
+        :param _offset: index of the first holder
+        :param _limit: maximum number of holders to return, up to 100
+        :return: list of holder addresses
+        """
+        self._require_holder_index_enabled()
+        if _offset < 0:
+            revert("Offset cannot be less than zero")
+        if not 0 < _limit <= self._MAX_HOLDERS_PER_PAGE:
+            revert(f"Limit should be between 1 and {self._MAX_HOLDERS_PER_PAGE}")
+        return self._holder_index.holders.slice(_offset, _limit)
+
+    @external
+    def enableHolderIndex(self) -> None:
+        """
+        Enables the holder index of a token which is already deployed.
+        Balance changes are indexed from this transaction on, and the accounts which
+        already hold a balance should be backfilled with `addHolders`, which can be found
+        by replaying the `Transfer` events up to this block.
+        Can only be called by the SCORE owner.
+        """
+        self._require_score_owner_only()
+        if self._holder_index.is_enabled():
+            revert("Holder index is already enabled")
+        self._holder_index.enable()
+
+    @external
+    def addHolders(self, _accounts: str) -> None:
+        """
+        Backfills the holder index with the accounts which held a balance before it is enabled.
+        Accounts holding no balance or already indexed are ignored, so the same page can be sent again.
+        Can only be called by the SCORE owner.
+
+        :param _accounts: comma-separated account addresses, up to 100
+        """
+        self._require_score_owner_only()
+        self._require_holder_index_enabled()
+        accounts = [Address.from_string(account.strip()) for account in _accounts.split(",")]
+        if len(accounts) > self._MAX_HOLDERS_PER_BACKFILL:
+            revert(f"The number of accounts should be at most {self._MAX_HOLDERS_PER_BACKFILL}")
+        for account in accounts:
+            self._holder_index.add_holder(account, self._balances[account])
+
+    def _require_score_owner_only(self):
+        # the SCORE owner deploys and updates the SCORE, unlike the owner of `Owned` which can be transferred
+        if self.msg.sender != self.owner:
+            revert("Invalid SCORE owner")
+
+    def _require_holder_index_enabled(self):
+        if not self._holder_index.is_enabled():
+            revert("Holder index is not enabled")
+
     @external
     def transfer(self, _to: Address, _value: int, _data: bytes = None):
         if _data is None:
             _data = b'None'
         self._transfer(self.msg.sender, _to, _value, _data)
 
+    @external
+    def transferBatch(self, _tos: str, _values: str, _data: bytes = None):
+        """
+        Transfers tokens to several accounts at once.
+        The sender is debited once and the values for the same recipient are aggregated,
+        so each recipient is credited, notified by `tokenFallback` and logged by `Transfer` once.
+        Recipients and values are comma-separated strings because external methods
+        only take primitive types such as int, str, bytes, bool and Address, not lists.
+
+        :param _tos: comma-separated recipient addresses
+        :param _values: comma-separated values to send, in the same order as the recipients
+        :param _data: bytes data passed on to every recipient
+        """
+        if _data is None:
+            _data = b'None'
+        self._transfer_batch(self.msg.sender, self._convert_batch(_tos, _values), _data)
+
+    @staticmethod
+    def _convert_batch(_tos: str, _values: str) -> dict:
+        """
+        Converts comma-separated recipients and values into the aggregated values per recipient
+
+        :param _tos: comma-separated recipient addresses
+        :param _values: comma-separated values, decimal or hexadecimal with 0x prefix
+        :return: recipient address -> aggregated value, in the order of the first appearance
+        """
+        tos = [Address.from_string(to.strip()) for to in _tos.split(",")]
+        try:
+            values = [int(value.strip(), 0) for value in _values.split(",")]
+        except ValueError as e:
+            revert(f"invalid value: {e}")
+        if len(tos) != len(values):
+            revert("The number of recipients and values should be same")
+
+        batch = {}
+        for to, value in zip(tos, values):
+            if value < 0:
+                revert("Transferring value cannot be less than zero")
+            batch[to] = batch.get(to, 0) + value
+        return batch
+
+    def _transfer_batch(self, _from: Address, _batch: dict, _data: bytes):
+
+        # Checks the balance against the total of the batch, debits it once and credits the recipients.
+        self._token_storage.transfer_batch(_from, _batch)
+
+        # Hands over control only after every balance is updated.
+        for to, value in _batch.items():
+            if to.is_contract:
+                recipient_score = self.create_interface_score(to, TokenFallbackInterface)
+                recipient_score.tokenFallback(_from, value, _data)
+
+            self.Transfer(_from, to, value, _data)
+            Logger.debug(f'Transfer({_from}, {to}, {value}, {_data})', TAG)
+
     def _transfer(self, _from: Address, _to: Address, _value: int, _data: bytes):
 
         # Checks the sending value and balance.
         if _value < 0:
             revert("Transferring value cannot be less than zero")
-        if self._balances[_from] < _value:
-            revert("Out of balance")
-
-        self._balances[_from] = self._balances[_from] - _value
-        self._balances[_to] = self._balances[_to] + _value
+        self._token_storage.transfer(_from, _to, _value)
 
         if _to.is_contract:
             # If the recipient is SCORE,
@@ -14,23 +14,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ..interfaces.abc_converter import ABCConverter
 from ..interfaces.abc_score_registry import ABCScoreRegistry
+from ..utility.address_set import AddressSet
 from ..utility.owned import Owned
+from ..utility.proxy_score import ProxyScore
 from ..utility.utils import *
 
 TAG = 'ScoreRegistry'
 
+Converter = ProxyScore(ABCConverter)
+
 
 # noinspection PyPep8Naming
 class ScoreRegistry(Owned, ABCScoreRegistry):
+    _CONVERTERS = 'converters'
+    _FLEXIBLE_TOKENS = 'flexible_tokens'
+    _CONVERTER_CONNECTORS = 'converter_connectors'
+    _CONNECTOR_CONVERTERS = 'connector_converters'
+    _MAX_ADDRESSES_PER_PAGE = 100
 
     @eventlog(indexed=1)
     def AddressUpdate(self, _contractName: str, _scoreAddress: Address):
         pass
 
+    @eventlog(indexed=2)
+    def ConverterAdd(self, _converter: Address, _flexibleToken: Address):
+        pass
+
+    @eventlog(indexed=2)
+    def ConverterRemove(self, _converter: Address, _flexibleToken: Address):
+        pass
+
     def __init__(self, db: IconScoreDatabase) -> None:
         super().__init__(db)
         self._score_address = DictDB("score_address", db, value_type=Address)
+        # converter -> flexible token and the reverse
+        self._converter_token = DictDB("converter_token", db, value_type=Address)
+        self._token_converter = DictDB("token_converter", db, value_type=Address)
 
     def on_install(self) -> None:
         Owned.on_install(self)
@@ -41,10 +62,23 @@ class ScoreRegistry(Owned, ABCScoreRegistry):
 
     @external(readonly=True)
     def getAddress(self, _scoreName: str) -> Address:
-        if self._score_address[_scoreName] is None:
-            return ZERO_SCORE_ADDRESS
-        else:
-            return self._score_address[_scoreName]
+        score_address = self._score_address[_scoreName]
+        return ZERO_SCORE_ADDRESS if score_address is None else score_address
+
+    @external(readonly=True)
+    def getAddresses(self, _scoreNames: str) -> dict:
+        """
+        Returns the score addresses of several score names at once.
+        The names are separated by commas, as list parameters are not supported.
+        ex. "ScoreRegistry,Network"
+
+        :param _scoreNames: comma separated score names, up to 100
+        :return: score name -> score address, the zero score address if the name is not registered
+        """
+        score_names = [score_name.strip() for score_name in _scoreNames.split(",")] if _scoreNames else []
+        require(len(score_names) <= self._MAX_ADDRESSES_PER_PAGE,
+                f"Score names should be at most {self._MAX_ADDRESSES_PER_PAGE}")
+        return {score_name: self.getAddress(score_name) for score_name in score_names}
 
     @external(readonly=True)
     def getScoreIds(self) -> list:
@@ -67,3 +101,166 @@ class ScoreRegistry(Owned, ABCScoreRegistry):
 
         del self._score_address[_scoreName]
         self.AddressUpdate(_scoreName, ZERO_SCORE_ADDRESS)
+
+    @external
+    def registerConverter(self, _converter: Address):
+        """
+        Registers a converter with its flexible token and connector tokens.
+        Registering a registered converter again refreshes its connector tokens,
+        so it should be done after connectors are added to the converter.
+        can only be called by the owner
+
+        :param _converter: converter SCORE address
+        """
+        self.require_owner_only()
+        require_valid_address(_converter)
+        require(_converter.is_contract, "only SCORE address can be registered")
+
+        converter = self.create_interface_score(_converter, Converter)
+        flexible_token = converter.getToken()
+        require_valid_address(flexible_token)
+        registered_converter = self._token_converter[flexible_token]
+        require(registered_converter is None or registered_converter == _converter,
+                "flexible token is already registered with another converter")
+
+        connector_tokens = [converter.getConnectorAt(index) for index in range(converter.getConnectorTokenCount())]
+        self._set_converter_connectors(_converter, connector_tokens)
+
+        if self._get_converters().add(_converter):
+            self._get_flexible_tokens().add(flexible_token)
+            self._converter_token[_converter] = flexible_token
+            self._token_converter[flexible_token] = _converter
+            self.ConverterAdd(_converter, flexible_token)
+
+    @external
+    def unregisterConverter(self, _converter: Address):
+        """
+        Unregisters a converter with its flexible token and connector tokens
+        can only be called by the owner
+
+        :param _converter: converter SCORE address
+        """
+        self.require_owner_only()
+        require(self._get_converters().remove(_converter), "this converter is not registered")
+
+        flexible_token = self._converter_token[_converter]
+        self._set_converter_connectors(_converter, [])
+        self._get_flexible_tokens().remove(flexible_token)
+        del self._converter_token[_converter]
+        del self._token_converter[flexible_token]
+        self.ConverterRemove(_converter, flexible_token)
+
+    @external(readonly=True)
+    def getConverterCount(self) -> int:
+        """
+        Returns the number of registered converters
+
+        :return: number of converters
+        """
+        return len(self._get_converters())
+
+    @external(readonly=True)
+    def getConverters(self, _offset: int, _limit: int) -> list:
+        """
+        Returns a page of the registered converters.
+        The order is not kept across unregistrations, as a removed converter is replaced by the last one.
+
+        :param _offset: index of the first converter
+        :param _limit: maximum number of converters to return, up to 100
+        :return: list of converter addresses
+        """
+        self._require_valid_page(_offset, _limit)
+        return self._get_converters().slice(_offset, _limit)
+
+    @external(readonly=True)
+    def getFlexibleTokenCount(self) -> int:
+        """
+        Returns the number of flexible tokens of the registered converters
+
+        :return: number of flexible tokens
+        """
+        return len(self._get_flexible_tokens())
+
+    @external(readonly=True)
+    def getFlexibleTokens(self, _offset: int, _limit: int) -> list:
+        """
+        Returns a page of the flexible tokens of the registered converters.
+        The order is not kept across unregistrations, as a removed token is replaced by the last one.
+
+        :param _offset: index of the first flexible token
+        :param _limit: maximum number of flexible tokens to return, up to 100
+        :return: list of flexible token addresses
+        """
+        self._require_valid_page(_offset, _limit)
+        return self._get_flexible_tokens().slice(_offset, _limit)
+
+    @external(readonly=True)
+    def getConverter(self, _flexibleToken: Address) -> Address:
+        """
+        Returns the registered converter of a flexible token
+
+        :param _flexibleToken: flexible token address
+        :return: converter address, or the zero score address if none is registered
+        """
+        converter = self._token_converter[_flexibleToken]
+        return ZERO_SCORE_ADDRESS if converter is None else converter
+
+    @external(readonly=True)
+    def getConverterCountByConnector(self, _connectorToken: Address) -> int:
+        """
+        Returns the number of registered converters which have the token as a connector
+
+        :param _connectorToken: connector token address
+        :return: number of converters
+        """
+        return len(self._get_connector_converters(_connectorToken))
+
+    @external(readonly=True)
+    def getConvertersByConnector(self, _connectorToken: Address, _offset: int, _limit: int) -> list:
+        """
+        Returns a page of the registered converters which have the token as a connector
+
+        :param _connectorToken: connector token address
+        :param _offset: index of the first converter
+        :param _limit: maximum number of converters to return, up to 100
+        :return: list of converter addresses
+        """
+        self._require_valid_page(_offset, _limit)
+        return self._get_connector_converters(_connectorToken).slice(_offset, _limit)
+
+    # ArrayDB reads and keeps its size on creation,
+    # so the sets are created whenever they are used instead of living as long as the SCORE instance
+    def _get_converters(self) -> AddressSet:
+        return AddressSet(self._CONVERTERS, self.db)
+
+    def _get_flexible_tokens(self) -> AddressSet:
+        return AddressSet(self._FLEXIBLE_TOKENS, self.db)
+
+    def _get_converter_connectors(self, converter: Address) -> AddressSet:
+        return AddressSet(f'{self._CONVERTER_CONNECTORS}_{converter}', self.db)
+
+    def _get_connector_converters(self, connector_token: Address) -> AddressSet:
+        return AddressSet(f'{self._CONNECTOR_CONVERTERS}_{connector_token}', self.db)
+
+    def _set_converter_connectors(self, converter: Address, connector_tokens: list) -> None:
+        """
+        Replaces the connector tokens of the converter, keeping the reverse lookup in sync
+
+        :param converter: converter address
+        :param connector_tokens: new connector token addresses
+        """
+        converter_connectors = self._get_converter_connectors(converter)
+        for connector_token in converter_connectors.slice(0, len(converter_connectors)):
+            if connector_token not in connector_tokens:
+                converter_connectors.remove(connector_token)
+                self._get_connector_converters(connector_token).remove(converter)
+
+        for connector_token in connector_tokens:
+            if converter_connectors.add(connector_token):
+                self._get_connector_converters(connector_token).add(converter)
+
+    def _require_valid_page(self, offset: int, limit: int) -> None:
+        if offset < 0:
+            revert("Offset cannot be less than zero")
+        if not 0 < limit <= self._MAX_ADDRESSES_PER_PAGE:
+            revert(f"Limit should be between 1 and {self._MAX_ADDRESSES_PER_PAGE}")
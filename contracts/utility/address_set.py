@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+
+
+class AddressSet:
+    """
+    Enumerable set of addresses.
+
+    Addresses are kept in an ArrayDB and their positions in a DictDB,
+    so adding, removing and checking membership take O(1) reads and writes.
+    The order of the addresses is not preserved on removal, as the last address is moved into the hole.
+    """
+
+    def __init__(self, key: str, db: IconScoreDatabase):
+        """
+        :param key: key prefix of the container dbs
+        :param db: IconScoreDatabase
+        """
+        self._addresses = ArrayDB(f'{key}_addresses', db, value_type=Address)
+        # address -> index in the array + 1, 0 means the address is not in the set
+        self._positions = DictDB(f'{key}_positions', db, value_type=int)
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address: Address) -> bool:
+        return self._positions[address] != 0
+
+    def __getitem__(self, index: int) -> Address:
+        return self._addresses[index]
+
+    def add(self, address: Address) -> bool:
+        """
+        Adds the address to the set
+
+        :param address: address to add
+        :return: True if the address is added, False if it is already in the set
+        """
+        if self._positions[address] != 0:
+            return False
+
+        self._addresses.put(address)
+        self._positions[address] = len(self._addresses)
+        return True
+
+    def remove(self, address: Address) -> bool:
+        """
+        Removes the address from the set, moving the last address into its position
+
+        :param address: address to remove
+        :return: True if the address is removed, False if it is not in the set
+        """
+        position = self._positions[address]
+        if position == 0:
+            return False
+
+        last_address = self._addresses.pop()
+        if last_address != address:
+            self._addresses[position - 1] = last_address
+            self._positions[last_address] = position
+        self._positions.remove(address)
+        return True
+
+    def slice(self, offset: int, limit: int) -> list:
+        """
+        Returns the addresses in the range
+
+        :param offset: index of the first address
+        :param limit: maximum number of addresses to return
+        :return: list of addresses
+        """
+        end = min(offset + limit, len(self._addresses))
+        return [self._addresses[index] for index in range(offset, end)]
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .checkpoints import Checkpoints
+from .holder_index import HolderIndex
+from .token_storage import TokenStorage
+from .utils import *
+
+
+class CheckpointedTokenStorage(TokenStorage):
+    """
+    Token storage which also records the balances and the total supply at every block height they change,
+    so that they can be queried at past block heights.
+
+    The checkpoints start at the block height where the storage is started, on install or on the update
+    of a token which was deployed without them. A balance or the total supply held since before the start
+    is recorded at the start height with its first change, and one which has not changed since the start
+    is the current value. So they can be queried from the start height without migrating every balance.
+    """
+    _BALANCE_CHECKPOINTS = 'balance_checkpoints'
+    _TOTAL_SUPPLY_CHECKPOINTS = 'total_supply_checkpoints'
+    _START_HEIGHT = 'checkpoint_start_height'
+
+    def __init__(self, balances: DictDB, total_supply: VarDB, db: IconScoreDatabase,
+                 get_block_height: callable, holder_index: HolderIndex = None):
+        """
+        :param balances: DictDB of balances, address -> int
+        :param total_supply: VarDB of the total supply
+        :param db: IconScoreDatabase where the checkpoints are stored
+        :param get_block_height: function returning the current block height
+        :param holder_index: (Optional) index of the holders to keep along with the balances
+        """
+        super().__init__(balances, total_supply, holder_index)
+        self._db = db
+        self._get_block_height = get_block_height
+        self._start_height = VarDB(self._START_HEIGHT, db, value_type=int)
+
+    def start(self) -> None:
+        """
+        Starts the checkpoints at the current block height if they have not been started
+        """
+        if not self.is_started():
+            # the start height is stored plus one, as a token can be installed at the block height 0
+            self._start_height.set(self._get_block_height() + 1)
+
+    def is_started(self) -> bool:
+        return self._start_height.get() > 0
+
+    def get_start_height(self) -> int:
+        """
+        Returns the block height where the checkpoints start
+
+        :return: start height, 0 if they have not been started
+        """
+        return max(self._start_height.get() - 1, 0)
+
+    def get_balance_checkpoints(self, account: Address) -> Checkpoints:
+        return Checkpoints(f'{self._BALANCE_CHECKPOINTS}_{account}', self._db)
+
+    def get_total_supply_checkpoints(self) -> Checkpoints:
+        return Checkpoints(self._TOTAL_SUPPLY_CHECKPOINTS, self._db)
+
+    def get_balance_at(self, account: Address, height: int) -> int:
+        """
+        Returns the balance of the account at the end of the block height
+
+        :param account: account address
+        :param height: block height, not less than the start height
+        :return: balance at the block height
+        """
+        checkpoints = self.get_balance_checkpoints(account)
+        if len(checkpoints) == 0:
+            return self._balances[account]
+        return checkpoints.get_at(height)
+
+    def get_total_supply_at(self, height: int) -> int:
+        """
+        Returns the total supply at the end of the block height
+
+        :param height: block height, not less than the start height
+        :return: total supply at the block height
+        """
+        checkpoints = self.get_total_supply_checkpoints()
+        if len(checkpoints) == 0:
+            return self._total_supply.get()
+        return checkpoints.get_at(height)
+
+    def _set_balance(self, account: Address, prev_balance: int, balance: int) -> None:
+        super()._set_balance(account, prev_balance, balance)
+        self._record(self.get_balance_checkpoints(account), prev_balance, balance)
+
+    def _set_total_supply(self, prev_total_supply: int, total_supply: int) -> None:
+        super()._set_total_supply(prev_total_supply, total_supply)
+        self._record(self.get_total_supply_checkpoints(), prev_total_supply, total_supply)
+
+    def _record(self, checkpoints: Checkpoints, prev_value: int, value: int) -> None:
+        if len(checkpoints) == 0 and prev_value != 0:
+            # the value held since before the start is recorded at the start height
+            checkpoints.record(self.get_start_height(), prev_value)
+        checkpoints.record(self._get_block_height(), value)
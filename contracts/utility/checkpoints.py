@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+
+
+class Checkpoints:
+    """
+    History of an integer value, kept as checkpoints of (block height, value) in increasing order of heights.
+
+    A value is recorded at most once per block height, as recording again in the same block
+    overwrites the last checkpoint, so the history grows by one checkpoint per block at most.
+    """
+
+    def __init__(self, key: str, db: IconScoreDatabase):
+        """
+        :param key: key prefix of the container dbs
+        :param db: IconScoreDatabase
+        """
+        self._heights = ArrayDB(f'{key}_heights', db, value_type=int)
+        self._values = ArrayDB(f'{key}_values', db, value_type=int)
+
+    def __len__(self) -> int:
+        return len(self._heights)
+
+    def record(self, height: int, value: int) -> None:
+        """
+        Records the value at the block height
+
+        :param height: block height, not less than the height of the last checkpoint
+        :param value: value from the block height
+        """
+        count = len(self._heights)
+        if count > 0 and self._heights[count - 1] == height:
+            self._values[count - 1] = value
+        else:
+            self._heights.put(height)
+            self._values.put(value)
+
+    def get_at(self, height: int) -> int:
+        """
+        Returns the value at the end of the block height by binary search
+
+        :param height: block height
+        :return: the value of the last checkpoint at or before the height, 0 if there is none
+        """
+        low, high = 0, len(self._heights)
+        while low < high:
+            middle = (low + high) // 2
+            if self._heights[middle] <= height:
+                low = middle + 1
+            else:
+                high = middle
+
+        return self._values[low - 1] if low > 0 else 0
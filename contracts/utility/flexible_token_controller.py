@@ -18,13 +18,14 @@ from .proxy_score import ProxyScore
 from .token_holder import TokenHolder
 from .utils import *
 from ..interfaces.abc_flexible_token import ABCFlexibleToken
+from ..interfaces.abc_flexible_token_controller import ABCFlexibleTokenController
 
 # interface SCORE of `FlexibleToken`
 FlexibleToken = ProxyScore(ABCFlexibleToken)
 
 
 # noinspection PyPep8Naming,PyMethodOverriding
-class FlexibleTokenController(TokenHolder):
+class FlexibleTokenController(TokenHolder, ABCFlexibleTokenController):
     """
     Once it accepts ownership of the token, it becomes the token's sole controller
     that can execute any of its functions.
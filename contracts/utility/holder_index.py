@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from iconservice import *
+
+from .address_set import AddressSet
+
+
+class HolderIndex:
+    """
+    Optional index of the accounts holding a positive balance of a token.
+
+    The index is updated only when a balance changes from or to zero,
+    so transfers between existing holders cost nothing more than without the index.
+    """
+    _HOLDER_INDEX_ENABLED = 'holder_index_enabled'
+    _HOLDERS = 'holders'
+
+    def __init__(self, db: IconScoreDatabase):
+        """
+        :param db: IconScoreDatabase
+        """
+        self._db = db
+        self._enabled = VarDB(self._HOLDER_INDEX_ENABLED, db, value_type=bool)
+
+    @property
+    def holders(self) -> AddressSet:
+        # ArrayDB reads and keeps its size on creation,
+        # so the set is created whenever it is used instead of living as long as the SCORE instance
+        return AddressSet(self._HOLDERS, self._db)
+
+    def is_enabled(self) -> bool:
+        return self._enabled.get()
+
+    def enable(self) -> None:
+        """
+        Enables the index. The accounts which already hold a balance are not indexed
+        until they are added by `add_holder`.
+        """
+        self._enabled.set(True)
+
+    def add_holder(self, account: Address, balance: int) -> bool:
+        """
+        Adds the account which held a balance before the index is enabled
+
+        :param account: account to add
+        :param balance: current balance of the account
+        :return: True if the account is added, False if it holds no balance or is already indexed
+        """
+        if balance == 0:
+            return False
+        return self.holders.add(account)
+
+    def on_balance_changed(self, account: Address, prev_balance: int, balance: int) -> None:
+        """
+        Adds or removes the account on transitions from and to zero balance
+
+        :param account: account whose balance is changed
+        :param prev_balance: balance before the change
+        :param balance: balance after the change
+        """
+        if (prev_balance == 0) == (balance == 0) or not self._enabled.get():
+            return
+
+        if balance == 0:
+            self.holders.remove(account)
+        else:
+            self.holders.add(account)
@@ -23,15 +23,80 @@ if False:
     T = TypeVar('T')
 
 
+class LazyProxyClass:
+    """
+    A handle of an interface SCORE class which creates the class on its first use,
+    so that declaring interface SCOREs at module level costs nothing on SCORE loading.
+    It is called and accessed like the interface SCORE class, and works as the class
+    in `isinstance` and `issubclass` checks.
+    The handle itself is not a class, so it can not be subclassed or checked as the first argument
+    of `issubclass`; use `get_proxy_class` where the class object is needed.
+    """
+
+    def __init__(self, abc_class: 'T') -> None:
+        self.__name__ = self.__qualname__ = "%s(%s)" % (ProxyScore.__name__, abc_class.__name__)
+        self.__module__ = abc_class.__module__
+        self._abc_class = abc_class
+        self._abstract_method_names = ProxyScore.get_abstract_method_names(abc_class)
+        self._proxy_class = None
+
+    def get_proxy_class(self) -> 'T':
+        """
+        Returns the interface SCORE class, creating it if it is the first use
+
+        :return: interface SCORE class
+        """
+        if self._proxy_class is None:
+            self._proxy_class = ProxyScore.get_proxy_class(self._abc_class)
+        return self._proxy_class
+
+    def __call__(self, *args, **kwargs):
+        return self.get_proxy_class()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # special attributes are not forwarded, as they describe the handle itself
+        if name.startswith('__') and name.endswith('__') \
+                or name in ('_abc_class', '_abstract_method_names', '_proxy_class'):
+            raise AttributeError(name)
+        # constants of the abc class such as score ids do not need the interface SCORE class
+        if name not in self._abstract_method_names and hasattr(self._abc_class, name):
+            return getattr(self._abc_class, name)
+        return getattr(self.get_proxy_class(), name)
+
+    def __instancecheck__(self, instance) -> bool:
+        # only instances of the abc class can be instances of the interface SCORE class,
+        # which is checked first not to create the class for nothing
+        return isinstance(instance, self._abc_class) and isinstance(instance, self.get_proxy_class())
+
+    def __subclasscheck__(self, subclass) -> bool:
+        return issubclass(subclass, self._abc_class) and issubclass(subclass, self.get_proxy_class())
+
+    def __repr__(self) -> str:
+        return "<%s>" % self.__name__
+
+
 class ProxyScore(type):
     """
-    A Proxy class that provides an Interface SCORE from the abc class
+    A Proxy class that provides an Interface SCORE from the abc class.
+    The interface SCORE class is created lazily on the first `create_interface_score` use.
 
     usage:
         token_score = self.create_interface_score(token_address, ProxyScore(ABCIRCToken))
         token_score.transfer(to, value)
     """
 
+    @staticmethod
+    def get_abstract_method_names(abc_class: 'T') -> frozenset:
+        """
+        Returns the names of the abstract methods of the abc class.
+        ABCMeta already scans them on the abc class creation,
+        so it does not need to look up every attribute of the class again.
+
+        :param abc_class: An abstract class
+        :return: names of the abstract methods
+        """
+        return getattr(abc_class, '__abstractmethods__', frozenset())
+
     @classmethod
     def _create_proxy_class(mcs, abc_class: 'T') -> 'T':
         """
@@ -43,13 +108,9 @@ class ProxyScore(type):
 
         interface_functions = {}
 
-        attributes = dir(abc_class)
-        for attribute_name in attributes:
+        for attribute_name in mcs.get_abstract_method_names(abc_class):
             attribute = getattr(abc_class, attribute_name)
-            if callable(attribute) \
-                    and hasattr(attribute, '__isabstractmethod__') \
-                    and attribute.__isabstractmethod__:
-                interface_functions[attribute.__name__] = mcs._get_interface_function(attribute)
+            interface_functions[attribute_name] = mcs._get_interface_function(attribute)
 
         proxy_name = "%s(%s)" % (mcs.__name__, abc_class.__name__)
         return type(proxy_name, (InterfaceScore, abc_class), interface_functions)
@@ -67,9 +128,10 @@ class ProxyScore(type):
             interface_function.__isabstractmethod__ = False
         return interface_function
 
-    def __new__(mcs, abc_class: 'T') -> 'T':
+    @classmethod
+    def get_proxy_class(mcs, abc_class: 'T') -> 'T':
         """
-        Retrieves an interface SCORE related in given abc class if the cache exists,
+        Retrieves an interface SCORE class related in given abc class if the cache exists,
         otherwise creates a new one
 
         :param abc_class: An abstract class
@@ -84,3 +146,21 @@ class ProxyScore(type):
         except KeyError:
             cache[abc_class] = proxy_class = mcs._create_proxy_class(abc_class)
         return proxy_class
+
+    def __new__(mcs, abc_class: 'T') -> 'T':
+        """
+        Retrieves a lazy handle of the interface SCORE related in given abc class if the cache exists,
+        otherwise creates a new one
+
+        :param abc_class: An abstract class
+        :return: handle of the interface SCORE class
+        """
+        try:
+            cache = mcs.__dict__["_lazy_proxy_cache"]
+        except KeyError:
+            mcs._lazy_proxy_cache = cache = {}
+        try:
+            lazy_proxy = cache[abc_class]
+        except KeyError:
+            cache[abc_class] = lazy_proxy = LazyProxyClass(abc_class)
+        return lazy_proxy
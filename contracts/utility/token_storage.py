@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .holder_index import HolderIndex
+from .utils import *
+
+
+class TokenStorage:
+    """
+    Storage layer of token balances and the total supply.
+
+    Every operation reads each balance it touches and the total supply at most once
+    and writes each of them once, as they are the most frequently accessed keys of a token.
+    Subclasses can hook into `_set_balance` and `_set_total_supply` to keep derived data.
+    """
+
+    def __init__(self, balances: DictDB, total_supply: VarDB, holder_index: HolderIndex = None):
+        """
+        :param balances: DictDB of balances, address -> int
+        :param total_supply: VarDB of the total supply
+        :param holder_index: (Optional) index of the holders to keep along with the balances
+        """
+        self._balances = balances
+        self._total_supply = total_supply
+        self._holder_index = holder_index
+
+    def transfer(self, _from: Address, _to: Address, value: int) -> None:
+        """
+        Moves value from an account to another
+
+        :param _from: account to debit
+        :param _to: account to credit
+        :param value: value to move
+        """
+        from_balance = self._balances[_from]
+        require(from_balance >= value, "Out of balance")
+        if _from == _to:
+            return
+
+        self._set_balance(_from, from_balance, from_balance - value)
+        to_balance = self._balances[_to]
+        self._set_balance(_to, to_balance, to_balance + value)
+
+    def transfer_batch(self, _from: Address, batch: dict) -> None:
+        """
+        Moves values from an account to several accounts, debiting the sender once
+
+        :param _from: account to debit
+        :param batch: account to credit -> value, each account appears once
+        """
+        from_balance = self._balances[_from]
+        total_value = sum(batch.values())
+        require(from_balance >= total_value, "Out of balance")
+
+        # the sender can be one of the recipients as well
+        new_from_balance = from_balance - total_value + batch.get(_from, 0)
+        if new_from_balance != from_balance:
+            self._set_balance(_from, from_balance, new_from_balance)
+
+        for to, value in batch.items():
+            if to == _from:
+                continue
+            to_balance = self._balances[to]
+            self._set_balance(to, to_balance, to_balance + value)
+
+    def issue(self, _to: Address, amount: int) -> None:
+        """
+        Increases the balance of an account and the total supply
+
+        :param _to: account to credit
+        :param amount: amount to issue
+        """
+        to_balance = self._balances[_to]
+        self._set_balance(_to, to_balance, to_balance + amount)
+        total_supply = self._total_supply.get()
+        self._set_total_supply(total_supply, total_supply + amount)
+
+    def destroy(self, _from: Address, amount: int) -> None:
+        """
+        Decreases the balance of an account and the total supply
+
+        :param _from: account to debit
+        :param amount: amount to destroy
+        """
+        from_balance = self._balances[_from]
+        require(from_balance >= amount, "Out of balance")
+        self._set_balance(_from, from_balance, from_balance - amount)
+        total_supply = self._total_supply.get()
+        self._set_total_supply(total_supply, total_supply - amount)
+
+    def _set_balance(self, account: Address, prev_balance: int, balance: int) -> None:
+        self._balances[account] = balance
+        if self._holder_index is not None:
+            self._holder_index.on_balance_changed(account, prev_balance, balance)
+
+    def _set_total_supply(self, prev_total_supply: int, total_supply: int) -> None:
+        self._total_supply.set(total_supply)
+
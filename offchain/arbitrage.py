@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import namedtuple
+
+from offchain.pool import PoolCache, PoolState
+from offchain.quote import QuoteError, get_return, estimate_return, get_spot_rate
+
+GOLDEN_RATIO = (5 ** 0.5 - 1) / 2
+# relative precision of the optimal input, which is far finer than the estimates are apart from the exact quotes
+SEARCH_TOLERANCE = 1e-9
+
+# conversion of a token to another token through a converter
+Hop = namedtuple("Hop", "converter from_token to_token")
+# profitable cycle, the amounts are in the first token of the cycle
+Opportunity = namedtuple("Opportunity", "cycle amount return_amount profit")
+
+
+def get_hops(pool: PoolState) -> list:
+    """Returns the conversions the converter allows, between its flexible token and connectors
+    and between its connectors
+
+    :param pool: state of the converter
+    :return: list of Hop
+    """
+    hops = []
+    for connector_token, connector in pool.connectors.items():
+        # selling is always allowed, while buying and converting to a connector can be disabled
+        hops.append(Hop(pool.converter, pool.token, connector_token))
+        if connector.is_purchase_enabled:
+            hops.append(Hop(pool.converter, connector_token, pool.token))
+        for to_token, to_connector in pool.connectors.items():
+            if to_token != connector_token and to_connector.is_purchase_enabled:
+                hops.append(Hop(pool.converter, connector_token, to_token))
+    return hops
+
+
+def _is_tradable(pool: PoolState, hop: Hop) -> bool:
+    if pool.token_supply <= 0 and pool.token in (hop.from_token, hop.to_token):
+        return False
+    return all(connector.balance > 0 and connector.weight > 0
+               for token, connector in pool.connectors.items() if token in (hop.from_token, hop.to_token))
+
+
+class ArbitrageDetector:
+    """
+    Finds the cycles of conversions through converters which return more than their input, with the input
+    amount maximizing the profit.
+
+    The cycles pass each converter at most once, so that the quotes of their hops are independent.
+    They are enumerated when the converters or their connectors change, and only the cycles through
+    the converters changed by the events of a block are evaluated again.
+    A cycle is evaluated by its marginal rate first, and only a cycle with a marginal rate above 1 is searched
+    for the optimal input by the floating point estimates, then quoted exactly with `FixedMapFormula`.
+    """
+
+    def __init__(self, pool_cache: PoolCache, max_hops: int = 3, base_tokens: list = None) -> None:
+        """
+        :param pool_cache: states of the converters, updated by `update`
+        :param max_hops: maximum number of conversions in a cycle
+        :param base_tokens: (Optional) tokens the cycles start with, the tokens held to run them.
+            If it is not given, each cycle starts with its smallest token address
+        """
+        self._cache = pool_cache
+        self._max_hops = max_hops
+        self._base_tokens = set(base_tokens) if base_tokens is not None else None
+        # list of cycles, tuples of Hop
+        self._cycles = []
+        # converter -> indexes of the cycles through it
+        self._cycles_by_converter = {}
+        # cycle index -> Opportunity of the cycles which are profitable
+        self._opportunities = {}
+        # converter -> tokens of the converter, to notice the changes of the graph
+        self._topology = {}
+        self.rebuild()
+
+    def rebuild(self) -> list:
+        """Enumerates the cycles of the converters again and evaluates them all
+
+        :return: list of Opportunity in decreasing order of the profit
+        """
+        self._topology = {converter: self._get_topology(pool) for converter, pool in self._cache.pools.items()}
+
+        # token -> hops from the token
+        graph = {}
+        for pool in self._cache.pools.values():
+            for hop in get_hops(pool):
+                graph.setdefault(hop.from_token, []).append(hop)
+
+        self._cycles = []
+        self._cycles_by_converter = {}
+        for start in sorted(graph):
+            if self._base_tokens is None or start in self._base_tokens:
+                self._find_cycles(graph, start, [], {start}, set())
+
+        self._opportunities = {}
+        return self._evaluate_all(range(len(self._cycles)))
+
+    def _find_cycles(self, graph: dict, start: str, path: list, tokens: set, converters: set) -> None:
+        token = path[-1].to_token if path else start
+        for hop in graph.get(token, []):
+            if hop.converter in converters:
+                continue
+            if hop.to_token == start:
+                if path:
+                    self._add_cycle(tuple(path + [hop]))
+                continue
+            # without base tokens, a cycle is found only from its smallest token
+            if len(path) + 2 > self._max_hops or hop.to_token in tokens \
+                    or (self._base_tokens is None and hop.to_token < start):
+                continue
+            tokens.add(hop.to_token)
+            converters.add(hop.converter)
+            self._find_cycles(graph, start, path + [hop], tokens, converters)
+            tokens.remove(hop.to_token)
+            converters.remove(hop.converter)
+
+    def _add_cycle(self, cycle: tuple) -> None:
+        index = len(self._cycles)
+        self._cycles.append(cycle)
+        for hop in cycle:
+            self._cycles_by_converter.setdefault(hop.converter, []).append(index)
+
+    @staticmethod
+    def _get_topology(pool: PoolState) -> tuple:
+        return pool.token, tuple((token, connector.is_purchase_enabled) for token, connector in pool.connectors.items())
+
+    def update(self, records, block_height: int = None) -> list:
+        """Applies the event records of a block and evaluates the cycles through the changed converters again
+
+        :param records: event records of `offchain.events` in the order of the chain
+        :param block_height: height of the block of the records
+        :return: list of Opportunity of the evaluated cycles in decreasing order of the profit
+        """
+        changed = self._cache.apply_all(records, block_height)
+        if any(self._topology.get(converter) != self._get_topology(self._cache.get(converter))
+               for converter in changed):
+            return self.rebuild()
+
+        indexes = set()
+        for converter in changed:
+            indexes.update(self._cycles_by_converter.get(converter, []))
+        return self._evaluate_all(indexes)
+
+    def get_opportunities(self) -> list:
+        """Returns the profitable cycles at the current states
+
+        :return: list of Opportunity in decreasing order of the profit
+        """
+        return sorted(self._opportunities.values(), key=lambda opportunity: -opportunity.profit)
+
+    def get_cycle_count(self) -> int:
+        return len(self._cycles)
+
+    def _evaluate_all(self, indexes) -> list:
+        opportunities = []
+        for index in indexes:
+            opportunity = self._evaluate(self._cycles[index])
+            if opportunity is None:
+                self._opportunities.pop(index, None)
+            else:
+                self._opportunities[index] = opportunity
+                opportunities.append(opportunity)
+        return sorted(opportunities, key=lambda opportunity: -opportunity.profit)
+
+    def _evaluate(self, cycle: tuple) -> Opportunity:
+        """Returns the opportunity of the cycle with the optimal input, None if it is not profitable"""
+        pools = [self._cache.get(hop.converter) for hop in cycle]
+        if not all(_is_tradable(pool, hop) for pool, hop in zip(pools, cycle)):
+            return None
+
+        rate = 1.0
+        for pool, hop in zip(pools, cycle):
+            rate *= get_spot_rate(pool, hop.from_token, hop.to_token)
+        if rate <= 1:
+            return None
+
+        def estimate_profit(amount: float) -> float:
+            return_amount = amount
+            for pool_, hop_ in zip(pools, cycle):
+                return_amount = estimate_return(pool_, hop_.from_token, hop_.to_token, return_amount)
+            return return_amount - amount
+
+        # the profit is concave in the input, so golden section search finds the maximum
+        first_pool, first_hop = pools[0], cycle[0]
+        if first_hop.from_token == first_pool.token:
+            low, high = 0.0, float(first_pool.token_supply)
+        else:
+            low, high = 0.0, float(first_pool.connectors[first_hop.from_token].balance)
+        left, right = high - GOLDEN_RATIO * (high - low), low + GOLDEN_RATIO * (high - low)
+        left_profit, right_profit = estimate_profit(left), estimate_profit(right)
+        while high - low > max(1.0, high * SEARCH_TOLERANCE):
+            if left_profit < right_profit:
+                low, left, left_profit = left, right, right_profit
+                right = low + GOLDEN_RATIO * (high - low)
+                right_profit = estimate_profit(right)
+            else:
+                high, right, right_profit = right, left, left_profit
+                left = high - GOLDEN_RATIO * (high - low)
+                left_profit = estimate_profit(left)
+
+        amount = max(1, int((low + high) / 2))
+        try:
+            return_amount = amount
+            for pool, hop in zip(pools, cycle):
+                return_amount = get_return(pool, hop.from_token, hop.to_token, return_amount)['amount']
+        except QuoteError:
+            return None
+
+        if return_amount <= amount:
+            return None
+        return Opportunity(cycle, amount, return_amount, return_amount - amount)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import namedtuple
+
+# Event records parsed from the event logs, with the position of the log in the chain.
+# Addresses are kept as strings and every integer is decoded from its hex string.
+Conversion = namedtuple(
+    "Conversion", "block_height timestamp tx_hash score from_token to_token trader amount return_amount fee")
+PriceDataUpdate = namedtuple(
+    "PriceDataUpdate", "block_height timestamp tx_hash score connector_token token_supply connector_balance "
+                       "connector_weight")
+ConversionFeeUpdate = namedtuple(
+    "ConversionFeeUpdate", "block_height timestamp tx_hash score prev_fee new_fee")
+Transfer = namedtuple(
+    "Transfer", "block_height timestamp tx_hash score from_address to_address value")
+Issuance = namedtuple(
+    "Issuance", "block_height timestamp tx_hash score amount")
+Destruction = namedtuple(
+    "Destruction", "block_height timestamp tx_hash score amount")
+
+# event signature -> (record type, names of the indexed arguments, names of the data arguments)
+EVENT_SIGNATURES = {
+    "Conversion(Address,Address,Address,int,int,int)":
+        (Conversion, ("from_token", "to_token", "trader"), ("amount", "return_amount", "fee")),
+    "PriceDataUpdate(Address,int,int,int)":
+        (PriceDataUpdate, ("connector_token",), ("token_supply", "connector_balance", "connector_weight")),
+    "ConversionFeeUpdate(int,int)":
+        (ConversionFeeUpdate, (), ("prev_fee", "new_fee")),
+    "Transfer(Address,Address,int,bytes)":
+        (Transfer, ("from_address", "to_address", "value"), ()),
+    "Issuance(int)":
+        (Issuance, (), ("amount",)),
+    "Destruction(int)":
+        (Destruction, (), ("amount",)),
+}
+
+ConnectorUpdate = namedtuple(
+    "ConnectorUpdate", "block_height timestamp tx_hash score connector_token weight enable_virtual_balance "
+                       "connector_balance")
+ConnectorPurchasesDisable = namedtuple(
+    "ConnectorPurchasesDisable", "block_height timestamp tx_hash score connector_token disable")
+ConversionsEnable = namedtuple(
+    "ConversionsEnable", "block_height timestamp tx_hash score conversions_enabled")
+
+# events of the owner configuring a converter, which change its state but not its price history
+POOL_EVENT_SIGNATURES = {
+    "ConnectorUpdate(Address,int,bool,int)":
+        (ConnectorUpdate, ("connector_token",), ("weight", "enable_virtual_balance", "connector_balance")),
+    "ConnectorPurchasesDisable(Address,bool)":
+        (ConnectorPurchasesDisable, ("connector_token",), ("disable",)),
+    "ConversionsEnable(bool)":
+        (ConversionsEnable, (), ("conversions_enabled",)),
+}
+
+OwnerUpdate = namedtuple(
+    "OwnerUpdate", "block_height timestamp tx_hash score prev_owner new_owner")
+NewFlexibleToken = namedtuple(
+    "NewFlexibleToken", "block_height timestamp tx_hash score token")
+ConnectorAdd = namedtuple(
+    "ConnectorAdd", "block_height timestamp tx_hash score connector_token weight enable_virtual_balance")
+AddressUpdate = namedtuple(
+    "AddressUpdate", "block_height timestamp tx_hash score contract_name score_address")
+
+# events changing which converters, tokens and connectors the DEX consists of, rather than their states
+GRAPH_EVENT_SIGNATURES = {
+    "OwnerUpdate(Address,Address)":
+        (OwnerUpdate, ("prev_owner", "new_owner"), ()),
+    "NewFlexibleToken(Address)":
+        (NewFlexibleToken, (), ("token",)),
+    "ConnectorAdd(Address,int,bool)":
+        (ConnectorAdd, ("connector_token",), ("weight", "enable_virtual_balance")),
+    "AddressUpdate(str,Address)":
+        (AddressUpdate, ("contract_name",), ("score_address",)),
+}
+
+ADDRESS_FIELDS = {"score", "from_token", "to_token", "trader", "connector_token", "from_address", "to_address",
+                  "prev_owner", "new_owner", "token", "score_address"}
+STRING_FIELDS = {"contract_name"}
+
+
+def to_int(value) -> int:
+    """Converts an integer of JSON-RPC, either a hex string or a number, into int
+
+    :param value: hex string with 0x prefix, decimal string or int
+    :return: int value
+    """
+    if isinstance(value, int):
+        return value
+    return int(value, 0)
+
+
+def parse_event_log(event_log: dict, block_height: int, timestamp: int, tx_hash: str,
+                    signatures: dict = EVENT_SIGNATURES):
+    """Parses an event log of a transaction result
+
+    :param event_log: event log in the JSON-RPC format
+        ex. {'scoreAddress': 'cx..', 'indexed': ['Issuance(int)'], 'data': ['0x64']}
+    :param block_height: height of the block including the transaction
+    :param timestamp: timestamp of the block in microseconds
+    :param tx_hash: hash of the transaction
+    :param signatures: event signature -> (record type, indexed field names, data field names)
+        of the events to parse, `EVENT_SIGNATURES` by default
+    :return: event record, None if the event is not in the signatures
+    """
+    indexed = event_log.get("indexed") or []
+    if not indexed or indexed[0] not in signatures:
+        return None
+
+    record_type, indexed_names, data_names = signatures[indexed[0]]
+    values = dict(zip(indexed_names, indexed[1:]))
+    values.update(zip(data_names, event_log.get("data") or []))
+
+    fields = {}
+    for name in record_type._fields[4:]:
+        value = values.get(name)
+        if name in ADDRESS_FIELDS or name in STRING_FIELDS:
+            fields[name] = value
+        else:
+            fields[name] = to_int(value if value is not None else 0)
+
+    return record_type(block_height=block_height, timestamp=timestamp, tx_hash=tx_hash,
+                       score=event_log["scoreAddress"], **fields)
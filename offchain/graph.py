@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from offchain.events import OwnerUpdate, NewFlexibleToken, ConnectorAdd, AddressUpdate
+
+EMPTY = frozenset()
+ZERO_SCORE_ADDRESS = 'cx' + '0' * 40
+
+
+class GraphIndex:
+    """
+    Index of the flexible tokens, their converters and the connector tokens of the converters,
+    kept up to date by `NewFlexibleToken`, `OwnerUpdate`, `ConnectorAdd` and `AddressUpdate` events,
+    so that resolving a hop needs no calls to the SCOREs and every query takes constant time.
+
+    A converter is a pool of its connector tokens, and of its flexible token while it owns the token.
+    """
+
+    def __init__(self, registry: str = None) -> None:
+        """
+        :param registry: (Optional) address of the score registry to follow,
+            `AddressUpdate` events of any score are followed if it is not given
+        """
+        self._registry = registry
+        # flexible token -> owner
+        self._owners = {}
+        # owner -> flexible token
+        self._owned_tokens = {}
+        # converter -> tuple of connector tokens, in the order they are added
+        self._connectors = {}
+        # token -> frozenset of the converters having the token as the flexible token or a connector
+        self._pools = {}
+        # contract name -> address registered in the score registry
+        self._addresses = {}
+        self.block_height = -1
+
+    def get_converter(self, flexible_token: str) -> str:
+        """Returns the converter of the flexible token
+
+        :param flexible_token: flexible token address
+        :return: converter address, None if the token is not owned by a converter
+        """
+        owner = self._owners.get(flexible_token)
+        return owner if owner in self._connectors else None
+
+    def get_flexible_token(self, converter: str) -> str:
+        """Returns the flexible token the converter owns
+
+        :param converter: converter address
+        :return: flexible token address, None if the converter does not own a token
+        """
+        return self._owned_tokens.get(converter) if converter in self._connectors else None
+
+    def get_connectors(self, converter: str) -> tuple:
+        """Returns the connector tokens of the converter
+
+        :param converter: converter address
+        :return: tuple of connector token addresses, in the order they are added
+        """
+        return self._connectors.get(converter, ())
+
+    def get_pools(self, token: str) -> frozenset:
+        """Returns the converters containing the token
+
+        :param token: token address
+        :return: frozenset of the converters having the token as the flexible token or a connector
+        """
+        return self._pools.get(token, EMPTY)
+
+    def get_address(self, contract_name: str) -> str:
+        """Returns the address registered in the score registry
+
+        :param contract_name: contract name, ex. 'Network'
+        :return: score address, None if it is not registered
+        """
+        return self._addresses.get(contract_name)
+
+    def get_flexible_tokens(self) -> list:
+        return list(self._owners)
+
+    def get_converters(self) -> list:
+        return list(self._connectors)
+
+    def add_pool(self, converter: str, flexible_token: str, connector_tokens: list) -> None:
+        """Adds a converter owning its flexible token, to start from the converters read from the chain
+        or a snapshot rather than from the genesis
+
+        :param converter: converter address
+        :param flexible_token: flexible token address
+        :param connector_tokens: connector token addresses
+        """
+        for connector_token in connector_tokens:
+            self._add_connector(converter, connector_token)
+        self._set_owner(flexible_token, converter)
+
+    def apply(self, record) -> bool:
+        """Applies an event record. Records at or below the block height of the index are ignored.
+
+        :param record: event record of `offchain.events`
+        :return: True if the index is changed
+        """
+        if record.block_height <= self.block_height:
+            return False
+
+        if isinstance(record, NewFlexibleToken):
+            if record.token in self._owners:
+                return False
+            self._owners[record.token] = None
+            return True
+
+        if isinstance(record, OwnerUpdate):
+            if record.score not in self._owners:
+                return False
+            self._set_owner(record.score, record.new_owner)
+            return True
+
+        if isinstance(record, ConnectorAdd):
+            return self._add_connector(record.score, record.connector_token)
+
+        if isinstance(record, AddressUpdate):
+            if self._registry is not None and record.score != self._registry:
+                return False
+            if record.score_address is None or record.score_address == ZERO_SCORE_ADDRESS:
+                self._addresses.pop(record.contract_name, None)
+            else:
+                self._addresses[record.contract_name] = record.score_address
+            return True
+
+        return False
+
+    def apply_all(self, records, block_height: int = None) -> bool:
+        """Applies event records
+
+        :param records: iterable of event records in the order of the chain
+        :param block_height: height of the last block of the records, to move the index to
+        :return: True if the index is changed
+        """
+        changed = False
+        for record in records:
+            changed = self.apply(record) or changed
+        if block_height is not None and block_height > self.block_height:
+            self.block_height = block_height
+        return changed
+
+    def _set_pool(self, token: str, converter: str, contains: bool) -> None:
+        pools = self._pools.get(token, EMPTY)
+        if (converter in pools) != contains:
+            # the sets are replaced rather than modified, so that the returned ones stay as they are
+            self._pools[token] = pools | {converter} if contains else pools - {converter}
+
+    def _set_owner(self, flexible_token: str, owner: str) -> None:
+        prev_owner = self._owners.get(flexible_token)
+        if prev_owner is not None and self._owned_tokens.get(prev_owner) == flexible_token:
+            del self._owned_tokens[prev_owner]
+            self._set_pool(flexible_token, prev_owner, False)
+
+        self._owners[flexible_token] = owner
+        if owner is not None:
+            self._owned_tokens[owner] = flexible_token
+            self._set_pool(flexible_token, owner, owner in self._connectors)
+
+    def _add_connector(self, converter: str, connector_token: str) -> bool:
+        connectors = self._connectors.get(converter, ())
+        if connector_token in connectors:
+            return False
+
+        self._connectors[converter] = connectors + (connector_token,)
+        self._set_pool(connector_token, converter, True)
+        # the converter may own its flexible token before it is known as a converter
+        flexible_token = self._owned_tokens.get(converter)
+        if flexible_token is not None:
+            self._set_pool(flexible_token, converter, True)
+        return True
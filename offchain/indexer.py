@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections import OrderedDict
+
+from offchain.events import parse_event_log, to_int
+from offchain.store import ColumnarStore
+
+
+def read_blocks(file_path: str):
+    """Reads blocks with their transaction results from a block dump or a JSON-lines file
+
+    A block dump is a JSON array of blocks, and a JSON-lines file has a block per line.
+    Each block is formatted as below, where integers can be either numbers or hex strings.
+    {
+        'height': [BLOCK_HEIGHT],
+        'time_stamp': [TIMESTAMP_IN_MICROSECONDS],
+        'transactions': [{'txHash': [TX_HASH], 'status': '0x1', 'eventLogs': [..]}, ..]
+    }
+
+    :param file_path: file path
+    :return: generator of blocks
+    """
+    with open(file_path, 'r') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == '[':
+            yield from json.load(f)
+            return
+
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class EventIndexer:
+    """
+    Indexes the events of DEX SCOREs into a columnar store and answers analytics queries by range scan.
+
+    Indexed events are `Conversion`, `PriceDataUpdate` and `ConversionFeeUpdate` of converters
+    and `Transfer`, `Issuance` and `Destruction` of tokens.
+    """
+
+    def __init__(self, store: ColumnarStore) -> None:
+        """
+        :param store: store to write the events to
+        """
+        self._store = store
+
+    def ingest(self, blocks, commit_interval: int = 1000) -> int:
+        """Ingests the events of the blocks in increasing order of heights.
+        Blocks at or below the last committed height are skipped, so ingestion can be resumed.
+
+        :param blocks: iterable of blocks formatted as `read_blocks` returns
+        :param commit_interval: number of blocks to buffer before writing them to the store
+        :return: number of ingested blocks
+        """
+        ingested = 0
+        last_block_height = self._store.last_block_height
+        for block in blocks:
+            block_height = to_int(block['height'])
+            if block_height <= last_block_height:
+                continue
+
+            timestamp = to_int(block['time_stamp'])
+            for tx_result in block.get('transactions', []):
+                if to_int(tx_result.get('status', 1)) != 1:
+                    continue
+                for event_log in tx_result.get('eventLogs', []):
+                    record = parse_event_log(event_log, block_height, timestamp, tx_result.get('txHash'))
+                    if record is not None:
+                        self._store.append(record)
+
+            last_block_height = block_height
+            ingested += 1
+            if ingested % commit_interval == 0:
+                self._store.commit(last_block_height)
+
+        if last_block_height > self._store.last_block_height:
+            self._store.commit(last_block_height)
+        return ingested
+
+    def ingest_file(self, file_path: str, commit_interval: int = 1000) -> int:
+        """Ingests the events of a block dump or a JSON-lines file
+
+        :param file_path: file path
+        :param commit_interval: number of blocks to buffer before writing them to the store
+        :return: number of ingested blocks
+        """
+        return self.ingest(read_blocks(file_path), commit_interval)
+
+    def get_volume(self, converter: str, start_timestamp: int, end_timestamp: int) -> dict:
+        """Returns the amount of each token traded through the converter in the time range,
+        which is the sum of the amounts paid in the token and returned in the token
+
+        :param converter: converter address
+        :param start_timestamp: start timestamp in microseconds, inclusive
+        :param end_timestamp: end timestamp in microseconds, inclusive
+        :return: token address -> volume
+        """
+        volume = OrderedDict()
+        rows = self._store.scan('Conversion', converter, start_timestamp, end_timestamp,
+                                ['from_token', 'to_token', 'amount', 'return_amount'])
+        for row in rows:
+            volume[row['from_token']] = volume.get(row['from_token'], 0) + row['amount']
+            volume[row['to_token']] = volume.get(row['to_token'], 0) + row['return_amount']
+        return volume
+
+    def get_fees(self, converter: str, start_timestamp: int, end_timestamp: int) -> dict:
+        """Returns the conversion fees charged by the converter in the time range
+
+        :param converter: converter address
+        :param start_timestamp: start timestamp in microseconds, inclusive
+        :param end_timestamp: end timestamp in microseconds, inclusive
+        :return: token address -> fee amount, in the token returned by the conversions
+        """
+        fees = OrderedDict()
+        rows = self._store.scan('Conversion', converter, start_timestamp, end_timestamp, ['to_token', 'fee'])
+        for row in rows:
+            fees[row['to_token']] = fees.get(row['to_token'], 0) + row['fee']
+        return fees
+
+    def get_price_history(self, converter: str, connector_token: str,
+                          start_timestamp: int, end_timestamp: int) -> list:
+        """Returns the price data of a connector of the converter in the time range
+
+        :param converter: converter address
+        :param connector_token: connector token address
+        :param start_timestamp: start timestamp in microseconds, inclusive
+        :param end_timestamp: end timestamp in microseconds, inclusive
+        :return: list of dict with block_height, timestamp, token_supply, connector_balance and connector_weight
+        """
+        columns = ['block_height', 'timestamp', 'connector_token',
+                   'token_supply', 'connector_balance', 'connector_weight']
+        history = []
+        for row in self._store.scan('PriceDataUpdate', converter, start_timestamp, end_timestamp, columns):
+            if row.pop('connector_token') == connector_token:
+                history.append(row)
+        return history
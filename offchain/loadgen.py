@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+import random
+import threading
+import time
+from argparse import ArgumentParser
+from http.client import HTTPConnection
+from urllib.parse import urlencode, urlsplit
+
+from offchain.pool import PoolCache
+from offchain.snapshot import Snapshot
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Returns the nearest-rank percentile
+
+    :param sorted_values: values in increasing order
+    :param fraction: percentile in 0..1, ex. 0.99 for p99
+    :return: the smallest value which the fraction of the values are at or below, 0 if there is no value
+    """
+    if not sorted_values:
+        return 0
+    return sorted_values[max(1, math.ceil(len(sorted_values) * fraction)) - 1]
+
+
+def create_targets(pool_cache: PoolCache, count: int, amount_count: int = 10, seed: int = 0) -> list:
+    """Creates `getReturn` request targets over random connectors of the pools
+
+    :param pool_cache: states of the converters to quote
+    :param count: number of targets
+    :param amount_count: number of distinct amounts per conversion, which bounds the number of distinct quotes
+    :param seed: seed of the random targets
+    :return: list of request targets, path with the query string
+    """
+    rng = random.Random(seed)
+    pools = [pool for _, pool in sorted(pool_cache.pools.items()) if pool.connectors]
+    targets = []
+    for _ in range(count):
+        pool = rng.choice(pools)
+        from_token, to_token = rng.sample([pool.token] + list(pool.connectors), 2)
+        from_balance = pool.token_supply if from_token == pool.token else pool.connectors[from_token].balance
+        # up to 1% of the balance, so that every target is a valid conversion
+        amount = max(1, from_balance // 100 * rng.randrange(1, amount_count + 1) // amount_count)
+        query = urlencode({'_converter': pool.converter, '_fromToken': from_token, '_toToken': to_token,
+                           '_amount': hex(amount)})
+        targets.append(f'/getReturn?{query}')
+    return targets
+
+
+def run_load(url: str, targets: list, request_count: int, concurrency: int = 8) -> dict:
+    """Sends the requests over keep-alive connections, a connection per worker thread, and measures their latencies
+
+    :param url: URL of the quote service, ex. http://127.0.0.1:8100
+    :param targets: request targets to send in turns
+    :param request_count: total number of requests
+    :param concurrency: number of worker threads
+    :return: number of requests and errors, elapsed seconds, throughput per second
+        and latency percentiles in milliseconds, in dict
+    """
+    address = urlsplit(url)
+    latencies = []
+    errors = []
+    counter = iter(range(request_count))
+    lock = threading.Lock()
+
+    def work():
+        connection = HTTPConnection(address.hostname, address.port)
+        worker_latencies = []
+        worker_errors = 0
+        try:
+            while True:
+                with lock:
+                    index = next(counter, None)
+                if index is None:
+                    break
+                begin = time.perf_counter()
+                connection.request('GET', targets[index % len(targets)])
+                response = connection.getresponse()
+                body = response.read()
+                worker_latencies.append(time.perf_counter() - begin)
+                if response.status != 200 or 'result' not in json.loads(body):
+                    worker_errors += 1
+        finally:
+            connection.close()
+            with lock:
+                latencies.extend(worker_latencies)
+                errors.append(worker_errors)
+
+    threads = [threading.Thread(target=work) for _ in range(concurrency)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'elapsed': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed > 0 else 0,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p90': percentile(latencies, 0.9) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'max': (latencies[-1] if latencies else 0) * 1000,
+    }
+
+
+def parse_args():
+    parser = ArgumentParser(description='Measures the latencies of the quote service under load')
+    parser.add_argument('snapshot', help='snapshot file of the converter states the service is started from')
+    parser.add_argument('--url', default='http://127.0.0.1:8100', help='URL of the quote service')
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--targets', type=int, default=1000, help='number of distinct requests')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with Snapshot(args.snapshot) as snapshot:
+        pool_cache = snapshot.load()
+
+    targets = create_targets(pool_cache, args.targets, seed=args.seed)
+    result = run_load(args.url, targets, args.requests, args.concurrency)
+    print('{requests} requests, {errors} errors in {elapsed:.3f} s, {throughput:.0f} req/s, '
+          'p50 = {p50:.3f} ms, p90 = {p90:.3f} ms, p99 = {p99:.3f} ms, max = {max:.3f} ms'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
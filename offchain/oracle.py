@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from bisect import bisect_right
+from collections import OrderedDict
+
+MAX_WEIGHT = 1000000
+MICROSECONDS_PER_SECOND = 10 ** 6
+
+# resolution name -> (length of a candle in seconds, number of closed candles to retain, None to retain all)
+RESOLUTIONS = OrderedDict([
+    ('1m', (60, 24 * 60)),
+    ('5m', (5 * 60, 7 * 24 * 12)),
+    ('15m', (15 * 60, 30 * 24 * 4)),
+    ('1h', (60 * 60, 90 * 24)),
+    ('4h', (4 * 60 * 60, 365 * 6)),
+    ('1d', (24 * 60 * 60, None)),
+])
+
+
+def get_price(token_supply: int, connector_balance: int, connector_weight: int) -> float:
+    """Returns the spot price of the flexible token in the connector token
+
+    :param token_supply: total supply of the flexible token
+    :param connector_balance: balance of the connector token
+    :param connector_weight: weight of the connector, in ppm
+    :return: price, None if the price is not defined
+    """
+    if token_supply <= 0 or connector_weight <= 0:
+        return None
+    return connector_balance * MAX_WEIGHT / (token_supply * connector_weight)
+
+
+class Candle:
+    """
+    Price candle of a time period.
+
+    The price is a step function of time which holds from an update to the next, and the cumulative price
+    is its integral over time since the first update, so the time-weighted average price between
+    two moments is the difference of the cumulative prices divided by the elapsed time.
+    """
+    __slots__ = ('start', 'end', 'open', 'high', 'low', 'close', 'update_count',
+                 'price_start', 'cumulative_start', 'cumulative_end')
+
+    def __init__(self, start: int, end: int, price: float, price_start: int, cumulative_start: float) -> None:
+        """
+        :param start: start timestamp in microseconds, inclusive
+        :param end: end timestamp in microseconds, exclusive
+        :param price: price of the first update
+        :param price_start: timestamp from which the price is defined in the candle
+        :param cumulative_start: cumulative price at the start
+        """
+        self.start = start
+        self.end = end
+        self.open = self.high = self.low = self.close = price
+        self.update_count = 1
+        self.price_start = price_start
+        self.cumulative_start = cumulative_start
+        # set on closing the candle
+        self.cumulative_end = None
+
+    def update(self, price: float) -> None:
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.close = price
+        self.update_count += 1
+
+    @property
+    def twap(self) -> float:
+        """Returns the time-weighted average price of the closed candle"""
+        return (self.cumulative_end - self.cumulative_start) / (self.end - self.price_start)
+
+    def to_dict(self) -> dict:
+        return {
+            'start': self.start, 'open': self.open, 'high': self.high, 'low': self.low, 'close': self.close,
+            'updateCount': self.update_count, 'twap': self.twap if self.cumulative_end is not None else None
+        }
+
+
+class CandleSeries:
+    """
+    Candles of a resolution. Only the open candle is updated, in O(1) per price update,
+    and the oldest closed candles beyond the retention are compacted away in chunks,
+    as coarser resolutions keep aggregating the same updates.
+    """
+
+    def __init__(self, length: int, retention: int = None) -> None:
+        """
+        :param length: length of a candle in microseconds
+        :param retention: number of closed candles to retain, None to retain all
+        """
+        self.length = length
+        self.retention = retention
+        self.candles = []
+        # start timestamps of the closed candles, to find them by binary search
+        self._starts = []
+        self.current = None
+
+    def update(self, timestamp: int, price: float, prev_timestamp: int, prev_price: float,
+               cumulative: float) -> None:
+        """
+        Updates the series with a price
+
+        :param timestamp: timestamp of the price update
+        :param price: new price
+        :param prev_timestamp: timestamp of the previous update, None if there is none
+        :param prev_price: price of the previous update, None if there is none
+        :param cumulative: cumulative price at the previous update
+        """
+        start = timestamp - timestamp % self.length
+        if self.current is not None and self.current.start == start:
+            self.current.update(price)
+            return
+
+        if self.current is not None:
+            self._close(prev_timestamp, prev_price, cumulative)
+
+        if prev_timestamp is None:
+            self.current = Candle(start, start + self.length, price, timestamp, 0.0)
+        else:
+            cumulative_start = cumulative + prev_price * (start - prev_timestamp)
+            self.current = Candle(start, start + self.length, price, start, cumulative_start)
+
+    def _close(self, prev_timestamp: int, prev_price: float, cumulative: float) -> None:
+        candle = self.current
+        candle.cumulative_end = cumulative + prev_price * (candle.end - prev_timestamp)
+        self.candles.append(candle)
+        self._starts.append(candle.start)
+
+        # compacts in chunks of a quarter of the retention, so the cost is amortized O(1)
+        if self.retention is not None and len(self.candles) > self.retention + max(self.retention // 4, 1):
+            overflow = len(self.candles) - self.retention
+            del self.candles[:overflow]
+            del self._starts[:overflow]
+
+    def find(self, timestamp: int) -> Candle:
+        """Returns the candle which contains the timestamp
+
+        :param timestamp: timestamp in microseconds
+        :return: candle, None if there is no candle
+        """
+        if self.current is not None and self.current.start <= timestamp:
+            return self.current if timestamp < self.current.end else None
+
+        candle = self.find_last_closed(timestamp)
+        if candle is None or timestamp >= candle.end:
+            return None
+        return candle
+
+    def find_last_closed(self, timestamp: int) -> Candle:
+        """Returns the last closed candle which starts at or before the timestamp
+
+        :param timestamp: timestamp in microseconds
+        :return: candle, None if there is no such candle retained
+        """
+        index = bisect_right(self._starts, timestamp) - 1
+        return self.candles[index] if index >= 0 else None
+
+    def get_candles(self, start: int, end: int) -> list:
+        """Returns the candles starting in the range, including the open candle
+
+        :param start: start timestamp in microseconds, inclusive
+        :param end: end timestamp in microseconds, exclusive
+        :return: list of candles
+        """
+        begin = bisect_right(self._starts, start - 1)
+        candles = [candle for candle in self.candles[begin:] if candle.start < end]
+        if self.current is not None and start <= self.current.start < end:
+            candles.append(self.current)
+        return candles
+
+
+class PriceSeries:
+    """Prices of a connector of a converter, aggregated into candles of every resolution"""
+
+    def __init__(self, resolutions: dict = None) -> None:
+        """
+        :param resolutions: resolution name -> (length in seconds, retention), `RESOLUTIONS` by default
+        """
+        if resolutions is None:
+            resolutions = RESOLUTIONS
+        self.resolutions = OrderedDict(
+            (name, CandleSeries(length * MICROSECONDS_PER_SECOND, retention))
+            for name, (length, retention) in resolutions.items())
+
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_price = None
+        # cumulative price at the last update
+        self.cumulative = 0.0
+
+    def update(self, timestamp: int, price: float) -> None:
+        """Updates the candles of every resolution with a price in O(1)
+
+        :param timestamp: timestamp of the price in microseconds, not less than the last one
+        :param price: price
+        """
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError(f'price updates should be in order of time: {timestamp} < {self.last_timestamp}')
+
+        for series in self.resolutions.values():
+            series.update(timestamp, price, self.last_timestamp, self.last_price, self.cumulative)
+
+        if self.last_timestamp is None:
+            self.first_timestamp = timestamp
+        else:
+            self.cumulative += self.last_price * (timestamp - self.last_timestamp)
+        self.last_timestamp = timestamp
+        self.last_price = price
+
+    def get_cumulative(self, timestamp: int, resolution: str = None) -> float:
+        """Returns the cumulative price at the timestamp. The timestamp should be a candle boundary
+        of a resolution which retains it, or at or after the last update.
+
+        :param timestamp: timestamp in microseconds
+        :param resolution: resolution whose boundary the timestamp is on, None to search from the finest
+        :return: cumulative price
+        """
+        if self.last_timestamp is None or timestamp < self.first_timestamp:
+            raise ValueError(f'no price at {timestamp}')
+        if timestamp == self.first_timestamp:
+            return 0.0
+        if timestamp >= self.last_timestamp:
+            return self.cumulative + self.last_price * (timestamp - self.last_timestamp)
+
+        names = [resolution] if resolution is not None else list(self.resolutions)
+        for name in names:
+            series = self.resolutions[name]
+            if timestamp % series.length != 0:
+                continue
+            candle = series.find(timestamp)
+            if candle is not None and candle.start == timestamp:
+                return candle.cumulative_start
+
+            # no update in the candle, so the price holds from the last closed candle before it
+            prev_candle = series.find_last_closed(timestamp)
+            if prev_candle is not None:
+                return prev_candle.cumulative_end + prev_candle.close * (timestamp - prev_candle.end)
+        raise ValueError(f'cumulative price at {timestamp} is not retained')
+
+    def get_twap(self, start: int, end: int = None, resolution: str = None) -> float:
+        """Returns the time-weighted average price in the range
+
+        :param start: start timestamp in microseconds, a candle boundary
+        :param end: end timestamp in microseconds, either a candle boundary or at or after the last update,
+            None for the last update
+        :param resolution: resolution whose boundaries the timestamps are on, None to search from the finest
+        :return: time-weighted average price
+        """
+        if end is None:
+            end = self.last_timestamp
+        start = max(start, self.first_timestamp)
+        if end <= start:
+            raise ValueError(f'invalid range: {start} - {end}')
+        return (self.get_cumulative(end, resolution) - self.get_cumulative(start, resolution)) / (end - start)
+
+
+class PriceOracle:
+    """
+    Aggregates `PriceDataUpdate` events into OHLC candles and time-weighted average prices
+    per connector of each converter, at resolutions from 1 minute to 1 day.
+    """
+
+    def __init__(self, resolutions: dict = None) -> None:
+        """
+        :param resolutions: resolution name -> (length in seconds, retention), `RESOLUTIONS` by default
+        """
+        self._resolutions = resolutions
+        # (converter, connector token) -> PriceSeries
+        self._series = {}
+
+    def get_series(self, converter: str, connector_token: str) -> PriceSeries:
+        """Returns the price series of the connector
+
+        :param converter: converter address
+        :param connector_token: connector token address
+        :return: PriceSeries, None if there is no price update
+        """
+        return self._series.get((converter, connector_token))
+
+    def update(self, converter: str, connector_token: str, timestamp: int,
+               token_supply: int, connector_balance: int, connector_weight: int) -> None:
+        """Updates the price series of the connector with the price data
+
+        :param converter: converter address
+        :param connector_token: connector token address
+        :param timestamp: timestamp in microseconds
+        :param token_supply: total supply of the flexible token
+        :param connector_balance: balance of the connector token
+        :param connector_weight: weight of the connector
+        """
+        price = get_price(token_supply, connector_balance, connector_weight)
+        if price is None:
+            return
+
+        key = (converter, connector_token)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = PriceSeries(self._resolutions)
+        series.update(timestamp, price)
+
+    def update_record(self, record) -> None:
+        """Updates with a `PriceDataUpdate` record of `offchain.events`
+
+        :param record: PriceDataUpdate record
+        """
+        self.update(record.score, record.connector_token, record.timestamp,
+                    record.token_supply, record.connector_balance, record.connector_weight)
+
+    def update_from_store(self, store, start_timestamp: int, end_timestamp: int) -> None:
+        """Updates with the `PriceDataUpdate` events of every converter in the columnar store
+
+        :param store: ColumnarStore
+        :param start_timestamp: start timestamp in microseconds, inclusive
+        :param end_timestamp: end timestamp in microseconds, inclusive
+        """
+        columns = ['timestamp', 'connector_token', 'token_supply', 'connector_balance', 'connector_weight']
+        for converter in store.get_scores('PriceDataUpdate'):
+            for row in store.scan('PriceDataUpdate', converter, start_timestamp, end_timestamp, columns):
+                self.update(converter, row['connector_token'], row['timestamp'], row['token_supply'],
+                            row['connector_balance'], row['connector_weight'])
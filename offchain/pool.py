@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from offchain.events import PriceDataUpdate, ConversionFeeUpdate, ConnectorUpdate, ConnectorPurchasesDisable, \
+    ConversionsEnable, OwnerUpdate, to_int
+
+
+class ConnectorState:
+    """State of a connector of a converter"""
+    __slots__ = ('balance', 'weight', 'is_virtual_balance_enabled', 'is_purchase_enabled')
+
+    def __init__(self, balance: int, weight: int,
+                 is_virtual_balance_enabled: bool = False, is_purchase_enabled: bool = True) -> None:
+        """
+        :param balance: connector balance, the virtual balance if it is enabled
+        :param weight: connector weight, represented in ppm
+        :param is_virtual_balance_enabled: whether the virtual balance is enabled
+        :param is_purchase_enabled: whether the purchase of the flexible token with the connector is enabled
+        """
+        self.balance = balance
+        self.weight = weight
+        self.is_virtual_balance_enabled = is_virtual_balance_enabled
+        self.is_purchase_enabled = is_purchase_enabled
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ConnectorState) and \
+            all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return 'ConnectorState({0})'.format(', '.join(f'{name}={getattr(self, name)}' for name in self.__slots__))
+
+
+class PoolState:
+    """State of a converter needed to quote conversions, which is its flexible token and connectors"""
+
+    def __init__(self, converter: str, token: str, token_supply: int, conversion_fee: int,
+                 connectors: dict = None, is_active: bool = True, conversions_enabled: bool = True) -> None:
+        """
+        :param converter: converter address
+        :param token: flexible token address
+        :param token_supply: total supply of the flexible token
+        :param conversion_fee: conversion fee, represented in ppm
+        :param connectors: connector token address -> ConnectorState, in the order of the converter
+        :param is_active: whether the converter owns the flexible token
+        :param conversions_enabled: whether the conversions are enabled
+        """
+        self.converter = converter
+        self.token = token
+        self.token_supply = token_supply
+        self.conversion_fee = conversion_fee
+        self.connectors = OrderedDict(connectors or {})
+        self.is_active = is_active
+        self.conversions_enabled = conversions_enabled
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PoolState) and self.__dict__ == other.__dict__
+
+    def __repr__(self) -> str:
+        return f'PoolState({self.converter}, token={self.token}, token_supply={self.token_supply}, ' \
+            f'conversion_fee={self.conversion_fee}, connectors={dict(self.connectors)}, ' \
+            f'is_active={self.is_active}, conversions_enabled={self.conversions_enabled})'
+
+    def apply(self, record) -> bool:
+        """Applies an event record of the converter, or an `OwnerUpdate` record of its flexible token
+
+        :param record: `PriceDataUpdate`, `ConversionFeeUpdate`, `ConnectorUpdate`, `ConnectorPurchasesDisable`,
+            `ConversionsEnable` or `OwnerUpdate` record of `offchain.events`
+        :return: True if the state is changed
+        """
+        if isinstance(record, PriceDataUpdate):
+            self.token_supply = record.token_supply
+            connector = self.connectors.get(record.connector_token)
+            if connector is None:
+                connector = self.connectors[record.connector_token] = ConnectorState(0, 0)
+            connector.balance = record.connector_balance
+            connector.weight = record.connector_weight
+            return True
+
+        if isinstance(record, ConversionFeeUpdate):
+            self.conversion_fee = record.new_fee
+            return True
+
+        if isinstance(record, ConnectorUpdate):
+            connector = self.connectors.get(record.connector_token)
+            if connector is None:
+                connector = self.connectors[record.connector_token] = ConnectorState(0, 0)
+            connector.balance = record.connector_balance
+            connector.weight = record.weight
+            connector.is_virtual_balance_enabled = bool(record.enable_virtual_balance)
+            return True
+
+        if isinstance(record, ConnectorPurchasesDisable):
+            connector = self.connectors.get(record.connector_token)
+            if connector is None:
+                return False
+            connector.is_purchase_enabled = not record.disable
+            return True
+
+        if isinstance(record, ConversionsEnable):
+            self.conversions_enabled = bool(record.conversions_enabled)
+            return True
+
+        if isinstance(record, OwnerUpdate):
+            self.is_active = record.new_owner == self.converter
+            return True
+
+        return False
+
+
+def collect_pool_state(call, converter: str) -> PoolState:
+    """Collects the state of a converter by calling its readonly methods
+
+    :param call: function calling a readonly method, `call(score address, method, params)` returning the result
+        of the JSON-RPC `icx_call`
+    :param converter: converter address
+    :return: PoolState
+    """
+    token = call(converter, 'getToken', {})
+    connectors = OrderedDict()
+    for index in range(to_int(call(converter, 'getConnectorTokenCount', {}))):
+        connector_token = call(converter, 'getConnectorAt', {'_index': hex(index)})
+        connector = call(converter, 'getConnector', {'_address': connector_token})
+        balance = call(converter, 'getConnectorBalance', {'_connectorToken': connector_token})
+        connectors[connector_token] = ConnectorState(
+            to_int(balance),
+            to_int(connector['weight']),
+            bool(to_int(connector['isVirtualBalanceEnabled'])),
+            bool(to_int(connector['isPurchaseEnabled'])))
+
+    return PoolState(converter, token, to_int(call(token, 'totalSupply', {})),
+                     to_int(call(converter, 'getConversionFee', {})), connectors,
+                     bool(to_int(call(converter, 'isActive', {}))),
+                     bool(to_int(call(converter, 'isConversionsEnabled', {}))))
+
+
+class PoolCache:
+    """
+    States of converters at a block height, kept up to date by applying the events of the following blocks
+    """
+
+    def __init__(self, pools: dict = None, block_height: int = -1) -> None:
+        """
+        :param pools: converter address -> PoolState
+        :param block_height: height of the block the states are at
+        """
+        self.pools = pools if pools is not None else {}
+        self.block_height = block_height
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def get(self, converter: str) -> PoolState:
+        return self.pools.get(converter)
+
+    def get_by_token(self, token: str) -> PoolState:
+        """Returns the state of the converter of a flexible token.
+        Ownership rarely changes, so the states are scanned instead of indexed by the flexible tokens.
+
+        :param token: flexible token address
+        :return: PoolState, None if no state has the flexible token
+        """
+        return next((pool for pool in self.pools.values() if pool.token == token), None)
+
+    def apply(self, record) -> bool:
+        """Applies an event record. Records at or below the block height of the cache are ignored,
+        as the states include them already.
+
+        :param record: event record of `offchain.events`
+        :return: True if a state is changed
+        """
+        return self._apply(record) is not None
+
+    def _apply(self, record):
+        # returns the changed state, None if no state is changed
+        if record.block_height <= self.block_height:
+            return None
+
+        if isinstance(record, OwnerUpdate):
+            # the owner of a flexible token decides whether its converter is active
+            pool = self.get_by_token(record.score)
+        else:
+            pool = self.pools.get(record.score)
+        return pool if pool is not None and pool.apply(record) else None
+
+    def apply_all(self, records, block_height: int = None) -> set:
+        """Applies event records
+
+        :param records: iterable of event records in the order of the chain
+        :param block_height: height of the last block of the records, to move the cache to
+        :return: set of the converters whose states are changed
+        """
+        changed = set()
+        for record in records:
+            pool = self._apply(record)
+            if pool is not None:
+                changed.add(pool.converter)
+        if block_height is not None and block_height > self.block_height:
+            self.block_height = block_height
+        return changed
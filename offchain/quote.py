@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from math import expm1, log1p
+
+from iconservice.base.exception import IconServiceBaseException
+
+from contracts.formula import formula
+from offchain.pool import PoolState
+
+MAX_WEIGHT = 1000000
+MAX_CONVERSION_FEE = 1000000
+
+
+class QuoteError(Exception):
+    """Raised when the converter would reject the conversion"""
+    pass
+
+
+def _require(condition: bool, message: str) -> None:
+    if not condition:
+        raise QuoteError(message)
+
+
+def _calculate(function, *args) -> int:
+    try:
+        return function(*args)
+    except IconServiceBaseException as e:
+        raise QuoteError(e.message)
+
+
+def get_final_amount(conversion_fee: int, amount: int, magnitude: int) -> int:
+    """Returns the amount minus the conversion fee, as `Converter.getFinalAmount`
+
+    :param conversion_fee: conversion fee, represented in ppm
+    :param amount: return amount
+    :param magnitude: 1 for standard conversion, 2 for cross connector conversion
+    :return: amount minus conversion fee
+    """
+    return amount * (MAX_CONVERSION_FEE - conversion_fee) ** magnitude // MAX_CONVERSION_FEE ** magnitude
+
+
+def _get_connector(pool: PoolState, connector_token: str):
+    connector = pool.connectors.get(connector_token)
+    _require(connector is not None, 'invalid connector')
+    return connector
+
+
+def _to_return(pool: PoolState, calculated_amount: int, magnitude: int) -> dict:
+    final_amount = get_final_amount(pool.conversion_fee, calculated_amount, magnitude)
+    return {'amount': final_amount, 'fee': calculated_amount - final_amount}
+
+
+def get_purchase_return(pool: PoolState, connector_token: str, amount: int) -> dict:
+    """Returns the return for buying the flexible token for a connector token
+
+    :param pool: state of the converter
+    :param connector_token: connector token address
+    :param amount: amount to deposit, in the connector token
+    :return: return amount and conversion fee, in dict
+    """
+    _require(pool.is_active, 'required active')
+    connector = _get_connector(pool, connector_token)
+    _require(connector.is_purchase_enabled, 'required purchase enabled')
+
+    calculated_amount = _calculate(formula.calculate_purchase_return,
+                                   pool.token_supply, connector.balance, connector.weight, amount)
+    return _to_return(pool, calculated_amount, 1)
+
+
+def get_sale_return(pool: PoolState, connector_token: str, amount: int) -> dict:
+    """Returns the return for selling the flexible token for a connector token
+
+    :param pool: state of the converter
+    :param connector_token: connector token address
+    :param amount: amount to sell, in the flexible token
+    :return: return amount and conversion fee, in dict
+    """
+    _require(pool.is_active, 'required active')
+    connector = _get_connector(pool, connector_token)
+
+    calculated_amount = _calculate(formula.calculate_sale_return,
+                                   pool.token_supply, connector.balance, connector.weight, amount)
+    return _to_return(pool, calculated_amount, 1)
+
+
+def get_cross_connector_return(pool: PoolState, from_token: str, to_token: str, amount: int) -> dict:
+    """Returns the return for converting a connector token to another connector token
+
+    :param pool: state of the converter
+    :param from_token: connector token address to convert from
+    :param to_token: connector token address to convert to
+    :param amount: amount to convert, in the from connector token
+    :return: return amount and conversion fee, in dict
+    """
+    _require(pool.is_active, 'required active')
+    from_connector = _get_connector(pool, from_token)
+    to_connector = _get_connector(pool, to_token)
+    _require(to_connector.is_purchase_enabled, 'required purchase enabled')
+
+    calculated_amount = _calculate(formula.calculate_cross_connector_return,
+                                   from_connector.balance, from_connector.weight,
+                                   to_connector.balance, to_connector.weight, amount)
+    return _to_return(pool, calculated_amount, 2)
+
+
+def get_return(pool: PoolState, from_token: str, to_token: str, amount: int) -> dict:
+    """Returns the return for converting a token to another token of the converter,
+    the same as `Converter.getReturn` returns at the state
+
+    :param pool: state of the converter
+    :param from_token: token address to convert from
+    :param to_token: token address to convert to
+    :param amount: amount to convert, in the from token
+    :return: return amount and conversion fee, in dict
+    """
+    _require(from_token != to_token, '\'from token\' and \'to token\' must not be same')
+
+    if to_token == pool.token:
+        return get_purchase_return(pool, from_token, amount)
+    elif from_token == pool.token:
+        return get_sale_return(pool, to_token, amount)
+    return get_cross_connector_return(pool, from_token, to_token, amount)
+
+
+def estimate_return(pool: PoolState, from_token: str, to_token: str, amount: float) -> float:
+    """Estimates the return for converting a token to another token of the converter in floating point,
+    which is much faster than `get_return` but not exact. The conversion is assumed to be valid.
+
+    :param pool: state of the converter
+    :param from_token: token address to convert from
+    :param to_token: token address to convert to
+    :param amount: amount to convert, in the from token
+    :return: estimated return amount
+    """
+    # the powers are computed by expm1 and log1p, which keep the precision of small amounts
+    fee_ratio = (MAX_CONVERSION_FEE - pool.conversion_fee) / MAX_CONVERSION_FEE
+    if to_token == pool.token:
+        connector = pool.connectors[from_token]
+        return pool.token_supply * expm1(connector.weight / MAX_WEIGHT * log1p(amount / connector.balance)) \
+            * fee_ratio
+
+    if from_token == pool.token:
+        connector = pool.connectors[to_token]
+        if amount >= pool.token_supply:
+            return connector.balance * fee_ratio
+        return -connector.balance * expm1(MAX_WEIGHT / connector.weight * log1p(-amount / pool.token_supply)) \
+            * fee_ratio
+
+    from_connector = pool.connectors[from_token]
+    to_connector = pool.connectors[to_token]
+    exponent = from_connector.weight / to_connector.weight
+    return -to_connector.balance * expm1(-exponent * log1p(amount / from_connector.balance)) * fee_ratio ** 2
+
+
+def get_spot_rate(pool: PoolState, from_token: str, to_token: str) -> float:
+    """Returns the marginal rate of converting a token to another token of the converter, including the fee,
+    which is the return per unit of an infinitesimal amount
+
+    :param pool: state of the converter
+    :param from_token: token address to convert from
+    :param to_token: token address to convert to
+    :return: return per unit of the from token
+    """
+    fee_ratio = (MAX_CONVERSION_FEE - pool.conversion_fee) / MAX_CONVERSION_FEE
+    if to_token == pool.token:
+        connector = pool.connectors[from_token]
+        return pool.token_supply * connector.weight / (connector.balance * MAX_WEIGHT) * fee_ratio
+
+    if from_token == pool.token:
+        connector = pool.connectors[to_token]
+        return connector.balance * MAX_WEIGHT / (pool.token_supply * connector.weight) * fee_ratio
+
+    from_connector = pool.connectors[from_token]
+    to_connector = pool.connectors[to_token]
+    return to_connector.balance * from_connector.weight / (from_connector.balance * to_connector.weight) \
+        * fee_ratio ** 2
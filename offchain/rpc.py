@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import ssl as ssl_module
+from collections import deque
+from itertools import count
+from urllib.parse import urlsplit
+
+from offchain.events import to_int
+from offchain.pool import ConnectorState, PoolState
+
+DEFAULT_PATH = '/api/v3'
+
+
+class JsonRpcError(Exception):
+    """Error response of a JSON-RPC call"""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(f'{code}: {message}')
+        self.code = code
+        self.message = message
+
+
+class HttpError(Exception):
+    """Unexpected HTTP response"""
+
+
+class _Connection:
+    """HTTP/1.1 connection which is kept alive between requests"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        self.writer.close()
+
+    async def request(self, host: str, request_path: str, body: bytes) -> bytes:
+        self.writer.write(
+            f'POST {request_path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n'.encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed by the server')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            response_body = b''.join(chunks)
+        elif 'content-length' in headers:
+            response_body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            response_body = await self.reader.read()
+            self.closed = True
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        if status != 200:
+            raise HttpError(f'HTTP {status}: {response_body[:200]!r}')
+        return response_body
+
+
+class ConnectionPool:
+    """
+    Pool of keep-alive HTTP/1.1 connections to a host.
+    At most `max_connections` connections are open, and idle ones are reused by the following requests.
+    The pool may be created outside the event loop using it, and is used by one loop at a time.
+    Close it in its loop before using it in another one.
+    """
+
+    def __init__(self, url: str, max_connections: int = 8, timeout: float = 30) -> None:
+        """
+        :param url: JSON-RPC endpoint, ex. http://localhost:9000/api/v3
+        :param max_connections: maximum number of open connections
+        :param timeout: timeout of a request in seconds
+        """
+        parsed = urlsplit(url)
+        self._ssl = ssl_module.create_default_context() if parsed.scheme == 'https' else None
+        self._host = parsed.hostname
+        self._port = parsed.port or (443 if self._ssl else 80)
+        self._host_header = parsed.netloc
+        self._path = parsed.path or DEFAULT_PATH
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._idle = deque()
+        # the semaphore is created in the loop running the requests, as asyncio primitives of Python 3.7
+        # are bound to the default loop of the thread creating them
+        self._loop = None
+        self._semaphore = None
+        # number of connections opened, for monitoring the reuse
+        self.opened_count = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            # connections opened in another loop cannot be used in this loop
+            self.close()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_connections)
+        return self._semaphore
+
+    async def _acquire(self) -> _Connection:
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.closed and not connection.reader.at_eof():
+                return connection
+            connection.close()
+
+        reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        self.opened_count += 1
+        return _Connection(reader, writer)
+
+    async def post(self, body: bytes) -> bytes:
+        """Posts the body and returns the response body, retrying once on a stale keep-alive connection
+
+        :param body: request body
+        :return: response body
+        """
+        async with self._get_semaphore():
+            for attempt in range(2):
+                connection = await self._acquire()
+                try:
+                    response = await asyncio.wait_for(
+                        connection.request(self._host_header, self._path, body), self._timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if attempt == 1:
+                        raise
+                    continue
+                except BaseException:
+                    connection.close()
+                    raise
+
+                if not connection.closed:
+                    self._idle.append(connection)
+                return response
+
+    def close(self) -> None:
+        """Closes the idle connections"""
+        while self._idle:
+            self._idle.pop().close()
+
+
+class AsyncRpcClient:
+    """
+    asyncio JSON-RPC client of ICON nodes for readonly calls.
+
+    Calls are sent through a pool of keep-alive connections, several calls can be sent as a batch
+    in a single request, and concurrent requests are bounded by the pool size.
+    """
+
+    def __init__(self, url: str, max_connections: int = 8, batch_size: int = 50, timeout: float = 30) -> None:
+        """
+        :param url: JSON-RPC endpoint, ex. http://localhost:9000/api/v3
+        :param max_connections: maximum number of concurrent requests
+        :param batch_size: maximum number of calls in a batch request
+        :param timeout: timeout of a request in seconds
+        """
+        self._pool = ConnectionPool(url, max_connections, timeout)
+        self._batch_size = batch_size
+        self._ids = count(1)
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return self._pool
+
+    def close(self) -> None:
+        self._pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create_request(self, score: str, method: str, params: dict = None) -> dict:
+        data = {'method': method}
+        if params:
+            data['params'] = params
+        return {
+            'jsonrpc': '2.0',
+            'id': next(self._ids),
+            'method': 'icx_call',
+            'params': {'to': score, 'dataType': 'call', 'data': data}
+        }
+
+    @staticmethod
+    def _get_result(response: dict):
+        if 'error' in response:
+            raise JsonRpcError(response['error'].get('code'), response['error'].get('message'))
+        return response['result']
+
+    async def call(self, score: str, method: str, params: dict = None):
+        """Calls a readonly method of a SCORE
+
+        :param score: SCORE address
+        :param method: method name
+        :param params: params of the method, with their values formatted as JSON-RPC
+        :return: result of the method
+        """
+        request = self._create_request(score, method, params)
+        response = json.loads(await self._pool.post(json.dumps(request).encode()))
+        return self._get_result(response)
+
+    async def call_batch(self, calls: list, return_exceptions: bool = False) -> list:
+        """Calls readonly methods in batch requests, which are sent concurrently
+
+        :param calls: list of (score address, method, params)
+        :param return_exceptions: whether to return the errors of the calls in the results instead of raising
+        :return: results in the order of the calls
+        """
+        batches = [calls[begin:begin + self._batch_size] for begin in range(0, len(calls), self._batch_size)]
+        responses = await asyncio.gather(*(self._send_batch(batch) for batch in batches))
+
+        results = []
+        for response in (response for batch_responses in responses for response in batch_responses):
+            try:
+                results.append(self._get_result(response))
+            except JsonRpcError as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    async def _send_batch(self, calls: list) -> list:
+        requests = [self._create_request(*call) for call in calls]
+        responses = json.loads(await self._pool.post(json.dumps(requests).encode()))
+        if isinstance(responses, dict):
+            # the whole batch is rejected
+            raise JsonRpcError(responses.get('error', {}).get('code'), responses.get('error', {}).get('message'))
+
+        responses_by_id = {response.get('id'): response for response in responses}
+        return [responses_by_id[request['id']] for request in requests]
+
+
+class DexClient:
+    """Readonly calls of ICON DEX SCOREs over AsyncRpcClient"""
+
+    def __init__(self, client: AsyncRpcClient, network: str = None) -> None:
+        """
+        :param client: AsyncRpcClient
+        :param network: network SCORE address
+        """
+        self._client = client
+        self._network = network
+
+    async def get_expected_return_by_path(self, path: list, amount: int) -> int:
+        result = await self._client.call(
+            self._network, 'getExpectedReturnByPath', {'_path': ','.join(path), '_amount': hex(amount)})
+        return to_int(result)
+
+    async def get_return(self, converter: str, from_token: str, to_token: str, amount: int) -> dict:
+        result = await self._client.call(
+            converter, 'getReturn', {'_fromToken': from_token, '_toToken': to_token, '_amount': hex(amount)})
+        return {key: to_int(value) for key, value in result.items()}
+
+    async def get_connector(self, converter: str, connector_token: str) -> dict:
+        result = await self._client.call(converter, 'getConnector', {'_address': connector_token})
+        return {key: to_int(value) for key, value in result.items()}
+
+    async def get_connector_balance(self, converter: str, connector_token: str) -> int:
+        return to_int(await self._client.call(
+            converter, 'getConnectorBalance', {'_connectorToken': connector_token}))
+
+    async def get_conversion_fee(self, converter: str) -> int:
+        return to_int(await self._client.call(converter, 'getConversionFee'))
+
+    async def get_total_supply(self, token: str) -> int:
+        return to_int(await self._client.call(token, 'totalSupply'))
+
+    async def get_pool_state(self, converter: str) -> PoolState:
+        """Collects the state of a converter in 3 round trips of batch requests, whatever the number of connectors
+
+        :param converter: converter address
+        :return: PoolState
+        """
+        token, connector_count, conversion_fee, is_active, conversions_enabled = await self._client.call_batch([
+            (converter, 'getToken', None),
+            (converter, 'getConnectorTokenCount', None),
+            (converter, 'getConversionFee', None),
+            (converter, 'isActive', None),
+            (converter, 'isConversionsEnabled', None),
+        ])
+        connector_tokens = await self._client.call_batch(
+            [(converter, 'getConnectorAt', {'_index': hex(index)}) for index in range(to_int(connector_count))])
+
+        calls = [(token, 'totalSupply', None)]
+        for connector_token in connector_tokens:
+            calls.append((converter, 'getConnector', {'_address': connector_token}))
+            calls.append((converter, 'getConnectorBalance', {'_connectorToken': connector_token}))
+        results = await self._client.call_batch(calls)
+
+        connectors = {}
+        for index, connector_token in enumerate(connector_tokens):
+            connector, balance = results[1 + index * 2], results[2 + index * 2]
+            connectors[connector_token] = ConnectorState(
+                to_int(balance), to_int(connector['weight']),
+                bool(to_int(connector['isVirtualBalanceEnabled'])), bool(to_int(connector['isPurchaseEnabled'])))
+        return PoolState(converter, token, to_int(results[0]), to_int(conversion_fee), connectors,
+                         bool(to_int(is_active)), bool(to_int(conversions_enabled)))
+
+    async def get_pool_states(self, converters: list) -> list:
+        """Collects the states of converters concurrently, bounded by the connection pool
+
+        :param converters: converter addresses
+        :return: list of PoolState in the order of the converters
+        """
+        return list(await asyncio.gather(*(self.get_pool_state(converter) for converter in converters)))
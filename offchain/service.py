@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+from argparse import ArgumentParser
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qsl, urlsplit
+
+from offchain.events import EVENT_SIGNATURES, GRAPH_EVENT_SIGNATURES, POOL_EVENT_SIGNATURES, ConnectorAdd, \
+    OwnerUpdate, parse_event_log, to_int
+from offchain.graph import GraphIndex
+from offchain.indexer import read_blocks
+from offchain.pool import PoolCache
+from offchain.quote import QuoteError, get_return
+from offchain.rpc import AsyncRpcClient, DexClient
+from offchain.snapshot import Snapshot
+
+MAX_CONVERSION_COUNT = 10
+DEFAULT_CACHE_SIZE = 100000
+SIGNATURES = dict(EVENT_SIGNATURES, **POOL_EVENT_SIGNATURES, **GRAPH_EVENT_SIGNATURES)
+
+
+def parse_block(block: dict, signatures: dict = SIGNATURES) -> list:
+    """Parses the event records of the successful transactions of a block
+
+    :param block: block formatted as `offchain.indexer.read_blocks` returns
+    :param signatures: event signature -> (record type, indexed field names, data field names) of the events to parse
+    :return: list of event records in the order of the block
+    """
+    block_height = to_int(block['height'])
+    timestamp = to_int(block['time_stamp'])
+    records = []
+    for tx_result in block.get('transactions', []):
+        if to_int(tx_result.get('status', 1)) != 1:
+            continue
+        for event_log in tx_result.get('eventLogs', []):
+            record = parse_event_log(event_log, block_height, timestamp, tx_result.get('txHash'), signatures)
+            if record is not None:
+                records.append(record)
+    return records
+
+
+def _require_valid_path(path: list, amount: int) -> None:
+    # the same validation as `Network.getExpectedReturnByPath`
+    if not (2 < len(path) <= MAX_CONVERSION_COUNT * 2 + 1 and len(path) % 2 == 1):
+        raise QuoteError("invalid path")
+    if len(set(path[1::2])) != len(path) // 2:
+        raise QuoteError("do not support circular path")
+    if amount <= 0:
+        raise QuoteError("Amount should be greater than 0")
+
+
+class QuoteService:
+    """
+    Quotes conversions from the states of the converters kept in memory,
+    the same as the converters and the network return at the block height of the states.
+
+    The states are kept up to date by the events of the following blocks instead of polling the node.
+    `PriceDataUpdate`, `ConversionFeeUpdate`, `ConnectorUpdate`, `ConnectorPurchasesDisable` and `ConversionsEnable`
+    of a converter and `OwnerUpdate` of its flexible token update a state in place, and a converter getting
+    a new connector or becoming active again is collected again on its next quote, as the owner may have moved
+    its connector balances without events while it was inactive. Quotes are cached until an event changes
+    a converter they go through. Converters which are not active or whose conversions are disabled are not quoted,
+    as the conversions through them are rejected. Every method is thread-safe.
+    """
+
+    def __init__(self, pool_cache: PoolCache, graph: GraphIndex = None, collect=None,
+                 cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        :param pool_cache: states of the converters
+        :param graph: (Optional) index of the flexible tokens and the converters at the block height of the states,
+            created from the states if it is not given
+        :param collect: (Optional) function collecting the current state of a converter, `collect(converter)`
+            returning PoolState. Without it, converters whose states are not available cannot be quoted.
+        :param cache_size: maximum number of quotes to cache
+        """
+        self._pool_cache = pool_cache
+        if graph is None:
+            graph = GraphIndex()
+            for pool in pool_cache.pools.values():
+                graph.add_pool(pool.converter, pool.token, list(pool.connectors))
+            graph.block_height = pool_cache.block_height
+        self._graph = graph
+        self._collect = collect
+        self._cache_size = cache_size
+        # quote key -> (quote, converters the quote goes through), in the order of use
+        self._cache = OrderedDict()
+        # converter -> set of the keys of the cached quotes going through the converter
+        self._cache_keys = {}
+        # converters to collect again before quoting
+        self._stale = set()
+        self._lock = threading.RLock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @property
+    def block_height(self) -> int:
+        return self._pool_cache.block_height
+
+    def get_pool_count(self) -> int:
+        return len(self._pool_cache)
+
+    def get_return(self, converter: str, from_token: str, to_token: str, amount: int) -> dict:
+        """Returns the return for converting a token to another token of the converter, as `Converter.getReturn`
+
+        :param converter: converter address
+        :param from_token: token address to convert from
+        :param to_token: token address to convert to
+        :param amount: amount to convert, in the from token
+        :return: return amount and conversion fee, in dict
+        """
+        key = ('getReturn', converter, from_token, to_token, amount)
+        with self._lock:
+            result = self._get_cached(key)
+            if result is None:
+                pool = self._get_pool(converter)
+                if not pool.conversions_enabled:
+                    raise QuoteError("required conversions enabled")
+                result = get_return(pool, from_token, to_token, amount)
+                self._set_cached(key, result, (converter,))
+            return dict(result)
+
+    def get_expected_return_by_path(self, path: list, amount: int) -> int:
+        """Returns the return for converting by following the path, as `Network.getExpectedReturnByPath`
+
+        :param path: conversion path, token addresses where every second one is a flexible token
+            ex. [from token, flexible token, to token, flexible token, to token]
+        :param amount: amount to convert, in the first token
+        :return: return amount in the last token
+        """
+        _require_valid_path(path, amount)
+        key = ('getExpectedReturnByPath', tuple(path), amount)
+        with self._lock:
+            result = self._get_cached(key)
+            if result is not None:
+                return result
+
+            converters = []
+            result = amount
+            for index in range(1, len(path), 2):
+                converter = self._graph.get_converter(path[index])
+                if converter is None:
+                    raise QuoteError(f"flexible token is not owned by a converter: {path[index]}")
+                converters.append(converter)
+                result = self.get_return(converter, path[index - 1], path[index + 1], result)['amount']
+            self._set_cached(key, result, converters)
+            return result
+
+    def apply_all(self, records, block_height: int = None) -> set:
+        """Applies event records to the states and drops the cached quotes going through the changed converters.
+        Records at or below the block height of the states are ignored.
+
+        :param records: iterable of event records of `offchain.events` in the order of the chain
+        :param block_height: height of the last block of the records, to move the states to
+        :return: set of the changed converters
+        """
+        records = list(records)
+        with self._lock:
+            stale = set()
+            for record in records:
+                if record.block_height <= self._pool_cache.block_height:
+                    continue
+                if isinstance(record, ConnectorAdd) and record.score in self._pool_cache.pools:
+                    stale.add(record.score)
+                elif isinstance(record, OwnerUpdate):
+                    # while inactive, the owner withdraws and deposits connector tokens without converter events,
+                    # so the balances of a converter getting the flexible token back are collected again
+                    pool = self._pool_cache.get_by_token(record.score)
+                    if pool is not None and record.new_owner == pool.converter:
+                        stale.add(pool.converter)
+            graph_changed = self._graph.apply_all(records, block_height)
+            changed = self._pool_cache.apply_all(records, block_height) | stale
+            self._stale |= stale
+
+            if graph_changed:
+                # paths resolve flexible tokens to converters, so every cached path may be affected
+                self._cache.clear()
+                self._cache_keys.clear()
+            else:
+                self._invalidate(changed)
+            return changed
+
+    def ingest(self, blocks) -> int:
+        """Applies the events of the blocks in increasing order of heights
+
+        :param blocks: iterable of blocks formatted as `offchain.indexer.read_blocks` returns
+        :return: number of applied blocks
+        """
+        ingested = 0
+        for block in blocks:
+            block_height = to_int(block['height'])
+            if block_height <= self.block_height:
+                continue
+            self.apply_all(parse_block(block), block_height)
+            ingested += 1
+        return ingested
+
+    def _get_pool(self, converter: str):
+        pool = self._pool_cache.get(converter)
+        if pool is not None and converter not in self._stale:
+            return pool
+
+        # only the converters known by the events are collected, not any address a client asks for
+        if self._collect is None or pool is None and not self._graph.get_connectors(converter):
+            raise QuoteError(f"state of the converter is not available: {converter}")
+        pool = self._pool_cache.pools[converter] = self._collect(converter)
+        self._stale.discard(converter)
+        return pool
+
+    def _get_cached(self, key: tuple):
+        entry = self._cache.get(key)
+        if entry is None:
+            self.miss_count += 1
+            return None
+        self.hit_count += 1
+        self._cache.move_to_end(key)
+        return entry[0]
+
+    def _set_cached(self, key: tuple, result, converters) -> None:
+        self._cache[key] = (result, converters)
+        for converter in converters:
+            self._cache_keys.setdefault(converter, set()).add(key)
+
+        if len(self._cache) > self._cache_size:
+            old_key, (_, old_converters) = self._cache.popitem(last=False)
+            for converter in old_converters:
+                self._cache_keys[converter].discard(old_key)
+
+    def _invalidate(self, converters) -> None:
+        for converter in converters:
+            for key in self._cache_keys.pop(converter, ()):
+                entry = self._cache.pop(key, None)
+                if entry is None:
+                    continue
+                for other in entry[1]:
+                    if other != converter:
+                        self._cache_keys[other].discard(key)
+
+
+def _to_json(value):
+    # integers are encoded as hex strings, as the JSON-RPC of the nodes does
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    return value
+
+
+class QuoteRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/JSON interface of QuoteService over keep-alive connections.
+    Quotes take the parameters of the SCORE methods as the query string and integers in hex strings.
+
+    GET  /getReturn?_converter=cx..&_fromToken=cx..&_toToken=cx..&_amount=0x..
+    GET  /getExpectedReturnByPath?_path=cx..,cx..,cx..&_amount=0x..
+    GET  /status
+    POST /blocks    a block or a list of blocks, formatted as `offchain.indexer.read_blocks` returns
+
+    Responses are `{"result": ..}`, or `{"error": {"message": ..}}` with a 4xx status.
+    """
+    protocol_version = 'HTTP/1.1'
+    # the headers and the body are written separately, which would wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        service = self.server.service
+        try:
+            if url.path == '/getReturn':
+                result = service.get_return(
+                    params['_converter'], params['_fromToken'], params['_toToken'], to_int(params['_amount']))
+            elif url.path == '/getExpectedReturnByPath':
+                path = [address.strip() for address in params['_path'].split(',')]
+                result = service.get_expected_return_by_path(path, to_int(params['_amount']))
+            elif url.path == '/status':
+                result = {'blockHeight': service.block_height, 'poolCount': service.get_pool_count(),
+                          'hitCount': service.hit_count, 'missCount': service.miss_count}
+            else:
+                self._send(404, {'error': {'message': f'not found: {url.path}'}})
+                return
+        except KeyError as e:
+            self._send(400, {'error': {'message': f'missing parameter: {e.args[0]}'}})
+        except (QuoteError, ValueError) as e:
+            self._send(400, {'error': {'message': str(e)}})
+        else:
+            self._send(200, {'result': _to_json(result)})
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if urlsplit(self.path).path != '/blocks':
+            self._send(404, {'error': {'message': f'not found: {self.path}'}})
+            return
+        try:
+            blocks = json.loads(body)
+            ingested = self.server.service.ingest(blocks if isinstance(blocks, list) else [blocks])
+        except (KeyError, ValueError) as e:
+            self._send(400, {'error': {'message': f'invalid block: {e}'}})
+        else:
+            self._send(200, {'result': hex(ingested)})
+
+    def _send(self, status: int, response: dict) -> None:
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # a line per request costs more than a cached quote
+        pass
+
+
+class QuoteServer(ThreadingMixIn, HTTPServer):
+    """HTTP server of QuoteService handling each connection in a thread"""
+    daemon_threads = True
+
+    def __init__(self, service: QuoteService, host: str = '127.0.0.1', port: int = 0) -> None:
+        """
+        :param service: QuoteService to serve
+        :param host: host to listen on
+        :param port: port to listen on, 0 for any free port
+        """
+        super().__init__((host, port), QuoteRequestHandler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+def create_collect(url: str):
+    """Creates a function collecting the current state of a converter from a node,
+    running the requests on an event loop of a background thread
+
+    :param url: JSON-RPC endpoint of the node
+    :return: function `collect(converter)` returning PoolState
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    client = DexClient(AsyncRpcClient(url))
+
+    def collect(converter: str):
+        return asyncio.run_coroutine_threadsafe(client.get_pool_state(converter), loop).result()
+
+    return collect
+
+
+def parse_args():
+    parser = ArgumentParser(description='Serves conversion quotes from converter states kept in memory')
+    parser.add_argument('snapshot', help='snapshot file of the converter states to start from')
+    parser.add_argument('--blocks', help='block dump or JSON-lines file of the blocks following the snapshot')
+    parser.add_argument('--url', help='JSON-RPC endpoint of a node to collect the states of changed converters')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with Snapshot(args.snapshot) as snapshot:
+        pool_cache = snapshot.load()
+
+    collect = create_collect(args.url) if args.url else None
+    service = QuoteService(pool_cache, collect=collect, cache_size=args.cache_size)
+    if args.blocks:
+        service.ingest(read_blocks(args.blocks))
+
+    server = QuoteServer(service, args.host, args.port)
+    print(f'serving {service.get_pool_count()} pools at block {service.block_height} on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
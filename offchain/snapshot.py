@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import struct
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from os import path, makedirs, replace
+
+from offchain.pool import ConnectorState, PoolState, PoolCache, collect_pool_state
+
+MAGIC = b'DEXSNAP2'
+# magic, block height, pool count
+HEADER = struct.Struct('<8sQI')
+# converter address, offset and length of the pool record
+INDEX_ENTRY = struct.Struct('<21sQI')
+# flexible token address, token supply, conversion fee, connector count, flags
+POOL_HEADER = struct.Struct('<21s32sIHB')
+# connector token address, balance, weight, flags
+CONNECTOR = struct.Struct('<21s32sIB')
+
+FLAG_VIRTUAL_BALANCE_ENABLED = 0x1
+FLAG_PURCHASE_ENABLED = 0x2
+
+POOL_FLAG_ACTIVE = 0x1
+POOL_FLAG_CONVERSIONS_ENABLED = 0x2
+
+_ADDRESS_PREFIXES = {'hx': b'\x00', 'cx': b'\x01'}
+_ADDRESS_PREFIX_BYTES = {value: key for key, value in _ADDRESS_PREFIXES.items()}
+
+
+def encode_address(address: str) -> bytes:
+    """Encodes an address string into 21 bytes of the prefix and the body"""
+    return _ADDRESS_PREFIXES[address[:2]] + bytes.fromhex(address[2:])
+
+
+def decode_address(raw: bytes) -> str:
+    """Decodes 21 bytes into an address string"""
+    return _ADDRESS_PREFIX_BYTES[raw[:1]] + raw[1:].hex()
+
+
+def _encode_int(value: int) -> bytes:
+    return value.to_bytes(32, 'big', signed=True)
+
+
+def _decode_int(raw: bytes) -> int:
+    return int.from_bytes(raw, 'big', signed=True)
+
+
+def encode_pool(pool: PoolState) -> bytes:
+    """Encodes a pool state into a pool record"""
+    pool_flags = (POOL_FLAG_ACTIVE if pool.is_active else 0) | \
+        (POOL_FLAG_CONVERSIONS_ENABLED if pool.conversions_enabled else 0)
+    chunks = [POOL_HEADER.pack(encode_address(pool.token), _encode_int(pool.token_supply),
+                               pool.conversion_fee, len(pool.connectors), pool_flags)]
+    for connector_token, connector in pool.connectors.items():
+        flags = (FLAG_VIRTUAL_BALANCE_ENABLED if connector.is_virtual_balance_enabled else 0) | \
+                (FLAG_PURCHASE_ENABLED if connector.is_purchase_enabled else 0)
+        chunks.append(CONNECTOR.pack(encode_address(connector_token), _encode_int(connector.balance),
+                                     connector.weight, flags))
+    return b''.join(chunks)
+
+
+def decode_pool(converter: str, buffer, offset: int) -> PoolState:
+    """Decodes a pool record in the buffer"""
+    token, token_supply, conversion_fee, connector_count, pool_flags = POOL_HEADER.unpack_from(buffer, offset)
+    offset += POOL_HEADER.size
+    connectors = OrderedDict()
+    for _ in range(connector_count):
+        connector_token, balance, weight, flags = CONNECTOR.unpack_from(buffer, offset)
+        offset += CONNECTOR.size
+        connectors[decode_address(connector_token)] = ConnectorState(
+            _decode_int(balance), weight,
+            bool(flags & FLAG_VIRTUAL_BALANCE_ENABLED), bool(flags & FLAG_PURCHASE_ENABLED))
+    return PoolState(converter, decode_address(token), _decode_int(token_supply), conversion_fee, connectors,
+                     bool(pool_flags & POOL_FLAG_ACTIVE), bool(pool_flags & POOL_FLAG_CONVERSIONS_ENABLED))
+
+
+def write_snapshot(file_path: str, pools, block_height: int) -> None:
+    """Writes the pool states into a snapshot file atomically
+
+    The file consists of a header, an index table sorted by the converter address and the pool records,
+    so a pool is found by binary search on the index without decoding the others.
+
+    :param file_path: snapshot file path
+    :param pools: iterable of PoolState
+    :param block_height: height of the block the states are at
+    """
+    pools = sorted(pools, key=lambda pool: encode_address(pool.converter))
+    records = [encode_pool(pool) for pool in pools]
+
+    offset = HEADER.size + INDEX_ENTRY.size * len(pools)
+    index = []
+    for pool, record in zip(pools, records):
+        index.append(INDEX_ENTRY.pack(encode_address(pool.converter), offset, len(record)))
+        offset += len(record)
+
+    makedirs(path.dirname(path.abspath(file_path)), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, block_height, len(pools)))
+        f.write(b''.join(index))
+        f.write(b''.join(records))
+    replace(tmp_path, file_path)
+
+
+def export_snapshot(file_path: str, call, converters: list, block_height: int, max_workers: int = 16) -> int:
+    """Collects the states of the converters and writes them into a snapshot file
+
+    :param file_path: snapshot file path
+    :param call: function calling a readonly method, see `offchain.pool.collect_pool_state`
+    :param converters: converter addresses
+    :param block_height: height of the block the calls are answered at
+    :param max_workers: number of converters collected concurrently
+    :return: number of exported pools
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pools = list(executor.map(lambda converter: collect_pool_state(call, converter), converters))
+    write_snapshot(file_path, pools, block_height)
+    return len(pools)
+
+
+class Snapshot:
+    """
+    Memory-mapped snapshot file. Only the header is read on opening,
+    and a pool record is decoded when it is looked up.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        :param file_path: snapshot file path
+        """
+        self._file = open(file_path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.block_height, self._count = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'not a snapshot file: {file_path}')
+        self._keys = None
+
+    def close(self) -> None:
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _get_index_entry(self, position: int) -> tuple:
+        return INDEX_ENTRY.unpack_from(self._buffer, HEADER.size + INDEX_ENTRY.size * position)
+
+    def get_converters(self) -> list:
+        """Returns the converter addresses in the snapshot"""
+        return [decode_address(self._get_index_entry(position)[0]) for position in range(self._count)]
+
+    def get(self, converter: str) -> PoolState:
+        """Decodes the state of a converter
+
+        :param converter: converter address
+        :return: PoolState, None if the converter is not in the snapshot
+        """
+        if self._keys is None:
+            self._keys = [self._get_index_entry(position)[0] for position in range(self._count)]
+
+        key = encode_address(converter)
+        position = bisect_left(self._keys, key)
+        if position == self._count or self._keys[position] != key:
+            return None
+        _, offset, _ = self._get_index_entry(position)
+        return decode_pool(converter, self._buffer, offset)
+
+    def load(self) -> PoolCache:
+        """Decodes every pool state into a cache, which events after the snapshot can be applied to
+
+        :return: PoolCache at the block height of the snapshot
+        """
+        pools = {}
+        for position in range(self._count):
+            key, offset, _ = self._get_index_entry(position)
+            converter = decode_address(key)
+            pools[converter] = decode_pool(converter, self._buffer, offset)
+        return PoolCache(pools, self.block_height)
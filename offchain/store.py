@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from os import path, makedirs, replace, listdir
+
+from offchain.events import EVENT_SIGNATURES, ADDRESS_FIELDS
+
+STATE_FILE_NAME = '_state.json'
+COLUMN_FILE_EXTENSION = '.col'
+
+# column kind -> (width in bytes, encoder, decoder)
+INT64 = 'int64'
+INT256 = 'int256'
+ADDRESS = 'address'
+HASH = 'hash'
+_INT64_STRUCT = struct.Struct('<q')
+COLUMN_KINDS = {
+    INT64: (8, _INT64_STRUCT.pack, lambda raw: _INT64_STRUCT.unpack(raw)[0]),
+    INT256: (32, lambda value: value.to_bytes(32, 'big', signed=True),
+             lambda raw: int.from_bytes(raw, 'big', signed=True)),
+    ADDRESS: (42, lambda value: value.encode().ljust(42, b'\0'), lambda raw: raw.rstrip(b'\0').decode()),
+    HASH: (66, lambda value: (value or '').encode().ljust(66, b'\0'), lambda raw: raw.rstrip(b'\0').decode()),
+}
+
+
+def _get_column_kind(name: str) -> str:
+    if name in ('block_height', 'timestamp'):
+        return INT64
+    if name == 'tx_hash':
+        return HASH
+    if name in ADDRESS_FIELDS:
+        return ADDRESS
+    return INT256
+
+
+# table name -> list of (column name, column kind), the score of the event is the partition key
+SCHEMAS = {
+    record_type.__name__: [(name, _get_column_kind(name)) for name in record_type._fields if name != 'score']
+    for record_type, _, _ in EVENT_SIGNATURES.values()
+}
+
+
+def get_day(timestamp: int) -> str:
+    """Returns the UTC day of the timestamp, which is the partition of the rows
+
+    :param timestamp: timestamp in microseconds
+    :return: day formatted as YYYYMMDD
+    """
+    return datetime.fromtimestamp(timestamp // 10 ** 6, tz=timezone.utc).strftime('%Y%m%d')
+
+
+def get_days(start_timestamp: int, end_timestamp: int) -> list:
+    """Returns the UTC days overlapping the range
+
+    :param start_timestamp: start timestamp in microseconds, inclusive
+    :param end_timestamp: end timestamp in microseconds, inclusive
+    :return: list of days formatted as YYYYMMDD
+    """
+    start = datetime.fromtimestamp(start_timestamp // 10 ** 6, tz=timezone.utc).date()
+    end = datetime.fromtimestamp(end_timestamp // 10 ** 6, tz=timezone.utc).date()
+    return [(start + timedelta(days=offset)).strftime('%Y%m%d') for offset in range((end - start).days + 1)]
+
+
+class Partition:
+    """
+    Rows of a table for a score and a day, stored column by column in fixed width files.
+
+    Rows are appended in the order of block heights, so ranges of block heights and timestamps
+    are found by binary search on their columns.
+    """
+
+    def __init__(self, partition_dir: str, schema: list) -> None:
+        """
+        :param partition_dir: directory of the column files
+        :param schema: list of (column name, column kind)
+        """
+        self._dir = partition_dir
+        self._schema = schema
+        self._kinds = dict(schema)
+
+    def _get_column_path(self, name: str) -> str:
+        return path.join(self._dir, name + COLUMN_FILE_EXTENSION)
+
+    def exists(self) -> bool:
+        return path.isdir(self._dir)
+
+    def get_row_count(self) -> int:
+        """Returns the number of complete rows, as columns can be cut in the middle of an interrupted append"""
+        counts = []
+        for name, kind in self._schema:
+            column_path = self._get_column_path(name)
+            size = path.getsize(column_path) if path.isfile(column_path) else 0
+            counts.append(size // COLUMN_KINDS[kind][0])
+        return min(counts)
+
+    def truncate(self, row_count: int) -> None:
+        """Cuts every column to the number of rows
+
+        :param row_count: number of rows to keep
+        """
+        for name, kind in self._schema:
+            column_path = self._get_column_path(name)
+            if path.isfile(column_path):
+                with open(column_path, 'r+b') as f:
+                    f.truncate(row_count * COLUMN_KINDS[kind][0])
+
+    def append(self, rows: list) -> None:
+        """Appends rows to the columns
+
+        :param rows: list of dict, column name -> value
+        """
+        makedirs(self._dir, exist_ok=True)
+        for name, kind in self._schema:
+            encode = COLUMN_KINDS[kind][1]
+            with open(self._get_column_path(name), 'ab') as f:
+                f.write(b''.join(encode(row[name]) for row in rows))
+
+    def read_column(self, name: str, begin: int = 0, end: int = None) -> list:
+        """Reads the values of a column in the row range
+
+        :param name: column name
+        :param begin: index of the first row
+        :param end: index after the last row, None to read to the end
+        :return: list of values
+        """
+        width, _, decode = COLUMN_KINDS[self._kinds[name]]
+        with open(self._get_column_path(name), 'rb') as f:
+            f.seek(begin * width)
+            raw = f.read() if end is None else f.read((end - begin) * width)
+        return [decode(raw[offset:offset + width]) for offset in range(0, len(raw) - width + 1, width)]
+
+    def find_rows(self, column: str, low, high, row_count: int) -> tuple:
+        """Returns the row range whose values of the sorted column are between low and high.
+        Only the values probed by the binary search are read, so a lookup reads O(log n) records.
+
+        :param column: column sorted in ascending order
+        :param low: lowest value, inclusive
+        :param high: highest value, inclusive
+        :param row_count: number of rows to search
+        :return: (begin, end) of the rows
+        """
+        if row_count == 0:
+            return 0, 0
+
+        width, _, decode = COLUMN_KINDS[self._kinds[column]]
+        with open(self._get_column_path(column), 'rb') as f:
+            def read_value(index: int):
+                f.seek(index * width)
+                return decode(f.read(width))
+
+            begin = _bisect(read_value, lambda value: value < low, 0, row_count)
+            end = _bisect(read_value, lambda value: value <= high, begin, row_count)
+        return begin, end
+
+
+def _bisect(read_value: callable, is_before: callable, begin: int, end: int) -> int:
+    """Returns the index of the first row in the range whose value is not before the target
+
+    :param read_value: function reading the value of a row
+    :param is_before: function checking if a value is before the target
+    :param begin: index of the first row to search
+    :param end: index after the last row to search
+    :return: index of the first row not before the target
+    """
+    while begin < end:
+        middle = (begin + end) // 2
+        if is_before(read_value(middle)):
+            begin = middle + 1
+        else:
+            end = middle
+    return begin
+
+
+class ColumnarStore:
+    """
+    Append-only columnar store of event records, partitioned by the emitting score and the UTC day.
+
+    The layout is `<root>/<table>/<score>/<YYYYMMDD>/<column>.col`, and `<root>/_state.json` keeps
+    the height of the last committed block. Rows above it are left by an interrupted ingestion,
+    so they are hidden from the scans and cut on the next append, which makes re-ingestion exactly once.
+    """
+
+    def __init__(self, root_dir: str) -> None:
+        """
+        :param root_dir: root directory of the store
+        """
+        self._root_dir = root_dir
+        self._state_path = path.join(root_dir, STATE_FILE_NAME)
+        self._last_block_height = -1
+        if path.isfile(self._state_path):
+            with open(self._state_path, 'r') as f:
+                self._last_block_height = json.load(f)['last_block_height']
+
+        # (table, score, day) -> rows buffered until the next commit
+        self._pending = {}
+        # partitions whose uncommitted rows are cut already
+        self._recovered = set()
+
+    @property
+    def last_block_height(self) -> int:
+        """Returns the height of the last committed block, -1 if nothing is committed"""
+        return self._last_block_height
+
+    def get_partition(self, table: str, score: str, day: str) -> Partition:
+        return Partition(path.join(self._root_dir, table, score, day), SCHEMAS[table])
+
+    def get_scores(self, table: str) -> list:
+        """Returns the scores which have emitted the events of the table
+
+        :param table: table name
+        :return: sorted list of score addresses
+        """
+        table_dir = path.join(self._root_dir, table)
+        return sorted(listdir(table_dir)) if path.isdir(table_dir) else []
+
+    def append(self, record) -> None:
+        """Buffers an event record until the next commit
+
+        :param record: event record of `offchain.events`
+        """
+        table = type(record).__name__
+        row = record._asdict()
+        key = (table, row.pop('score'), get_day(record.timestamp))
+        self._pending.setdefault(key, []).append(row)
+
+    def commit(self, block_height: int) -> None:
+        """Writes the buffered records and marks the block height as committed
+
+        :param block_height: height of the last block whose records are all appended
+        """
+        for key, rows in self._pending.items():
+            partition = self.get_partition(*key)
+            if key not in self._recovered:
+                self._recover(partition)
+                self._recovered.add(key)
+            partition.append(rows)
+        self._pending.clear()
+
+        makedirs(self._root_dir, exist_ok=True)
+        tmp_path = self._state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'last_block_height': block_height}, f)
+        replace(tmp_path, self._state_path)
+        self._last_block_height = block_height
+
+    def _recover(self, partition: Partition) -> None:
+        """Cuts the rows of an interrupted ingestion"""
+        if not partition.exists():
+            return
+        _, row_count = partition.find_rows(
+            'block_height', 0, self._last_block_height, partition.get_row_count())
+        partition.truncate(row_count)
+
+    def scan(self, table: str, score: str, start_timestamp: int, end_timestamp: int, columns: list = None):
+        """Scans the committed rows of the score in the time range, in the order of the chain
+
+        :param table: table name
+        :param score: score address which emitted the events
+        :param start_timestamp: start timestamp in microseconds, inclusive
+        :param end_timestamp: end timestamp in microseconds, inclusive
+        :param columns: names of the columns to read, None to read every column
+        :return: generator of dict, column name -> value
+        """
+        if columns is None:
+            columns = [name for name, _ in SCHEMAS[table]]
+
+        for day in get_days(start_timestamp, end_timestamp):
+            partition = self.get_partition(table, score, day)
+            if not partition.exists():
+                continue
+
+            _, row_count = partition.find_rows(
+                'block_height', 0, self._last_block_height, partition.get_row_count())
+            begin, end = partition.find_rows('timestamp', start_timestamp, end_timestamp, row_count)
+            if begin >= end:
+                continue
+
+            values = [partition.read_column(name, begin, end) for name in columns]
+            for row in zip(*values):
+                yield dict(zip(columns, row))
@@ -14,16 +14,36 @@
 # limitations under the License.
 
 import inspect
-from collections import namedtuple
+from collections import namedtuple, Counter
 from unittest.mock import Mock, patch, PropertyMock
 
 from iconservice import Address, IconScoreDatabase, IconScoreBase
-from iconservice.database.db import ContextDatabase
 from iconservice.iconscore.icon_score_constant import CONST_BIT_FLAG, ConstBitFlag
 from iconservice.iconscore.icx import Icx
 from iconservice.iconscore.internal_call import InternalCall
 
 
+class MemoryContextDatabase:
+    """
+    Memory db in place of ContextDatabase, which ignores the context
+    """
+
+    def __init__(self):
+        self.memory_db = {}
+
+    # noinspection PyUnusedLocal
+    def get(self, context, key):
+        return self.memory_db.get(key)
+
+    # noinspection PyUnusedLocal
+    def put(self, context, key, value):
+        self.memory_db[key] = value
+
+    # noinspection PyUnusedLocal
+    def delete(self, context, key):
+        del self.memory_db[key]
+
+
 def create_db(address: Address):
     """
     Create memory db for IconScoreDatabase
@@ -31,26 +51,31 @@ def create_db(address: Address):
     :param address: score address
     :return: IconScoreDatabase
     """
-    memory_db = {}
+    return IconScoreDatabase(address, MemoryContextDatabase())
 
-    # noinspection PyUnusedLocal
-    def put(context, key, value):
-        memory_db[key] = value
 
-    # noinspection PyUnusedLocal
-    def get(context, key):
-        return memory_db.get(key)
+def count_db_access(db: IconScoreDatabase) -> tuple:
+    """
+    Counts the get and put calls to the memory db created by `create_db`
 
-    # noinspection PyUnusedLocal
-    def delete(context, key):
-        del memory_db[key]
+    :param db: IconScoreDatabase created by `create_db`
+    :return: (Counter of get calls by key, Counter of put calls by key)
+    """
+    context_db = db._context_db
+    get, put = context_db.get, context_db.put
+    get_counter, put_counter = Counter(), Counter()
+
+    def counting_get(context, key):
+        get_counter[key] += 1
+        return get(context, key)
 
-    context_db = Mock(spec=ContextDatabase)
-    context_db.get = get
-    context_db.put = put
-    context_db.delete = delete
+    def counting_put(context, key, value):
+        put_counter[key] += 1
+        put(context, key, value)
 
-    return IconScoreDatabase(address, context_db)
+    context_db.get = counting_get
+    context_db.put = counting_put
+    return get_counter, put_counter
 
 
 # patch target format
@@ -105,47 +130,88 @@ class MultiPatch:
 class ScorePatcher:
     """
     patcher for SCORE
+
+    The functions to patch are searched once per SCORE class, as it walks the whole class hierarchy.
+    Starting and stopping the patches costs the most, so a test class starts them once in `setUpClass`,
+    resets the mocks in `setUp` and stops them in `tearDownClass`.
     """
 
+    # SCORE class -> patch plan, list of (class, function name) to patch
+    _plan_cache = {}
+
     def __init__(self, score_class):
         self.mocks = None
-        self.patcher = MultiPatch()
-        self.searched_class = set()
-        self._append_patch_event_logs(score_class)
-        self._append_patch_bases(score_class)
+        self.patcher = MultiPatch([patch.object(a_class, name) for a_class, name in self.get_plan(score_class)])
         self.patcher.append(patch.object(IconScoreBase, 'get_owner'))
         self.patcher.append(patch_property(IconScoreBase, 'icx', Mock(spec=Icx)))
 
-    def _append_patch_bases(self, a_class):
+    @classmethod
+    def get_plan(cls, score_class) -> list:
+        """
+        Returns the patch plan of the SCORE class
+
+        :param score_class: SCORE class
+        :return: list of (class, function name) to patch
+        """
+        plan = cls._plan_cache.get(score_class)
+        if plan is None:
+            plan = cls._plan_cache[score_class] = cls._create_plan(score_class)
+        return plan
+
+    @classmethod
+    def _create_plan(cls, score_class) -> list:
+        plan = []
+        searched_class = set()
+        cls._append_patch_event_logs(plan, searched_class, score_class)
+        cls._append_patch_bases(plan, searched_class, score_class)
+        return plan
+
+    @classmethod
+    def _append_patch_bases(cls, plan, searched_class, a_class):
         for base in a_class.__bases__:
             if not inspect.isabstract(base):
-                self._append_patch_class(base)
+                cls._append_patch_class(plan, searched_class, base)
 
-    def _append_patch_class(self, a_class):
-        if a_class in self.searched_class:
+    @classmethod
+    def _append_patch_class(cls, plan, searched_class, a_class):
+        if a_class in searched_class:
             return
 
-        self.searched_class.add(a_class)
+        searched_class.add(a_class)
         for name in a_class.__dict__:
             attr = getattr(a_class, name)
             if inspect.isfunction(attr) and name != '__init__':
-                self.patcher.append(patch.object(a_class, attr.__name__))
+                plan.append((a_class, attr.__name__))
 
-        self._append_patch_bases(a_class)
+        cls._append_patch_bases(plan, searched_class, a_class)
 
-    def _append_patch_event_logs(self, a_class):
-        if a_class in self.searched_class:
+    @staticmethod
+    def _append_patch_event_logs(plan, searched_class, a_class):
+        if a_class in searched_class:
             return
 
-        self.searched_class.add(a_class)
+        searched_class.add(a_class)
         for name in a_class.__dict__:
             attr = getattr(a_class, name)
             if inspect.isfunction(attr) and \
                     getattr(attr, CONST_BIT_FLAG, 0) & ConstBitFlag.EventLog:
-                self.patcher.append(patch.object(a_class, attr.__name__))
+                plan.append((a_class, attr.__name__))
 
     def start(self):
-        return self.patcher.start()
+        self.mocks = self.patcher.start()
+        return self.mocks
+
+    def reset(self):
+        """
+        Resets the calls, return values and side effects of the started mocks,
+        as if the patches were started again
+        """
+        *function_mocks, icx_property = self.mocks
+        for mock in function_mocks:
+            mock.reset_mock(return_value=True, side_effect=True)
+        # the property keeps returning the Icx mock
+        icx_property.reset_mock()
+        icx_property.return_value.reset_mock(return_value=True, side_effect=True)
 
     def stop(self):
         self.patcher.stop()
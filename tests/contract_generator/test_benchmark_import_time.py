@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+from os import path
+from statistics import median
+from tempfile import TemporaryDirectory
+
+from contract_generator.builder import Builder
+from contract_generator.config import config
+from contract_generator.writer import FileWriter
+
+CONTRACTS_PATH = path.abspath(path.join(path.dirname(__file__), '../../contracts'))
+REPEAT = 5
+
+# Imports the main file of a built SCORE package in a fresh interpreter, relatively to the package root
+# like the SCORE loader of a node. iconservice is imported beforehand as it is shared by every SCORE on a node.
+IMPORT_SCRIPT = '''
+import importlib, json, sys, time
+import iconservice
+sys.path.insert(0, sys.argv[1])
+begin = time.perf_counter()
+importlib.import_module('.' + sys.argv[2], sys.argv[3])
+elapsed = time.perf_counter() - begin
+proxy_score = sys.modules.get(sys.argv[3] + '.utility.proxy_score')
+created = len(proxy_score.ProxyScore.__dict__.get('_proxy_class_cache', {})) if proxy_score else 0
+print(json.dumps({'elapsed': elapsed, 'created': created}))
+'''
+
+
+class TestBenchmarkImportTime(unittest.TestCase):
+
+    @staticmethod
+    def _import_package(output_root_dir: str, main_file: str, name: str) -> dict:
+        output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT, output_root_dir, main_file, name],
+                                         cwd=output_root_dir)
+        return json.loads(output.decode().strip().splitlines()[-1])
+
+    def test_benchmark_import_time(self):
+        with TemporaryDirectory() as output_root_dir:
+            file_writer = FileWriter(output_root_dir)
+            Builder(CONTRACTS_PATH).build(file_writer)
+
+            for name in config:
+                with open(path.join(output_root_dir, name, 'package.json')) as f:
+                    main_file = json.load(f)['main_file']
+
+                results = [self._import_package(output_root_dir, main_file, name) for _ in range(REPEAT)]
+                elapsed = median(result['elapsed'] for result in results)
+                print('{0:16s}: import time = {1:9.3f} ms (median of {2})'.format(name, elapsed * 1000, REPEAT))
+
+                # interface SCOREs are created on their first use, not on loading
+                for result in results:
+                    self.assertEqual(0, result['created'])
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from io import BytesIO
+from os import path, makedirs
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from zipfile import ZipFile
+
+from contract_generator import cache
+from contract_generator.builder import Contract
+from contract_generator.cache import PackageCache
+from contract_generator.manifest import hash_file
+
+
+class TestPackageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.source_dir = path.join(self.temp_dir.name, 'contracts')
+        self.cache_dir = path.join(self.temp_dir.name, 'cache')
+
+        self._write_source('token/token.py', 'class Token: pass\n')
+        self._write_source('token/package.json', '{}\n')
+
+        PackageCache.clear_memory()
+        self.build_patcher = patch.object(cache, 'build_package', wraps=cache.build_package)
+        self.build_package = self.build_patcher.start()
+
+    def tearDown(self):
+        self.build_patcher.stop()
+        PackageCache.clear_memory()
+        self.temp_dir.cleanup()
+
+    def _write_source(self, file_path: str, content: str) -> None:
+        source_path = path.join(self.source_dir, file_path)
+        makedirs(path.dirname(source_path), exist_ok=True)
+        with open(source_path, 'w') as f:
+            f.write(content)
+
+    def _create_contract(self) -> Contract:
+        contract = Contract(name='token', path_list=[], file_hashes={})
+        for file_path in ['token/token.py', 'token/package.json']:
+            cur_file_path = path.join(self.source_dir, file_path)
+            contract.path_list.append((cur_file_path, file_path))
+            contract.file_hashes[file_path] = hash_file(cur_file_path)
+        return contract
+
+    @staticmethod
+    def _read_entry(package: bytes, file_path: str) -> str:
+        with ZipFile(BytesIO(package)) as zf:
+            return zf.read(file_path).decode()
+
+    def test_get_memory_hit(self):
+        package_cache = PackageCache()
+        package = package_cache.get(self._create_contract())
+        self.assertEqual(1, self.build_package.call_count)
+
+        # another instance in the same process shares the memory cache
+        self.assertEqual(package, PackageCache().get(self._create_contract()))
+        self.assertEqual(1, self.build_package.call_count)
+
+    def test_get_disk_hit(self):
+        package = PackageCache(self.cache_dir).get(self._create_contract())
+        self.assertEqual(1, self.build_package.call_count)
+
+        # like another process, which does not have the memory cache
+        PackageCache.clear_memory()
+        self.assertEqual(package, PackageCache(self.cache_dir).get(self._create_contract()))
+        self.assertEqual(1, self.build_package.call_count)
+
+    def test_get_source_changed(self):
+        package_cache = PackageCache(self.cache_dir)
+        package_cache.get(self._create_contract())
+
+        self._write_source('token/token.py', 'class Token(object): pass\n')
+        package = package_cache.get(self._create_contract())
+        self.assertEqual(2, self.build_package.call_count)
+        self.assertEqual('class Token(object): pass\n', self._read_entry(package, 'token/token.py'))
+
+    def test_get_corrupted_entry(self):
+        package_cache = PackageCache(self.cache_dir)
+        contract = self._create_contract()
+        package = package_cache.get(contract)
+        package_path = package_cache._get_package_path(contract.name, package_cache.get_key(contract))
+
+        for corrupted in [package[:len(package) // 2], b'\x00' * len(package)]:
+            with open(package_path, 'wb') as f:
+                f.write(corrupted)
+
+            # the corrupted entry is rebuilt instead of being returned
+            PackageCache.clear_memory()
+            self.assertEqual(package, PackageCache(self.cache_dir).get(contract))
+            with open(package_path, 'rb') as f:
+                self.assertEqual(package, f.read())
+        self.assertEqual(3, self.build_package.call_count)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from os import path
+
+from contract_generator.dependency import DependencyResolver
+
+CONTRACTS_PATH = path.abspath(path.join(path.dirname(__file__), '../../contracts'))
+
+
+class TestDependencyResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.resolver = DependencyResolver(CONTRACTS_PATH)
+
+    def test_resolve_direct_imports(self):
+        # irc_token imports its interface and its storage utilities
+        self.assertEqual(['interfaces/__init__.py', 'interfaces/abc_irc_token.py',
+                          'utility/__init__.py', 'utility/address_set.py',
+                          'utility/holder_index.py', 'utility/token_storage.py', 'utility/utils.py'],
+                         self.resolver.resolve('irc_token'))
+
+    def test_resolve_checkpoints(self):
+        # only flexible_token keeps the checkpoints
+        self.assertIn('utility/checkpoints.py', self.resolver.resolve('flexible_token'))
+        self.assertNotIn('utility/checkpoints.py', self.resolver.resolve('icx_token'))
+
+    def test_resolve_closure(self):
+        dependencies = self.resolver.resolve('flexible_token')
+
+        # imported directly
+        self.assertIn('irc_token/irc_token.py', dependencies)
+        self.assertIn('utility/token_holder.py', dependencies)
+        # imported by token_holder
+        self.assertIn('utility/proxy_score.py', dependencies)
+        self.assertIn('interfaces/abc_token_holder.py', dependencies)
+        # package init files are on the way of every import
+        self.assertIn('irc_token/__init__.py', dependencies)
+        self.assertIn('utility/__init__.py', dependencies)
+        # own files are not dependencies
+        self.assertNotIn('flexible_token/flexible_token.py', dependencies)
+
+    def test_resolve_package_import(self):
+        # converter imports `formula` from the package, whose `__init__.py` imports fixed_map_formula
+        dependencies = self.resolver.resolve('converter')
+        self.assertIn('formula/__init__.py', dependencies)
+        self.assertIn('formula/fixed_map_formula.py', dependencies)
+        self.assertIn('interfaces/abc_formula.py', dependencies)
+
+    def test_resolve_minimal(self):
+        # formula does not use any interface score
+        self.assertNotIn('utility/proxy_score.py', self.resolver.resolve('formula'))
+        # score_registry reads converters through their interface, not their implementation
+        dependencies = self.resolver.resolve('score_registry')
+        self.assertNotIn('converter/converter.py', dependencies)
+        self.assertNotIn('formula/fixed_map_formula.py', dependencies)
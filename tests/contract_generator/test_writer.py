@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from os import path, makedirs, remove, listdir
+from tempfile import TemporaryDirectory
+
+from build import write_packages_to_file_system
+from contract_generator.builder import Builder, Contract
+from contract_generator.config import config
+from contract_generator.manifest import hash_file
+from contract_generator.writer import FileWriter, PackageWriter
+
+CONTRACTS_PATH = path.abspath(path.join(path.dirname(__file__), '../../contracts'))
+
+
+class TestFileWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.source_dir = path.join(self.temp_dir.name, 'contracts')
+        self.output_root_dir = path.join(self.temp_dir.name, 'build')
+        self.writer = FileWriter(self.output_root_dir)
+
+        self._write_source('token/token.py', 'class Token: pass\n')
+        self._write_source('token/package.json', '{}\n')
+        self._write_source('utility/utils.py', 'def require(): pass\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_source(self, file_path: str, content: str) -> None:
+        source_path = path.join(self.source_dir, file_path)
+        makedirs(path.dirname(source_path), exist_ok=True)
+        with open(source_path, 'w') as f:
+            f.write(content)
+
+    def _create_contract(self, file_paths: list) -> Contract:
+        contract = Contract(name='token', path_list=[], file_hashes={})
+        for file_path in file_paths:
+            cur_file_path = path.join(self.source_dir, file_path)
+            new_file_path = path.join('token', file_path) if not file_path.startswith('token/') else file_path
+            contract.path_list.append((cur_file_path, new_file_path))
+            contract.file_hashes[new_file_path] = hash_file(cur_file_path)
+        return contract
+
+    def _read_output(self, new_file_path: str) -> str:
+        with open(path.join(self.output_root_dir, new_file_path)) as f:
+            return f.read()
+
+    def test_write_skips_unchanged_contract(self):
+        file_paths = ['token/token.py', 'token/package.json', 'utility/utils.py']
+        self.writer.write([self._create_contract(file_paths)])
+        self.assertEqual(['token'], self.writer.written_contracts)
+        self.assertEqual('def require(): pass\n', self._read_output('token/utility/utils.py'))
+
+        self.writer.write([self._create_contract(file_paths)])
+        self.assertEqual([], self.writer.written_contracts)
+        self.assertEqual(['token'], self.writer.skipped_contracts)
+
+    def test_write_rebuilds_changed_contract(self):
+        file_paths = ['token/token.py', 'token/package.json', 'utility/utils.py']
+        self.writer.write([self._create_contract(file_paths)])
+
+        self._write_source('utility/utils.py', 'def require(condition): pass\n')
+        self.writer.write([self._create_contract(file_paths)])
+        self.assertEqual(['token'], self.writer.written_contracts)
+        self.assertEqual('def require(condition): pass\n', self._read_output('token/utility/utils.py'))
+
+    def test_write_regenerates_deleted_and_edited_outputs(self):
+        file_paths = ['token/token.py', 'token/package.json', 'utility/utils.py']
+        self.writer.write([self._create_contract(file_paths)])
+
+        # the sources are unchanged, but the outputs are not
+        remove(path.join(self.output_root_dir, 'token/token.py'))
+        with open(path.join(self.output_root_dir, 'token/utility/utils.py'), 'w') as f:
+            f.write('edited\n')
+
+        self.writer.write([self._create_contract(file_paths)])
+        self.assertEqual(['token'], self.writer.written_contracts)
+        self.assertEqual('class Token: pass\n', self._read_output('token/token.py'))
+        self.assertEqual('def require(): pass\n', self._read_output('token/utility/utils.py'))
+
+    def test_write_removes_stale_files(self):
+        self.writer.write([self._create_contract(['token/token.py', 'token/package.json', 'utility/utils.py'])])
+
+        self.writer.write([self._create_contract(['token/token.py', 'token/package.json'])])
+        self.assertEqual(['token'], self.writer.written_contracts)
+        self.assertFalse(path.exists(path.join(self.output_root_dir, 'token/utility/utils.py')))
+        # the directory left empty is removed as well
+        self.assertFalse(path.exists(path.join(self.output_root_dir, 'token/utility')))
+        self.assertTrue(path.isfile(path.join(self.output_root_dir, 'token/token.py')))
+
+
+class TestPackageWriter(unittest.TestCase):
+
+    @staticmethod
+    def _build_packages(output_root_dir: str, jobs: int) -> dict:
+        write_packages_to_file_system(output_root_dir, [], jobs)
+        packages = {}
+        for file_name in sorted(listdir(output_root_dir)):
+            with open(path.join(output_root_dir, file_name), 'rb') as f:
+                packages[file_name] = f.read()
+        return packages
+
+    def test_zip_build_is_reproducible(self):
+        with TemporaryDirectory() as temp_dir:
+            packages = self._build_packages(path.join(temp_dir, 'first'), 1)
+            self.assertEqual(sorted(name + '.zip' for name in config), sorted(packages))
+
+            # the same bytes with a single worker and with parallel workers
+            self.assertEqual(packages, self._build_packages(path.join(temp_dir, 'second'), 1))
+            self.assertEqual(packages, self._build_packages(path.join(temp_dir, 'parallel'), 4))
+
+    def test_package_writer_processes(self):
+        contract_list = Builder(CONTRACTS_PATH).contract_list
+        thread_writer = PackageWriter(max_workers=4)
+        thread_writer.write(contract_list)
+        process_writer = PackageWriter(max_workers=2, use_processes=True)
+        process_writer.write(contract_list)
+
+        self.assertEqual(thread_writer.packages, process_writer.packages)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+from timeit import repeat
+from unittest.mock import Mock
+
+from iconservice import Address, IconScoreDatabase
+from iconservice.database.db import ContextDatabase
+
+from contracts.converter.converter import Converter
+from contracts.network.network import Network
+from tests import ScorePatcher, create_db
+
+NUMBER = 20
+REPEAT = 5
+
+
+def create_mock_db(address: Address) -> IconScoreDatabase:
+    """Creates the memory db on a Mock of ContextDatabase, as `create_db` did before, for comparison"""
+    memory_db = {}
+    context_db = Mock(spec=ContextDatabase)
+    context_db.get = lambda context, key: memory_db.get(key)
+    context_db.put = lambda context, key, value: memory_db.__setitem__(key, value)
+    context_db.delete = lambda context, key: memory_db.__delitem__(key)
+    return IconScoreDatabase(address, context_db)
+
+
+class TestBenchmarkScorePatcher(unittest.TestCase):
+
+    @staticmethod
+    def _measure(func) -> float:
+        return min(repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+    @staticmethod
+    def _patch_per_test(score_class, address: Address) -> None:
+        """Does what `setUp` and `tearDown` of the unit tests of the SCORE did, patching for every test"""
+        ScorePatcher._plan_cache.pop(score_class, None)
+        patcher = ScorePatcher(score_class)
+        patcher.start()
+        score_class(create_mock_db(address))
+        patcher.stop()
+
+    @staticmethod
+    def _reset_per_test(patcher: ScorePatcher, score_class, address: Address) -> None:
+        """Does what `setUp` of the unit tests of the SCORE does, with the patches started in `setUpClass`"""
+        patcher.reset()
+        score_class(create_db(address))
+
+    def test_benchmark_score_patcher(self):
+        address = Address.from_string("cx" + os.urandom(20).hex())
+        for score_class in [Converter, Network]:
+            plan = ScorePatcher.get_plan(score_class)
+            # the cached plan is the same as the one searched again
+            self.assertEqual(plan, ScorePatcher._create_plan(score_class))
+
+            patched = self._measure(lambda: self._patch_per_test(score_class, address))
+            patcher = ScorePatcher(score_class)
+            patcher.start()
+            try:
+                reset = self._measure(lambda: self._reset_per_test(patcher, score_class, address))
+            finally:
+                patcher.stop()
+
+            print('{0:10s}: {1} patches, setUp and tearDown = {2:7.3f} ms -> {3:7.3f} ms (x{4:.1f})'.format(
+                score_class.__name__, len(plan), patched * 1000, reset * 1000, patched / reset))
+            # resetting the mocks instead of starting and stopping the patches is several times faster
+            self.assertGreater(patched / reset, 3)
@@ -32,9 +32,20 @@ from tests import MultiPatch, patch_property, ScorePatcher, create_db, assert_in
 # noinspection PyUnresolvedReferences
 class TestConverter(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(Converter)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(Converter)
-        self.patcher.start()
+        self.patcher.reset()
+        # block timestamp for the cumulative prices
+        self.now_patcher = patch.object(IconScoreBase, 'now', return_value=1)
+        self.now_patcher.start()
 
         self.score_address = Address.from_string("cx" + os.urandom(20).hex())
         self.score = Converter(create_db(self.score_address))
@@ -61,7 +72,7 @@ class TestConverter(unittest.TestCase):
                              self.score._connectors[self.initial_connector_token].weight.get())
 
     def tearDown(self):
-        self.patcher.stop()
+        self.now_patcher.stop()
 
     def test_tokenFallback_deposit(self):
         # Mocks parent functions
@@ -391,6 +402,7 @@ class TestConverter(unittest.TestCase):
             self.assertEqual(
                 False, self.score._connectors[connector_token].is_virtual_balance_enabled.get())
             self.assertEqual(True, self.score._connectors[connector_token].is_set.get())
+            self.score.ConnectorAdd.assert_called_with(connector_token, connector_weight, False)
 
     def test_updateConnector(self):
         self.score.require_owner_only.reset_mock()
@@ -406,6 +418,7 @@ class TestConverter(unittest.TestCase):
             self.assertEqual(
                 True, self.score._connectors[connector_token].is_virtual_balance_enabled.get())
             self.assertEqual(True, self.score._connectors[connector_token].is_set.get())
+            self.score.ConnectorUpdate.assert_called_with(connector_token, connector_weight, True, 10000)
 
     def test_updateConnector_wrong_max_weight(self):
         self.score.require_owner_only.reset_mock()
@@ -428,8 +441,10 @@ class TestConverter(unittest.TestCase):
 
             connector_token = self.score._connectors[self.initial_connector_token]
             self.assertEqual(False, connector_token.is_purchase_enabled.get())
+            self.score.ConnectorPurchasesDisable.assert_called_with(self.initial_connector_token, True)
             self.score.disableConnectorPurchases(self.initial_connector_token, False)
             self.assertEqual(True, connector_token.is_purchase_enabled.get())
+            self.score.ConnectorPurchasesDisable.assert_called_with(self.initial_connector_token, False)
 
     def test_updateRegistry(self):
         self.score._allow_registry_update.set(True)
@@ -568,6 +583,43 @@ class TestConverter(unittest.TestCase):
         self.assertNotIn('isPurchaseEnabled', result_dict)
         self.assertNotIn('isSet', result_dict)
 
+    def test_cumulative_price(self):
+        connector = self.score._connectors[self.initial_connector_token]
+        weight = self.initial_connector_weight
+
+        # the first conversion only records the timestamp
+        with patch.object(IconScoreBase, 'now', return_value=1000):
+            self.score._update_cumulative_price(connector, 1000, 600, weight, 100, 100)
+            self.assertEqual(1000, connector.cumulative_price.get())
+
+            # the following conversions in the same block are not written
+            with patch.object(connector.cumulative_price, 'set') as set_cumulative_price:
+                self.score._update_cumulative_price(connector, 1100, 700, weight, 100, 100)
+                set_cumulative_price.assert_not_called()
+
+        # the price before the conversion, 500 / 1000 with 50% weight, held for 2000 microseconds
+        price = 1 * self.score._PRICE_PRECISION
+        with patch.object(IconScoreBase, 'now', return_value=3000):
+            self.score._update_cumulative_price(connector, 1100, 600, weight, 100, 100)
+            self.assertEqual(price * 2000 << 64 | 3000, connector.cumulative_price.get())
+
+        # the current price, 600 / 1100 with 50% weight, is extrapolated to the current block
+        current_price = 600 * 2 * self.score._PRICE_PRECISION // 1100
+        self.score.getConnectorBalance = Mock(return_value=600)
+        with MultiPatch([
+            patch.object(IconScoreBase, 'now', return_value=4000),
+            patch.object(InternalCall, 'other_external_call', return_value=1100)
+        ]):
+            result = self.score.getCumulativePrice(self.initial_connector_token)
+            self.assertEqual({
+                'cumulativePrice': price * 2000 + current_price * 1000,
+                'timestamp': 4000,
+                'pricePrecision': self.score._PRICE_PRECISION
+            }, result)
+
+        # failure case: not a connector
+        self.assertRaises(RevertException, self.score.getCumulativePrice, self.token)
+
     def test_getConnectorBalance(self):
         balance = 100
 
@@ -700,3 +752,61 @@ class TestConverter(unittest.TestCase):
                 amount)
             self.assertEqual(980, result['amount'])
             self.assertEqual(20, result['fee'])
+
+    def test_getPurchaseReturn_from_conversion(self):
+        amount = 1000
+        # the actual balance already includes the deposited amount
+        token = Mock(totalSupply=Mock(return_value=50000), balanceOf=Mock(return_value=10000 + amount))
+        connector = self.score._connectors[self.initial_connector_token]
+
+        def assert_connector_balance(connector_balance: int, from_conversion: bool):
+            with MultiPatch([
+                patch_property(IconScoreBase, 'msg', Message(self.owner)),
+                patch.object(Converter, 'create_interface_score', return_value=token),
+                patch.object(FixedMapFormula, 'calculate_purchase_return', return_value=1000)
+            ]):
+                self.score.get_purchase_return(self.initial_connector_token, amount, from_conversion)
+                FixedMapFormula.calculate_purchase_return.assert_called_with(
+                    50000, connector_balance, self.initial_connector_weight, amount)
+
+        # actual balance
+        assert_connector_balance(10000 + amount, False)
+        assert_connector_balance(10000, True)
+
+        # virtual balance, which does not include the deposited amount yet
+        connector.is_virtual_balance_enabled.set(True)
+        connector.virtual_balance.set(20000)
+        assert_connector_balance(20000, False)
+        assert_connector_balance(20000, True)
+
+    def test_getCrossConnectorReturn_from_conversion(self):
+        connector_token2 = Address.from_string("cx" + os.urandom(20).hex())
+        connector_token2_weight = 500000
+        self.score.addConnector(connector_token2, connector_token2_weight, False)
+
+        amount = 1000
+        # the actual balance already includes the deposited amount
+        token = Mock(balanceOf=Mock(return_value=10000 + amount))
+        connector = self.score._connectors[self.initial_connector_token]
+
+        def assert_from_connector_balance(from_connector_balance: int, from_conversion: bool):
+            with MultiPatch([
+                patch_property(IconScoreBase, 'msg', Message(self.owner)),
+                patch.object(Converter, 'create_interface_score', return_value=token),
+                patch.object(FixedMapFormula, 'calculate_cross_connector_return', return_value=1000)
+            ]):
+                self.score.get_cross_connector_return(
+                    self.initial_connector_token, connector_token2, amount, from_conversion)
+                FixedMapFormula.calculate_cross_connector_return.assert_called_with(
+                    from_connector_balance, self.initial_connector_weight,
+                    10000 + amount, connector_token2_weight, amount)
+
+        # actual balance
+        assert_from_connector_balance(10000 + amount, False)
+        assert_from_connector_balance(10000, True)
+
+        # virtual balance, which does not include the deposited amount yet
+        connector.is_virtual_balance_enabled.set(True)
+        connector.virtual_balance.set(20000)
+        assert_from_connector_balance(20000, False)
+        assert_from_connector_balance(20000, True)
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import random
+import unittest
+
+from iconservice import Address
+
+from contracts.converter.converter import Converter
+from contracts.flexible_token.flexible_token import FlexibleToken
+from contracts.irc_token.irc_token import IRCToken
+from contracts.network.network import Network
+from contracts.score_registry.score_registry import ScoreRegistry
+from tests.local_chain import LocalChain
+from tests.seed_runner import get_seeds, run_seeds
+
+# sequences run from every seed and steps per sequence.
+# DEX_SOAK runs random seeds on every CPU, and a failing seed can be replayed with DEX_INVARIANT_SEED
+SEQUENCE_COUNT = 20
+SEQUENCE_LENGTH = 50
+
+TOKEN_COUNT = 4
+DECIMALS = 18
+INITIAL_SUPPLY = 10 ** 9
+INITIAL_CONNECTOR_BALANCE = 10 ** 6 * 10 ** DECIMALS
+MAX_WEIGHT = 1000000
+MAX_RATIO = 1000000
+
+
+class InvariantViolation(AssertionError):
+    """
+    Raised when a step breaks an invariant
+
+    :param invariant: name of the broken invariant, a shrunk sequence has to break the same one
+    """
+
+    def __init__(self, invariant: str, message: str):
+        super().__init__(f'{invariant}: {message}')
+        self.invariant = invariant
+
+
+# noinspection PyPep8Naming
+class ConverterStateMachine:
+    """
+    Converter with a flexible token and IRC tokens deployed on a local chain, where the owner and a trader
+    take steps and the invariants are checked after every step.
+
+    A step is a tuple of its name and arguments. Amounts are the ratio of the trader's balance in ppm,
+    so that a step keeps its meaning when the steps before it are removed on shrinking.
+    """
+
+    def __init__(self, chain: LocalChain):
+        self.chain = chain
+        self.owner = chain.create_account()
+        self.trader = chain.create_account()
+
+        self.registry = chain.deploy(self.owner, ScoreRegistry)
+        self.network = chain.deploy(self.owner, Network)
+        self._transaction(self.owner, self.registry, 'registerAddress',
+                          {'_scoreName': ScoreRegistry.NETWORK, '_scoreAddress': self.network})
+
+        self.tokens = [chain.deploy(self.owner, IRCToken, {
+            '_name': f'Token{i}', '_symbol': f'TK{i}', '_initialSupply': INITIAL_SUPPLY, '_decimals': DECIMALS
+        }) for i in range(TOKEN_COUNT)]
+        self.flexible_token = chain.deploy(self.owner, FlexibleToken, {
+            '_name': 'FlexibleToken', '_symbol': 'FT', '_initialSupply': INITIAL_SUPPLY, '_decimals': DECIMALS
+        })
+        self.converter = chain.deploy(self.owner, Converter, {
+            '_token': self.flexible_token, '_registry': self.registry, '_maxConversionFee': MAX_RATIO,
+            '_connectorToken': self.tokens[0], '_connectorWeight': MAX_WEIGHT // 4
+        })
+        # the other tokens are left to be added by the steps
+        self._transaction(self.owner, self.converter, 'addConnector',
+                          {'_token': self.tokens[1], '_weight': MAX_WEIGHT // 4, '_enableVirtualBalance': False})
+        for token in self.tokens[:2]:
+            self._transaction(self.owner, token, 'transfer', {'_to': self.converter, '_value': INITIAL_CONNECTOR_BALANCE})
+        for token in self.tokens:
+            self._transaction(self.owner, token, 'transfer',
+                              {'_to': self.trader, '_value': INITIAL_SUPPLY * 10 ** DECIMALS // 2})
+        self._activate()
+
+        self.holders = [self.owner, self.trader, self.registry, self.network, self.converter, self.flexible_token]
+        self.check_invariants()
+
+    def _transaction(self, from_: Address, to: Address, method: str, params: dict = None) -> bool:
+        try:
+            return self.chain.transaction(from_, to, method, params).status
+        except Exception as e:
+            # a failure other than a revert is a bug of the SCOREs
+            raise InvariantViolation('revert only', f'{method} failed with {e!r}')
+
+    def _query(self, to: Address, method: str, params: dict = None):
+        return self.chain.query(to, method, params)
+
+    def _activate(self) -> None:
+        self._transaction(self.owner, self.flexible_token, 'transferOwnerShip', {'_newOwner': self.converter})
+        self._transaction(self.owner, self.converter, 'acceptTokenOwnership')
+
+    def _deactivate(self) -> None:
+        self._transaction(self.owner, self.converter, 'transferTokenOwnership', {'_newOwner': self.owner})
+        self._transaction(self.owner, self.flexible_token, 'acceptOwnerShip')
+
+    def _get_connectors(self) -> list:
+        count = self._query(self.converter, 'getConnectorTokenCount')
+        return [self._query(self.converter, 'getConnectorAt', {'_index': i}) for i in range(count)]
+
+    def _get_trader_amount(self, token: Address, ratio: int) -> int:
+        balance = self._query(token, 'balanceOf', {'_owner': self.trader})
+        return max(1, balance * ratio // MAX_RATIO)
+
+    def _convert(self, from_token: Address, to_token: Address, amount: int) -> bool:
+        path = [from_token, self.flexible_token, to_token]
+        data = json.dumps({'path': ','.join(str(address) for address in path), 'minReturn': 1})
+        return self._transaction(self.trader, from_token, 'transfer',
+                                 {'_to': self.network, '_value': amount, '_data': data.encode()})
+
+    def run(self, step: tuple) -> None:
+        """
+        Takes a step, moving to the next block before it
+
+        :param step: tuple of the step name and its arguments
+        """
+        self.chain.next_block()
+        name, args = step[0], step[1:]
+        getattr(self, 'step_' + name)(*args)
+
+    def step_addConnector(self, token_index: int, weight: int, virtual: bool, deposit_ratio: int):
+        token = self.tokens[token_index]
+        self._deactivate()
+        if self._transaction(self.owner, self.converter, 'addConnector',
+                             {'_token': token, '_weight': weight, '_enableVirtualBalance': virtual}):
+            deposit = INITIAL_CONNECTOR_BALANCE * deposit_ratio // MAX_RATIO + 1
+            self._transaction(self.owner, token, 'transfer', {'_to': self.converter, '_value': deposit})
+            if virtual:
+                connector = self._query(self.converter, 'getConnector', {'_address': token})
+                self._transaction(self.owner, self.converter, 'updateConnector', {
+                    '_connectorToken': token, '_weight': connector['weight'],
+                    '_enableVirtualBalance': True, '_virtualBalance': deposit
+                })
+        self._activate()
+
+    def step_updateConnector(self, token_index: int, weight: int, virtual: bool, virtual_balance_ratio: int):
+        token = self.tokens[token_index]
+        balance = self._query(token, 'balanceOf', {'_owner': self.converter})
+        self._transaction(self.owner, self.converter, 'updateConnector', {
+            '_connectorToken': token, '_weight': weight, '_enableVirtualBalance': virtual,
+            '_virtualBalance': balance * virtual_balance_ratio // MAX_RATIO
+        })
+
+    def step_setConversionFee(self, fee: int):
+        self._transaction(self.owner, self.converter, 'setConversionFee', {'_conversionFee': fee})
+
+    def step_buy(self, token_index: int, ratio: int):
+        token = self.tokens[token_index]
+        self._convert(token, self.flexible_token, self._get_trader_amount(token, ratio))
+
+    def step_sell(self, token_index: int, ratio: int):
+        amount = self._get_trader_amount(self.flexible_token, ratio)
+        self._convert(self.flexible_token, self.tokens[token_index], amount)
+
+    def step_convert(self, from_index: int, to_index: int, ratio: int):
+        from_token = self.tokens[from_index]
+        self._convert(from_token, self.tokens[to_index], self._get_trader_amount(from_token, ratio))
+
+    def step_roundTrip(self, from_index: int, to_index: int, ratio: int):
+        """
+        Converts from a token and back to it, to the flexible token and back if they are the same connector
+        """
+        from_token = self.tokens[from_index]
+        to_token = self.tokens[to_index] if from_index != to_index else self.flexible_token
+        from_balance = self._query(from_token, 'balanceOf', {'_owner': self.trader})
+        to_balance = self._query(to_token, 'balanceOf', {'_owner': self.trader})
+
+        if not self._convert(from_token, to_token, self._get_trader_amount(from_token, ratio)):
+            return
+        returned = self._query(to_token, 'balanceOf', {'_owner': self.trader}) - to_balance
+        if not self._convert(to_token, from_token, returned):
+            return
+
+        new_from_balance = self._query(from_token, 'balanceOf', {'_owner': self.trader})
+        if new_from_balance > from_balance:
+            raise InvariantViolation(
+                'no free value', f'round trip gained {new_from_balance - from_balance} of {from_balance}')
+
+    def check_invariants(self) -> None:
+        """
+        Checks the invariants over the converter and the tokens
+        """
+        token_supply = self._query(self.flexible_token, 'totalSupply')
+        for token in self.tokens + [self.flexible_token]:
+            balances = sum(self._query(token, 'balanceOf', {'_owner': holder}) for holder in self.holders)
+            total_supply = self._query(token, 'totalSupply')
+            if balances != total_supply:
+                raise InvariantViolation('supply and balance', f'{token}: {balances} != {total_supply}')
+            if self._query(token, 'balanceOf', {'_owner': self.network}) != 0:
+                raise InvariantViolation('supply and balance', f'network keeps {token}')
+
+        total_weight = 0
+        for token in self._get_connectors():
+            connector = self._query(self.converter, 'getConnector', {'_address': token})
+            total_weight += connector['weight']
+            if connector['virtualBalance'] < 0:
+                raise InvariantViolation('virtual balance', f'{token}: {connector["virtualBalance"]}')
+
+            balance = self._query(self.converter, 'getConnectorBalance', {'_connectorToken': token})
+            if balance == 0 and token_supply > 0 and not connector['isVirtualBalanceEnabled']:
+                raise InvariantViolation('supply and balance', f'{token} is depleted with supply {token_supply}')
+
+        if total_weight > MAX_WEIGHT or total_weight != self.chain.get_score(self.converter)._total_connector_weight.get():
+            raise InvariantViolation('supply and balance', f'total connector weight {total_weight}')
+
+
+def generate_step(rng: random.Random) -> tuple:
+    """
+    Generates a random step of `ConverterStateMachine`
+
+    :param rng: random generator
+    :return: step
+    """
+    ratio = rng.choice([1, MAX_RATIO, rng.randrange(1, MAX_RATIO)])
+    weight = rng.choice([1, MAX_WEIGHT, rng.randrange(1, MAX_WEIGHT)])
+    token_index = rng.randrange(TOKEN_COUNT)
+    to_index = rng.randrange(TOKEN_COUNT)
+    virtual = rng.random() < 0.3
+    return rng.choice([
+        ('addConnector', token_index, weight // TOKEN_COUNT or 1, virtual, rng.randrange(MAX_RATIO)),
+        ('updateConnector', token_index, weight // TOKEN_COUNT or 1, virtual, rng.randrange(MAX_RATIO * 2)),
+        ('setConversionFee', rng.choice([0, 1000, 3000, rng.randrange(MAX_RATIO // 10)])),
+        ('buy', token_index, ratio),
+        ('buy', token_index, ratio),
+        ('sell', token_index, ratio),
+        ('sell', token_index, ratio),
+        ('convert', token_index, to_index, ratio),
+        ('roundTrip', token_index, to_index, ratio),
+    ])
+
+
+def run_steps(steps: list):
+    """
+    Runs the steps on a new chain
+
+    :param steps: steps to run
+    :return: (index of the failing step, InvariantViolation) or None if every invariant holds
+    """
+    with LocalChain() as chain:
+        state_machine = ConverterStateMachine(chain)
+        for i, step in enumerate(steps):
+            try:
+                state_machine.run(step)
+                state_machine.check_invariants()
+            except InvariantViolation as e:
+                return i, e
+    return None
+
+
+def shrink(steps: list, invariant: str) -> list:
+    """
+    Minimizes the failing steps while they break the same invariant,
+    by removing steps and then by lowering their numeric arguments
+
+    :param steps: failing steps
+    :param invariant: name of the broken invariant
+    :return: minimized steps
+    """
+    def fails(candidate: list) -> bool:
+        failure = run_steps(candidate)
+        return failure is not None and failure[1].invariant == invariant
+
+    chunk_size = len(steps) // 2
+    while chunk_size > 0:
+        i = 0
+        while i < len(steps):
+            candidate = steps[:i] + steps[i + chunk_size:]
+            if candidate and fails(candidate):
+                steps = candidate
+            else:
+                i += chunk_size
+        chunk_size //= 2
+
+    for i, step in enumerate(steps):
+        for j, value in enumerate(step):
+            if type(value) is not int:
+                continue
+            for smaller in (0, 1, value // 2):
+                if smaller >= value:
+                    continue
+                candidate = steps[:i] + [step[:j] + (smaller,) + step[j + 1:]] + steps[i + 1:]
+                if fails(candidate):
+                    steps = candidate
+                    step = candidate[i]
+                    break
+    return steps
+
+
+def check_seed(seed: int):
+    """
+    Runs random sequences of steps from the seed, shrinking the first failing one
+
+    :param seed: random seed
+    :return: None if every invariant holds, otherwise (seed, shrunk steps, failure message)
+    """
+    rng = random.Random(seed)
+    for _ in range(SEQUENCE_COUNT):
+        steps = [generate_step(rng) for _ in range(SEQUENCE_LENGTH)]
+        failure = run_steps(steps)
+        if failure is not None:
+            index, error = failure
+            shrunk = shrink(steps[:index + 1], error.invariant)
+            return seed, shrunk, str(run_steps(shrunk)[1])
+    return None
+
+
+class TestConverterInvariants(unittest.TestCase):
+
+    def test_virtual_balance_round_trip(self):
+        # the deposit used to be taken out of the virtual balance, which did not include it yet
+        steps = [('addConnector', 3, 1, True, 286894), ('roundTrip', 3, 0, 1)]
+        self.assertIsNone(run_steps(steps))
+
+    def test_converter_invariants(self):
+        seeds = get_seeds('DEX_INVARIANT_SEED')
+        failures = [failure for failure in run_seeds(check_seed, seeds) if failure is not None]
+
+        for seed, steps, message in failures:
+            print('seed = {}, {}'.format(seed, message))
+            for step in steps:
+                print('    {}'.format(step))
+        if failures:
+            self.fail("TEST FAILED: {} of {} seeds broke the invariants".format(len(failures), len(seeds)))
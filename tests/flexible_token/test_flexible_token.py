@@ -29,9 +29,20 @@ from tests import patch_property, ScorePatcher, create_db
 # noinspection PyUnresolvedReferences
 class TestFlexibleToken(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(FlexibleToken)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(FlexibleToken)
-        self.patcher.start()
+        self.patcher.reset()
+        # balances and the total supply are checkpointed at the current block height
+        self.block_height_patcher = patch_property(IconScoreBase, 'block_height', 1)
+        self.block_height_patcher.start()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.flexible_token = FlexibleToken(create_db(self.score_address))
@@ -45,14 +56,15 @@ class TestFlexibleToken(unittest.TestCase):
         with patch_property(IconScoreBase, 'msg', Message(self.token_owner)):
             self.flexible_token.on_install(token_name, token_symbol, token_supply, token_decimals)
 
-            IRCToken.on_install.assert_called_with(self.flexible_token, token_name, token_symbol, token_supply, token_decimals)
+            IRCToken.on_install.assert_called_with(
+                self.flexible_token, token_name, token_symbol, token_supply, token_decimals, False)
             TokenHolder.on_install.assert_called_with(self.flexible_token)
             self.assertEqual(self.flexible_token._VERSION, self.flexible_token._version.get())
             self.assertEqual(True, self.flexible_token._transfer_possibility.get())
             self.flexible_token.NewFlexibleToken.assert_called_with(self.score_address)
 
     def tearDown(self):
-        self.patcher.stop()
+        self.block_height_patcher.stop()
 
     def test_check_transfer_possibility(self):
         self.flexible_token._transfer_possibility.set(True)
@@ -167,3 +179,80 @@ class TestFlexibleToken(unittest.TestCase):
 
         self.flexible_token.transfer(token_receiver, 10)
         IRCToken.transfer.assert_called_with(self.flexible_token, token_receiver, 10, None)
+
+    def test_transferBatch(self):
+        sender = Address.from_string("hx" + "2" * 40)
+        token_receivers = f'{Address.from_string("hx" + "3" * 40)},{Address.from_string("hx" + "4" * 40)}'
+
+        # failure case: transfer tokens when transfer possibility is False
+        with patch_property(IconScoreBase, 'msg', Message(sender)):
+            self.flexible_token._transfer_possibility.set(False)
+            self.assertRaises(RevertException, self.flexible_token.transferBatch, token_receivers, "10,20")
+            IRCToken.transferBatch.assert_not_called()
+
+        # success case: transfer tokens when transfer possibility is True
+        self.flexible_token._transfer_possibility.set(True)
+
+        self.flexible_token.transferBatch(token_receivers, "10,20")
+        IRCToken.transferBatch.assert_called_with(self.flexible_token, token_receivers, "10,20", None)
+
+    def test_balanceOfAt(self):
+        token_holder = Address.from_string("hx" + "3" * 40)
+        token_receiver = Address.from_string("hx" + "4" * 40)
+        self.flexible_token._owner.set(self.token_owner)
+
+        with patch_property(IconScoreBase, 'msg', Message(self.token_owner)):
+            with patch_property(IconScoreBase, 'block_height', 10):
+                self.flexible_token.issue(token_holder, 100)
+                # the checkpoint of the same block is overwritten
+                self.flexible_token.issue(token_holder, 50)
+            with patch_property(IconScoreBase, 'block_height', 20):
+                self.flexible_token._token_storage.transfer(token_holder, token_receiver, 30)
+            with patch_property(IconScoreBase, 'block_height', 30):
+                self.flexible_token.destroy(token_holder, 120)
+
+        self.assertEqual(3, len(self.flexible_token._token_storage.get_balance_checkpoints(token_holder)))
+        self.assertEqual(2, len(self.flexible_token._token_storage.get_total_supply_checkpoints()))
+
+        with patch_property(IconScoreBase, 'block_height', 40):
+            expected = [(9, 0, 0, 0), (10, 150, 0, 150), (19, 150, 0, 150),
+                        (20, 120, 30, 150), (30, 0, 30, 30), (40, 0, 30, 30)]
+            for height, holder_balance, receiver_balance, total_supply in expected:
+                self.assertEqual(holder_balance, self.flexible_token.balanceOfAt(token_holder, height))
+                self.assertEqual(receiver_balance, self.flexible_token.balanceOfAt(token_receiver, height))
+                self.assertEqual(total_supply, self.flexible_token.totalSupplyAt(height))
+
+            # failure case: the block height is in the future or negative
+            self.assertRaises(RevertException, self.flexible_token.balanceOfAt, token_holder, 41)
+            self.assertRaises(RevertException, self.flexible_token.totalSupplyAt, -1)
+
+    def test_balanceOfAt_after_update(self):
+        token_holder = Address.from_string("hx" + "3" * 40)
+        token_receiver = Address.from_string("hx" + "4" * 40)
+
+        # a token deployed without the checkpoints
+        flexible_token = FlexibleToken(create_db(Address.from_string("cx" + "5" * 40)))
+        flexible_token._owner.set(self.token_owner)
+        flexible_token._balances[token_holder] = 100
+        flexible_token._total_supply.set(100)
+
+        with patch_property(IconScoreBase, 'block_height', 50):
+            flexible_token.on_update()
+            self.assertEqual(50, flexible_token.getCheckpointStartHeight())
+            # holders whose balance has not changed since the update keep their balance
+            self.assertEqual(100, flexible_token.balanceOfAt(token_holder, 50))
+            self.assertEqual(100, flexible_token.totalSupplyAt(50))
+            # failure case: the block height is before the checkpoints
+            self.assertRaises(RevertException, flexible_token.balanceOfAt, token_holder, 49)
+
+        with patch_property(IconScoreBase, 'block_height', 60):
+            flexible_token._token_storage.transfer(token_holder, token_receiver, 30)
+            # another update does not move the start height
+            flexible_token.on_update()
+            self.assertEqual(50, flexible_token.getCheckpointStartHeight())
+
+        with patch_property(IconScoreBase, 'block_height', 70):
+            self.assertEqual(100, flexible_token.balanceOfAt(token_holder, 59))
+            self.assertEqual(70, flexible_token.balanceOfAt(token_holder, 60))
+            self.assertEqual(0, flexible_token.balanceOfAt(token_receiver, 59))
+            self.assertEqual(30, flexible_token.balanceOfAt(token_receiver, 70))
@@ -28,9 +28,17 @@ from tests import patch_property, ScorePatcher, create_db
 # noinspection PyUnresolvedReferences
 class TestIcxToken(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(IcxToken)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(IcxToken)
-        self.patcher.start()
+        self.patcher.reset()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.icx_token = IcxToken(create_db(self.score_address))
@@ -41,9 +49,6 @@ class TestIcxToken(unittest.TestCase):
             IRCToken.on_install.assert_called_with(self.icx_token, 'icx_token', 'ICX', 0, 18)
             TokenHolder.on_install.assert_called_with(self.icx_token)
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_deposit(self):
         value = 10
 
@@ -91,3 +96,16 @@ class TestIcxToken(unittest.TestCase):
 
         IRCToken.transfer.assert_called_with(self.icx_token, token_receiver, 10, None)
 
+
+    def test_transferBatch(self):
+        token_receiver = Address.from_string("hx" + "4" * 40)
+
+        # failure case: transfer token to this score (should raise error)
+        batch = {token_receiver: 10, self.score_address: 10}
+        self.assertRaises(RevertException, self.icx_token._transfer_batch, self.token_owner, batch, b'None')
+        IRCToken._transfer_batch.assert_not_called()
+
+        # success case: send 10 token to other
+        batch = {token_receiver: 10}
+        self.icx_token._transfer_batch(self.token_owner, batch, b'None')
+        IRCToken._transfer_batch.assert_called_with(self.icx_token, self.token_owner, batch, b'None')
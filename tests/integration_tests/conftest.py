@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from tests.integration_tests.integrate_test_base import get_worker_id, get_worker_dir, clear_worker_dir
+
+try:
+    import xdist
+except ImportError:
+    # pytest-xdist provides the fixture, which is given here for the runs without it
+    @pytest.fixture(scope='session')
+    def worker_id() -> str:
+        return get_worker_id()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def worker_dir(worker_id: str) -> str:
+    """The state directory of the worker, where the standard SCOREs are deployed once per worker.
+    It is removed at the end of the session.
+    """
+    yield get_worker_dir()
+    clear_worker_dir()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import errno
+from collections import namedtuple
+from copy import copy
+from os import path, environ, getpid, link, walk, makedirs, remove
+from shutil import copy2, rmtree
+
+from iconcommons import IconConfig
+from iconservice.icon_config import default_icon_config
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_service_engine import IconServiceEngine
+from tbears.libs.icon_integrate_test import IconIntegrateTestBase, root_clear
+
+from tests.integration_tests.utils import ROOT_PATH, get_content_as_bytes, deploy_score_bulk, update_governance
+
+try:
+    from fcntl import ioctl
+except ImportError:
+    ioctl = None
+
+# States of the tests are kept under the directory, which can be changed by the environment variable
+# `DEX_TEST_STATE_DIR`. Each worker process has its own directory in it.
+TEST_STATE_DIR = environ.get('DEX_TEST_STATE_DIR', path.join(ROOT_PATH, 'build', '.test_state'))
+
+# SCOREs deployed by `_test1` on top of the latest governance SCORE, which test classes can start from
+STANDARD_SCORE_NAMES = ['score_registry', 'network', 'icx_token']
+STANDARD_SCORES_KEY = 'standard_scores'
+
+# ioctl request cloning a file on copy-on-write file systems of Linux, such as btrfs and xfs
+FICLONE = 0x40049409
+
+# LevelDB never modifies its table files once written, so a snapshot and its clones can share them
+IMMUTABLE_DB_FILE_EXTENSIONS = ('.ldb', '.sst')
+
+Snapshot = namedtuple('Snapshot', 'score_root_path state_db_root_path block_height prev_block_hash attributes')
+
+# snapshot key -> snapshot taken by the process
+_snapshots = {}
+# whether the file system of the state directory supports cloning, None if unknown yet
+_is_reflink_supported = None
+
+
+def get_worker_id() -> str:
+    """Returns the id of the pytest-xdist worker running the tests, 'master' if they are not distributed
+
+    :return: worker id
+    """
+    return environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+def get_worker_dir() -> str:
+    """Returns the state directory of the worker process.
+    The process id keeps the directories of concurrent test runs in the same tree apart.
+
+    :return: worker directory
+    """
+    return path.join(TEST_STATE_DIR, '{0}-{1}'.format(get_worker_id(), getpid()))
+
+
+def get_snapshot(key: str) -> Snapshot:
+    """Returns the snapshot taken by the process
+
+    :param key: snapshot key, the qualified name of the test class or `STANDARD_SCORES_KEY`
+    :return: snapshot, None if it has not been taken yet
+    """
+    return _snapshots.get(key)
+
+
+def clear_worker_dir() -> None:
+    """Removes the state directory of the worker process including the snapshots
+
+    :return: None
+    """
+    _snapshots.clear()
+    rmtree(get_worker_dir(), ignore_errors=True)
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Clones the file sharing its blocks until either is modified, if the file system supports it"""
+    global _is_reflink_supported
+    if ioctl is None or _is_reflink_supported is False:
+        return False
+
+    try:
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    except OSError as e:
+        if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+            raise
+        _is_reflink_supported = False
+        remove(dst)
+        return False
+
+    _is_reflink_supported = True
+    return True
+
+
+def clone_tree(src: str, dst: str, is_immutable: callable = None) -> None:
+    """Copies the directory as cheaply as the file system allows.
+    Files are cloned on copy-on-write file systems. Otherwise, immutable files are hard linked
+    and the others are copied.
+
+    :param src: source directory
+    :param dst: destination directory, which must not exist
+    :param is_immutable: function telling whether the file of the path is never modified in place,
+        None if no file is
+    :return: None
+    """
+    for dir_path, dirs, files in walk(src):
+        dst_dir_path = path.join(dst, path.relpath(dir_path, src))
+        makedirs(dst_dir_path)
+        for filename in files:
+            src_file_path = path.join(dir_path, filename)
+            dst_file_path = path.join(dst_dir_path, filename)
+            if _reflink(src_file_path, dst_file_path):
+                continue
+            if is_immutable is not None and is_immutable(src_file_path):
+                try:
+                    link(src_file_path, dst_file_path)
+                    continue
+                except OSError:
+                    pass
+            copy2(src_file_path, dst_file_path)
+
+
+def _is_immutable_db_file(file_path: str) -> bool:
+    return file_path.endswith(IMMUTABLE_DB_FILE_EXTENSIONS)
+
+
+def _is_immutable_score_file(file_path: str) -> bool:
+    # deployed SCORE files are only ever added, as updates are deployed to new directories
+    return True
+
+
+class IntegrateTestBase(IconIntegrateTestBase):
+    """
+    IconIntegrateTestBase of which state DB and SCOREs are stored in the directories of its own,
+    so that test classes can run in parallel processes, e.g. `pytest -n auto` with pytest-xdist.
+
+    A class overriding `setUpState` has the state set up by it, including the attributes set on the test,
+    snapshotted once per worker process. Every test restores the snapshot by cloning its directories.
+
+    A class setting `USE_STANDARD_SCORES` starts from the standard SCOREs instead of the genesis,
+    which are deployed once per worker process as well.
+    Their addresses are given by `standard_scores` as a dict keyed by the SCORE name.
+    """
+
+    USE_STANDARD_SCORES = False
+
+    # attributes of the engine, which are not restored as attributes set by `setUpState`
+    _ENGINE_ATTRIBUTES = {'icon_service_engine', '_block_height', '_prev_block_hash'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        class_dir = path.join(get_worker_dir(), cls.__qualname__)
+        cls._score_root_path = path.join(class_dir, 'score')
+        cls._state_db_root_path = path.join(class_dir, 'statedb')
+
+    @classmethod
+    def tearDownClass(cls):
+        rmtree(path.dirname(cls._score_root_path), ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self, genesis_accounts: list = None):
+        if type(self).setUpState is IntegrateTestBase.setUpState:
+            self.setUpGenesis(genesis_accounts)
+            return
+
+        assert not genesis_accounts, "genesis accounts of a snapshotted state are given to `setUpGenesis`"
+        self._set_up_snapshot(type(self).__qualname__, self.setUpState)
+
+    def setUpState(self) -> None:
+        """Sets up the state every test of the class starts from, beginning with `setUpGenesis`.
+        It is called once per worker process.
+
+        :return: None
+        """
+        pass
+
+    def setUpGenesis(self, genesis_accounts: list = None) -> None:
+        """Opens the engine on the genesis or on the standard SCOREs if the class uses them
+
+        :param genesis_accounts: additional genesis accounts, which the standard SCOREs can't have
+        :return: None
+        """
+        if not self.USE_STANDARD_SCORES:
+            super().setUp(genesis_accounts)
+            return
+
+        assert not genesis_accounts, "standard SCOREs are deployed on the default genesis"
+        self._set_up_snapshot(STANDARD_SCORES_KEY, self._deploy_standard_scores)
+
+    def _set_up_snapshot(self, key: str, set_up: callable) -> None:
+        """Restores the snapshot of the key, setting it up and taking it first if it has not been taken"""
+        snapshot = get_snapshot(key)
+        if snapshot is not None:
+            self._restore(snapshot)
+            return
+
+        attribute_names = set(vars(self))
+        set_up()
+        attributes = {name: value for name, value in vars(self).items()
+                      if name not in attribute_names and name not in self._ENGINE_ATTRIBUTES}
+        _snapshots[key] = self._take_snapshot(key, attributes)
+
+    def _open_engine(self) -> None:
+        """Opens the engine on the state in the directories of the test class"""
+        config = IconConfig("", default_icon_config)
+        config.load()
+        config.update_conf({ConfigKey.BUILTIN_SCORE_OWNER: self._test1.get_address()})
+        config.update_conf({ConfigKey.SCORE_ROOT_PATH: self._score_root_path,
+                            ConfigKey.STATE_DB_ROOT_PATH: self._state_db_root_path})
+        config.update_conf(self._make_init_config())
+        self.icon_service_engine = IconServiceEngine()
+        self.icon_service_engine.open(config)
+
+    def _take_snapshot(self, key: str, attributes: dict) -> Snapshot:
+        snapshot_dir = path.join(get_worker_dir(), 'snapshots', key)
+        snapshot = Snapshot(path.join(snapshot_dir, 'score'), path.join(snapshot_dir, 'statedb'),
+                            self._block_height, self._prev_block_hash, attributes)
+
+        # the state DB is copied while the engine is closed not to copy it in the middle of a write
+        self.icon_service_engine.close()
+        rmtree(snapshot_dir, ignore_errors=True)
+        clone_tree(self._score_root_path, snapshot.score_root_path, _is_immutable_score_file)
+        clone_tree(self._state_db_root_path, snapshot.state_db_root_path, _is_immutable_db_file)
+        self._open_engine()
+
+        return snapshot
+
+    def _restore(self, snapshot: Snapshot) -> None:
+        root_clear(self._score_root_path, self._state_db_root_path)
+        clone_tree(snapshot.score_root_path, self._score_root_path, _is_immutable_score_file)
+        clone_tree(snapshot.state_db_root_path, self._state_db_root_path, _is_immutable_db_file)
+
+        self._block_height = snapshot.block_height
+        self._prev_block_hash = snapshot.prev_block_hash
+        self._open_engine()
+
+        # containers are copied so that a test modifying them does not affect the others
+        for name, value in snapshot.attributes.items():
+            setattr(self, name, copy(value) if isinstance(value, (list, dict, set)) else value)
+
+    def _deploy_standard_scores(self) -> None:
+        super().setUp()
+        update_governance(icon_integrate_test_base=self, from_=self._test1, params={})
+        tx_results = deploy_score_bulk(self, [
+            {'content_as_bytes': get_content_as_bytes(score_name), 'from_': self._test1, 'params': {}}
+            for score_name in STANDARD_SCORE_NAMES
+        ])
+        self.standard_scores = {score_name: tx_result['scoreAddress']
+                                for score_name, tx_result in zip(STANDARD_SCORE_NAMES, tx_results)}
@@ -16,34 +16,56 @@
 
 from iconsdk.wallet.wallet import KeyWallet
 from iconservice import Address, ZERO_SCORE_ADDRESS
-from tbears.libs.icon_integrate_test import IconIntegrateTestBase, Account
+from tbears.libs.icon_integrate_test import Account
 
 from contracts.interfaces.abc_score_registry import ABCScoreRegistry
+from tests.integration_tests.integrate_test_base import IntegrateTestBase
 from tests.integration_tests.utils import deploy_score, get_content_as_bytes, transaction_call, \
-    icx_call, update_governance
+    icx_call, update_governance, deploy_score_bulk, transaction_call_bulk
 
 
-class TestConverter(IconIntegrateTestBase):
+class TestConverter(IntegrateTestBase):
 
-    def setUp(self, **kwargs):
+    def setUpState(self):
         # noinspection PyUnusedLocal
         self.keys = [KeyWallet.create() for i in range(10)]
         accounts = [Account(key.address, Address.from_string(key.address), 10000 * 10 ** 18) for key
                     in self.keys]
-        super().setUp(accounts)
+        self.setUpGenesis(accounts)
 
         # Update governance
         update_governance(icon_integrate_test_base=super(), from_=self._test1, params={})
 
-        self.network_address = self.setup_network()
-
-        self.registry_address = self.setup_registry(self.network_address)
-
-        self.token_address = self.setup_flexible_token('Token1', 'TKN1', 2, 18)
+        # deploys the SCOREs in a single block
+        tx_results = deploy_score_bulk(self, [
+            {'content_as_bytes': get_content_as_bytes("network"), 'from_': self.keys[0], 'params': {}},
+            {'content_as_bytes': get_content_as_bytes("score_registry"), 'from_': self.keys[0], 'params': {}},
+            self._get_token_deployment("flexible_token", 'Token1', 'TKN1', 2, 18),
+            self._get_token_deployment("irc_token", 'IRC Token 1', 'IRC1', 1000000000, 18),
+            self._get_token_deployment("irc_token", 'IRC Token 2', 'IRC2', 2000000000, 18),
+            self._get_token_deployment("irc_token", 'IRC Token 3', 'IRC3', 1500000000, 18)
+        ])
+        self.network_address, self.registry_address, self.token_address, self.connector_token1_address, \
+            self.connector_token2_address, self.connector_token3_address = \
+            [tx_result['scoreAddress'] for tx_result in tx_results]
+
+        transaction_call(self, self.keys[0], self.registry_address, 'registerAddress',
+                         {
+                             '_scoreName': ABCScoreRegistry.NETWORK,
+                             '_scoreAddress': self.network_address
+                         })
 
-        self.connector_token1_address = self.setup_irc_token('IRC Token 1', 'IRC1', 1000000000, 18)
-        self.connector_token2_address = self.setup_irc_token('IRC Token 2', 'IRC2', 2000000000, 18)
-        self.connector_token3_address = self.setup_irc_token('IRC Token 3', 'IRC3', 1500000000, 18)
+    def _get_token_deployment(self, score_name: str, name: str, symbol: str, initial_supply: int, decimals: int):
+        return {
+            'content_as_bytes': get_content_as_bytes(score_name),
+            'from_': self.keys[0],
+            'params': {
+                '_name': name,
+                '_symbol': symbol,
+                '_initialSupply': initial_supply,
+                '_decimals': decimals
+            }
+        }
 
     def setup_registry(self, network_address):
         tx_result = deploy_score(self, get_content_as_bytes("score_registry"), self.keys[0],
@@ -118,27 +140,40 @@ class TestConverter(IconIntegrateTestBase):
             250000
         )
 
-        transaction_call(self, self.keys[0], converter_address, 'addConnector',
-                         {
-                             '_token': self.connector_token2_address,
-                             '_weight': 150000,
-                             '_enableVirtualBalance': 0
-                         })
-
-        transaction_call(self, self.keys[0], self.token_address,
-                         'issue', {'_to': str(self.keys[0].address), '_amount': 20000})
-
-        transaction_call(self, self.keys[0], self.connector_token1_address,
-                         'transfer', {'_to': converter_address, '_value': 5000})
-
-        transaction_call(self, self.keys[0], self.connector_token2_address,
-                         'transfer', {'_to': converter_address, '_value': 8000})
+        # transactions in a block are processed in order
+        calls = [
+            {
+                'from_': self.keys[0], 'to_': converter_address, 'method': 'addConnector',
+                'params': {
+                    '_token': self.connector_token2_address,
+                    '_weight': 150000,
+                    '_enableVirtualBalance': 0
+                }
+            },
+            {
+                'from_': self.keys[0], 'to_': self.token_address, 'method': 'issue',
+                'params': {'_to': str(self.keys[0].address), '_amount': 20000}
+            },
+            {
+                'from_': self.keys[0], 'to_': self.connector_token1_address, 'method': 'transfer',
+                'params': {'_to': converter_address, '_value': 5000}
+            },
+            {
+                'from_': self.keys[0], 'to_': self.connector_token2_address, 'method': 'transfer',
+                'params': {'_to': converter_address, '_value': 8000}
+            }
+        ]
 
         if activate:
-            transaction_call(self, self.keys[0], self.token_address,
-                             'transferOwnerShip', {'_newOwner': converter_address})
-
-            transaction_call(self, self.keys[0], converter_address, 'acceptTokenOwnership', {})
+            calls.append({
+                'from_': self.keys[0], 'to_': self.token_address, 'method': 'transferOwnerShip',
+                'params': {'_newOwner': converter_address}
+            })
+            calls.append({
+                'from_': self.keys[0], 'to_': converter_address, 'method': 'acceptTokenOwnership', 'params': {}
+            })
+
+        transaction_call_bulk(self, calls)
 
         return converter_address
 
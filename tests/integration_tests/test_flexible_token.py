@@ -16,14 +16,14 @@
 from iconservice import ZERO_SCORE_ADDRESS
 from iconservice.base.address import Address
 from iconsdk.wallet.wallet import KeyWallet
-from tbears.libs.icon_integrate_test import IconIntegrateTestBase
 
 from tests.integration_tests import create_address
-from tests.integration_tests.utils import get_content_as_bytes, deploy_score, icx_call, \
-    transaction_call, update_governance
+from tests.integration_tests.integrate_test_base import IntegrateTestBase
+from tests.integration_tests.utils import get_content_as_bytes, deploy_score, icx_call, transaction_call
 
 
-class TestFlexibleToken(IconIntegrateTestBase):
+class TestFlexibleToken(IntegrateTestBase):
+    USE_STANDARD_SCORES = True
     _TOKEN_INITIAL_TOTAL_SUPPLY_WITH_DECIMALS = 10000 * 10 ** 18
 
     # TEST_HTTP_ENDPOINT_URI_V3 = "http://127.0.0.1:9000/api/v3"
@@ -35,8 +35,6 @@ class TestFlexibleToken(IconIntegrateTestBase):
         # If you want to send request to network, uncomment next line
         # self.icon_service = IconService(HTTPProvider(self.TEST_HTTP_ENDPOINT_URI_V3))
 
-        update_governance(icon_integrate_test_base=super(), from_=self._test1, params={})
-
         self.st_token_name = 'test_token'
         self.st_token_symbol = 'TST'
         self.st_token_init_supply = hex(10000)
@@ -46,7 +44,7 @@ class TestFlexibleToken(IconIntegrateTestBase):
                          "_initialSupply": self.st_token_init_supply,
                          "_decimals": self.st_token_decimals}
 
-        # Deploys flexible_token SCORE
+        # Deploys flexible_token SCORE on the latest governance SCORE of the standard SCOREs
         tx_result = deploy_score(icon_integrate_test_base=super(), content_as_bytes=get_content_as_bytes("flexible_token"),
                                  from_=self._test1, params=deploy_params)
 
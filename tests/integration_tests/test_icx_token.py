@@ -17,14 +17,14 @@ from iconservice import ZERO_SCORE_ADDRESS
 from iconservice.base.address import Address
 from iconservice.base.exception import RevertException
 from iconsdk.wallet.wallet import KeyWallet
-from tbears.libs.icon_integrate_test import IconIntegrateTestBase
 
 from tests.integration_tests import create_address
-from tests.integration_tests.utils import get_content_as_bytes, deploy_score, icx_call, \
-    transaction_call, icx_transfer_call, update_governance
+from tests.integration_tests.integrate_test_base import IntegrateTestBase
+from tests.integration_tests.utils import icx_call, transaction_call, icx_transfer_call
 
 
-class TestIcxToken(IconIntegrateTestBase):
+class TestIcxToken(IntegrateTestBase):
+    USE_STANDARD_SCORES = True
     _TOKEN_INITIAL_TOTAL_SUPPLY_WITH_DECIMALS = 10000 * 10 ** 18
 
     # TEST_HTTP_ENDPOINT_URI_V3 = "http://127.0.0.1:9000/api/v3"
@@ -36,13 +36,8 @@ class TestIcxToken(IconIntegrateTestBase):
         # If you want to send request to network, uncomment next line
         # self.icon_service = IconService(HTTPProvider(self.TEST_HTTP_ENDPOINT_URI_V3))
 
-        update_governance(icon_integrate_test_base=super(), from_=self._test1, params={})
-
-        # Deploys score_registry SCORE
-        tx_result = deploy_score(icon_integrate_test_base=super(),
-                                 content_as_bytes=get_content_as_bytes("icx_token"), from_=self._test1, params={})
-
-        self.icx_token_address = tx_result['scoreAddress']
+        # icx_token SCORE is deployed on the latest governance SCORE
+        self.icx_token_address = self.standard_scores['icx_token']
 
     def _get_icx_value(self, address: Address):
         query_request = {
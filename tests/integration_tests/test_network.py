@@ -18,10 +18,11 @@ from iconservice.base.exception import RevertException
 from tbears.libs.icon_integrate_test import Account
 
 from contracts.interfaces.abc_score_registry import ABCScoreRegistry
+from tests.integration_tests.integrate_test_base import IntegrateTestBase
 from tests.integration_tests.utils import *
 
 
-class TestNetwork(IconIntegrateTestBase):
+class TestNetwork(IntegrateTestBase):
     _INITIAL_ICX_SEND_AMOUNT = 5000
     _ICX_DECIMALS = 10 ** 18
 
@@ -45,7 +46,7 @@ class TestNetwork(IconIntegrateTestBase):
     # TEST_HTTP_ENDPOINT_URI_V3 = "http://127.0.0.1:9000/api/v3"
 
     # todo: implement checking method which get path as a params and checking automatically
-    def setUp(self, **kwargs):
+    def setUpState(self):
         self.icon_service = None
         self.network_owner_wallet = KeyWallet.create()
         self.network_owner_address = self.network_owner_wallet.get_address()
@@ -61,7 +62,7 @@ class TestNetwork(IconIntegrateTestBase):
                                            Address.from_string(self.network_owner_address),
                                            1_000_000 * self._icx_factor)
                                ] + additional_accounts
-        super().setUp(genesis_account_list)
+        self.setUpGenesis(genesis_account_list)
 
         update_governance(icon_integrate_test_base=super(), from_=self._test1, params={})
 
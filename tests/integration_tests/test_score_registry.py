@@ -15,13 +15,14 @@
 
 from iconservice import ZERO_SCORE_ADDRESS
 from iconsdk.wallet.wallet import KeyWallet
-from tbears.libs.icon_integrate_test import IconIntegrateTestBase
 
 from contracts.interfaces.abc_score_registry import ABCScoreRegistry
-from tests.integration_tests.utils import get_content_as_bytes, deploy_score, icx_call, transaction_call, update_governance
+from tests.integration_tests.integrate_test_base import IntegrateTestBase
+from tests.integration_tests.utils import icx_call, transaction_call
 
 
-class TestScoreRegistry(IconIntegrateTestBase):
+class TestScoreRegistry(IntegrateTestBase):
+    USE_STANDARD_SCORES = True
 
     # TEST_HTTP_ENDPOINT_URI_V3 = "http://127.0.0.1:9000/api/v3"
 
@@ -32,13 +33,8 @@ class TestScoreRegistry(IconIntegrateTestBase):
         # If you want to send request to network, uncomment next line
         # self.icon_service = IconService(HTTPProvider(self.TEST_HTTP_ENDPOINT_URI_V3))
 
-        update_governance(icon_integrate_test_base=super(), from_=self._test1, params={})
-
-        # Deploys score_registry SCORE
-        tx_result = deploy_score(icon_integrate_test_base=super(),
-                                 content_as_bytes=get_content_as_bytes("score_registry"), from_=self._test1, params={})
-
-        self.score_registry_address = tx_result['scoreAddress']
+        # score_registry SCORE is deployed on the latest governance SCORE
+        self.score_registry_address = self.standard_scores['score_registry']
 
     def test_score_registry_property(self):
         actual_owner = icx_call(icon_integrate_test_base=super(), from_=self._test1.get_address(),
@@ -13,8 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from os import path
+from concurrent.futures import ThreadPoolExecutor
+from os import path, environ
+from time import sleep
 
+from iconsdk.converter import convert_transaction_result
 from iconsdk.exception import IconServiceBaseException
 from iconsdk.builder.call_builder import CallBuilder
 from iconsdk.builder.transaction_builder import CallTransactionBuilder, DeployTransactionBuilder, \
@@ -23,28 +26,36 @@ from iconsdk.icon_service import IconService
 from iconsdk.signed_transaction import SignedTransaction
 from iconsdk.wallet.wallet import KeyWallet
 from iconservice.base.address import GOVERNANCE_SCORE_ADDRESS, Address
+from iconservice.base.type_converter import TypeConverter, ParamType
+from tbears.config.tbears_config import tbears_server_config, ConfigKey as TbConf
 from tbears.libs.icon_integrate_test import IconIntegrateTestBase, SCORE_INSTALL_ADDRESS
 
 from contract_generator.builder import Builder
-from contract_generator.writer import ZipWriter
+from contract_generator.cache import PackageCache
+from tests.integration_tests import create_tx_hash
 from tests.integration_tests.in_memory_zip import InMemoryZip
 
+ROOT_PATH = path.abspath(path.join(path.dirname(__file__), '../..'))
+CONTRACTS_PATH = path.join(ROOT_PATH, 'contracts')
+
+# Built SCORE packages are shared by every test in the process and between test runs through the cache directory,
+# which can be changed by the environment variable `DEX_PACKAGE_CACHE_DIR`
+PACKAGE_CACHE_DIR = environ.get('DEX_PACKAGE_CACHE_DIR', path.join(ROOT_PATH, 'build', '.package_cache'))
+package_cache = PackageCache(PACKAGE_CACHE_DIR, compression="ZIP_DEFLATED")
+
+# Maximum number of concurrent read-only calls sent to a network by `icx_call_bulk`
+MAX_CONCURRENT_CALLS = 16
+
 
 def get_content_as_bytes(score_name: str) -> bytes:
-    """Gets the SCORE content as bytes by using Builder and ZipWriter
+    """Gets the SCORE content as bytes by using Builder and PackageCache.
+    The package is built only when no package of the same contents is cached.
 
     :param score_name: SCORE name
     :return: SCORE content as bytes
     """
-    dir_path = path.abspath(path.dirname(__file__))
-    root_path = path.abspath(path.join(dir_path, '../..'))
-    contracts_path = path.join(root_path, 'contracts')
-
-    builder = Builder(contracts_path, [score_name])
-    zip_writer = ZipWriter(compression="ZIP_DEFLATED")
-    builder.build(zip_writer)
-    contents_as_bytes = zip_writer.to_bytes()
-    return contents_as_bytes
+    builder = Builder(CONTRACTS_PATH, [score_name])
+    return package_cache.get(builder.contract_list[0])
 
 
 def get_icx_balance(icon_integrate_test_base: IconIntegrateTestBase,
@@ -88,20 +99,7 @@ def deploy_score(icon_integrate_test_base: IconIntegrateTestBase,
     :param icon_service: IconService
     :return: transaction result as dict
     """
-    # Generates an instance of transaction for deploying SCORE.
-    transaction = DeployTransactionBuilder() \
-        .from_(from_.get_address()) \
-        .to(to_) \
-        .step_limit(100_000_000_000) \
-        .nid(3) \
-        .nonce(100) \
-        .content_type("application/zip") \
-        .content(content_as_bytes) \
-        .params(params) \
-        .build()
-
-    # Returns the signed transaction object having a signature
-    signed_transaction = SignedTransaction(transaction, from_)
+    signed_transaction = _build_deploy_transaction(content_as_bytes, from_, to_, params)
 
     # Processes the transaction
     tx_result = icon_integrate_test_base.process_transaction(signed_transaction, icon_service)
@@ -157,20 +155,7 @@ def transaction_call(icon_integrate_test_base: IconIntegrateTestBase,
     :param icon_service: IconService
     :return: transaction result as dict
     """
-    # Generates an instance of transaction for calling method in SCORE.
-    transaction = CallTransactionBuilder() \
-        .from_(from_.get_address()) \
-        .to(to_) \
-        .step_limit(10_000_000) \
-        .nid(3) \
-        .nonce(100) \
-        .method(method) \
-        .params(params) \
-        .value(value) \
-        .build()
-
-    # Returns the signed transaction object having a signature
-    signed_transaction = SignedTransaction(transaction, from_)
+    signed_transaction = _build_call_transaction(from_, to_, method, params, value)
 
     # Sends the transaction to the network
     tx_result = icon_integrate_test_base.process_transaction(signed_transaction, icon_service)
@@ -217,6 +202,179 @@ def icx_transfer_call(icon_integrate_test_base: IconIntegrateTestBase,
     return tx_result
 
 
+def _build_deploy_transaction(content_as_bytes: bytes,
+                              from_: KeyWallet,
+                              to_: str = SCORE_INSTALL_ADDRESS,
+                              params: dict = None,
+                              nonce: int = 100) -> SignedTransaction:
+    """Builds the signed transaction deploying the SCORE
+
+    :param content_as_bytes: SCORE content as bytes
+    :param from_: Message sender's key-wallet instance
+    :param to_: SCORE installing address or updating address
+    :param params: parameters for the method `on_install` or `on_update` (optional)
+    :param nonce: nonce of the transaction, which makes the SCORE address unique among deployments
+        of the same sender in a block
+    :return: signed transaction
+    """
+    # Generates an instance of transaction for deploying SCORE.
+    transaction = DeployTransactionBuilder() \
+        .from_(from_.get_address()) \
+        .to(to_) \
+        .step_limit(100_000_000_000) \
+        .nid(3) \
+        .nonce(nonce) \
+        .content_type("application/zip") \
+        .content(content_as_bytes) \
+        .params(params) \
+        .build()
+
+    # Returns the signed transaction object having a signature
+    return SignedTransaction(transaction, from_)
+
+
+def _build_call_transaction(from_: KeyWallet,
+                            to_: str,
+                            method: str,
+                            params: dict = None,
+                            value: int = 0) -> SignedTransaction:
+    """Builds the signed transaction calling the method of the SCORE
+
+    :param from_: wallet address making a transaction
+    :param to_: wallet address to receive coin or SCORE address to receive a transaction
+    :param method: name of an external function
+    :param params: parameters as dict passed on the SCORE methods (optional)
+    :param value: amount of ICX to be sent (Optional)
+    :return: signed transaction
+    """
+    # Generates an instance of transaction for calling method in SCORE.
+    transaction = CallTransactionBuilder() \
+        .from_(from_.get_address()) \
+        .to(to_) \
+        .step_limit(10_000_000) \
+        .nid(3) \
+        .nonce(100) \
+        .method(method) \
+        .params(params) \
+        .value(value) \
+        .build()
+
+    # Returns the signed transaction object having a signature
+    return SignedTransaction(transaction, from_)
+
+
+def process_transaction_bulk(icon_integrate_test_base: IconIntegrateTestBase,
+                             requests: list,
+                             icon_service: IconService = None,
+                             block_confirm_interval: int = tbears_server_config[TbConf.BLOCK_CONFIRM_INTERVAL]
+                             ) -> list:
+    """Processes the signed transactions in a single block, in the given order.
+    Locally, it costs one block invocation and commit instead of one per transaction.
+    On a network, every transaction is sent before waiting for a block confirmation once.
+
+    :param icon_integrate_test_base: IconIntegrateTestBase
+    :param requests: list of SignedTransaction
+    :param icon_service: IconService
+    :param block_confirm_interval: seconds to wait for the block confirmation on a network
+    :return: list of the transaction results as dict, in the order of the requests.
+        If the block is rejected, every result has the status 0 and the reason in `failure`
+    """
+    if not requests:
+        return []
+
+    try:
+        if icon_service is not None:
+            tx_hashes = [icon_service.send_transaction(request) for request in requests]
+            sleep(block_confirm_interval)
+            return [icon_service.get_transaction_result(tx_hash) for tx_hash in tx_hashes]
+
+        tx_list = []
+        for request in requests:
+            params = TypeConverter.convert(request.signed_transaction_dict, ParamType.TRANSACTION_PARAMS_DATA)
+            params['txHash'] = create_tx_hash()
+            tx_list.append({
+                'method': 'icx_sendTransaction',
+                'params': params
+            })
+
+        block, tx_results = icon_integrate_test_base._make_and_req_block(tx_list)
+        icon_integrate_test_base._write_precommit_state(block)
+    except IconServiceBaseException as e:
+        # the block is rejected as a whole, so every transaction fails with the same reason
+        return [{'status': 0, 'failure': {'code': int(e.code), 'message': e.message}} for _ in requests]
+
+    # converts TX results as sdk style
+    for tx_result in tx_results:
+        convert_transaction_result(tx_result)
+    return tx_results
+
+
+def deploy_score_bulk(icon_integrate_test_base: IconIntegrateTestBase,
+                      deployments: list,
+                      icon_service: IconService = None) -> list:
+    """Deploys the SCOREs in a single block and checks if all of them succeeded
+
+    :param icon_integrate_test_base: IconIntegrateTestBase
+    :param deployments: list of dict of which keys are the parameters of `deploy_score`,
+        `content_as_bytes`, `from_`, `to_` (optional) and `params` (optional)
+        ex. [{'content_as_bytes': get_content_as_bytes('network'), 'from_': wallet, 'params': {}}, ..]
+    :param icon_service: IconService
+    :return: list of the transaction results as dict, in the order of the deployments
+    """
+    # SCORE addresses are derived from the sender, the timestamp and the nonce,
+    # so each deployment has its own nonce not to collide with the others in the block
+    requests = [_build_deploy_transaction(nonce=nonce, **deployment)
+                for nonce, deployment in enumerate(deployments, 100)]
+    tx_results = process_transaction_bulk(icon_integrate_test_base, requests, icon_service)
+
+    for tx_result in tx_results:
+        assert 1 == tx_result['status'], tx_result.get('failure')
+        assert 'scoreAddress' in tx_result
+    return tx_results
+
+
+def icx_call_bulk(icon_integrate_test_base: IconIntegrateTestBase,
+                  calls: list,
+                  icon_service: IconService = None) -> list:
+    """Calls SCORE's external functions which are read-only and returns the responses.
+    On a network, the calls are sent concurrently.
+
+    :param icon_integrate_test_base: IconIntegrateTestBase
+    :param calls: list of dict of which keys are the parameters of `icx_call`,
+        `from_`, `to_`, `method` and `params` (optional)
+    :param icon_service: IconService
+    :return: list of the responses, in the order of the calls
+    """
+    if icon_service is None or len(calls) <= 1:
+        # the local engine is not thread safe
+        return [icx_call(icon_integrate_test_base, icon_service=icon_service, **call) for call in calls]
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_CALLS, len(calls))) as executor:
+        futures = [executor.submit(icx_call, icon_integrate_test_base, icon_service=icon_service, **call)
+                   for call in calls]
+        return [future.result() for future in futures]
+
+
+def transaction_call_bulk(icon_integrate_test_base: IconIntegrateTestBase,
+                          calls: list,
+                          icon_service: IconService = None) -> list:
+    """Sends the call transactions in a single block, in the given order, and checks if all of them succeeded
+
+    :param icon_integrate_test_base: IconIntegrateTestBase
+    :param calls: list of dict of which keys are the parameters of `transaction_call`,
+        `from_`, `to_`, `method`, `params` (optional) and `value` (optional)
+        ex. [{'from_': wallet, 'to_': token_address, 'method': 'transfer', 'params': {..}}, ..]
+    :param icon_service: IconService
+    :return: list of the transaction results as dict, in the order of the calls
+    """
+    requests = [_build_call_transaction(**call) for call in calls]
+    tx_results = process_transaction_bulk(icon_integrate_test_base, requests, icon_service)
+
+    for tx_result in tx_results:
+        assert 1 == tx_result['status'], tx_result.get('failure')
+    return tx_results
+
+
 def _get_governance_score_as_bytes() -> bytes:
     """Gets the latest governance SCORE as bytes
 
@@ -26,9 +26,17 @@ from tests import ScorePatcher, create_db, MultiPatch, patch_property
 
 # noinspection PyUnresolvedReferences
 class TestIRCToken(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(IRCToken)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(IRCToken)
-        self.patcher.start()
+        self.patcher.reset()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.irc_token = IRCToken(create_db(self.score_address))
@@ -68,9 +76,6 @@ class TestIRCToken(unittest.TestCase):
             self.assertEqual(token_supply * 10 ** token_decimals, self.irc_token._total_supply.get())
             self.assertEqual(token_supply * 10 ** token_decimals, self.irc_token._balances[self.token_owner])
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_external_transfer(self):
         token_receiver = Address.from_string("hx" + "3" * 40)
         with MultiPatch([
@@ -132,3 +137,131 @@ class TestIRCToken(unittest.TestCase):
             TokenFallbackInterface.tokenFallback.assert_called_with(self.token_owner, value, b'None')
 
             self.irc_token.Transfer.assert_called_with(self.token_owner, score_token_receiver, value, b'None')
+
+    def test_external_transfer_batch(self):
+        token_receiver1 = Address.from_string("hx" + "3" * 40)
+        token_receiver2 = Address.from_string("hx" + "4" * 40)
+        with MultiPatch([
+            patch_property(IconScoreBase, 'msg', Message(self.token_owner)),
+            patch.object(IRCToken, '_transfer_batch')
+        ]):
+            # values for the same recipient are aggregated in the order of the first appearance
+            self.irc_token.transferBatch(f"{token_receiver1}, {token_receiver2},{token_receiver1}", "10, 0x14,5")
+            IRCToken._transfer_batch.assert_called_with(
+                self.token_owner, {token_receiver1: 15, token_receiver2: 20}, b'None')
+
+            self.irc_token.transferBatch(f"{token_receiver1}", "10", b'test')
+            IRCToken._transfer_batch.assert_called_with(self.token_owner, {token_receiver1: 10}, b'test')
+
+            # failure case: the numbers of recipients and values are different
+            self.assertRaises(RevertException, self.irc_token.transferBatch,
+                              f"{token_receiver1},{token_receiver2}", "10")
+
+            # failure case: value is under 0
+            self.assertRaises(RevertException, self.irc_token.transferBatch,
+                              f"{token_receiver1},{token_receiver2}", "10,-1")
+
+            # failure case: value is not a number
+            self.assertRaises(RevertException, self.irc_token.transferBatch, f"{token_receiver1}", "ten")
+
+    def test_transfer_batch(self):
+        eoa_token_receiver = Address.from_string("hx" + "3" * 40)
+        score_token_receiver = Address.from_string("cx" + "3" * 40)
+
+        # failure case: total value is higher than senders' total balance
+        with MultiPatch([
+            patch_property(IconScoreBase, 'msg', Message(self.token_owner)),
+            patch.object(TokenFallbackInterface, 'tokenFallback')
+        ]):
+            value = self.irc_token._balances[self.token_owner] // 2 + 1
+            self.assertRaises(RevertException,
+                              self.irc_token._transfer_batch,
+                              self.token_owner, {eoa_token_receiver: value, score_token_receiver: value}, b'None')
+            TokenFallbackInterface.tokenFallback.assert_not_called()
+
+        # success case: transfer 10 token to EOA and 20 token to SCORE at once
+        with MultiPatch([
+            patch_property(IconScoreBase, 'msg', Message(self.token_owner)),
+            patch.object(TokenFallbackInterface, 'tokenFallback')
+        ]):
+            before_owner_balance = self.irc_token._balances[self.token_owner]
+            before_eoa_receiver_balance = self.irc_token._balances[eoa_token_receiver]
+            before_score_receiver_balance = self.irc_token._balances[score_token_receiver]
+
+            self.irc_token._transfer_batch(
+                self.token_owner, {eoa_token_receiver: 10, score_token_receiver: 20}, b'None')
+
+            self.assertEqual(before_owner_balance - 30, self.irc_token._balances[self.token_owner])
+            self.assertEqual(before_eoa_receiver_balance + 10, self.irc_token._balances[eoa_token_receiver])
+            self.assertEqual(before_score_receiver_balance + 20, self.irc_token._balances[score_token_receiver])
+
+            # tokenFallback is called once for the SCORE recipient only
+            TokenFallbackInterface.tokenFallback.assert_called_once_with(self.token_owner, 20, b'None')
+
+            self.assertEqual(2, self.irc_token.Transfer.call_count)
+            self.irc_token.Transfer.assert_any_call(self.token_owner, eoa_token_receiver, 10, b'None')
+            self.irc_token.Transfer.assert_any_call(self.token_owner, score_token_receiver, 20, b'None')
+
+    def test_getHolders(self):
+        # failure case: the holder index is not enabled
+        self.assertRaises(RevertException, self.irc_token.getHolders, 0, 10)
+        self.assertRaises(RevertException, self.irc_token.getHolderCount)
+
+        irc_token = IRCToken(create_db(Address.from_string("cx" + "5" * 40)))
+        with patch_property(IconScoreBase, 'msg', Message(self.token_owner)):
+            irc_token.on_install("test_token", "TST", 100, 18, True)
+        self.assertEqual(1, irc_token.getHolderCount())
+        self.assertEqual([self.token_owner], irc_token.getHolders(0, 10))
+
+        token_receivers = [Address.from_string("hx" + str(i) * 40) for i in range(3, 6)]
+        for token_receiver in token_receivers:
+            irc_token._transfer(self.token_owner, token_receiver, 10, b'None')
+        self.assertEqual(4, irc_token.getHolderCount())
+        self.assertEqual([self.token_owner] + token_receivers[:1], irc_token.getHolders(0, 2))
+        self.assertEqual(token_receivers[1:], irc_token.getHolders(2, 2))
+
+        # the holder whose balance becomes zero is removed
+        irc_token._transfer(token_receivers[0], self.token_owner, 10, b'None')
+        self.assertEqual(3, irc_token.getHolderCount())
+        self.assertNotIn(token_receivers[0], irc_token.getHolders(0, 10))
+
+        # failure case: invalid offset or limit
+        self.assertRaises(RevertException, irc_token.getHolders, -1, 10)
+        self.assertRaises(RevertException, irc_token.getHolders, 0, 0)
+        self.assertRaises(RevertException, irc_token.getHolders, 0, irc_token._MAX_HOLDERS_PER_PAGE + 1)
+
+    def test_enableHolderIndex(self):
+        token_receivers = [Address.from_string("hx" + str(i) * 40) for i in range(3, 6)]
+        empty_account = Address.from_string("hx" + "6" * 40)
+        # balances set before the index is enabled
+        for token_receiver in token_receivers[:2]:
+            self.irc_token._transfer(self.token_owner, token_receiver, 10, b'None')
+
+        with patch_property(IconScoreBase, 'owner', self.token_owner):
+            # failure case: only the SCORE owner can enable the index or backfill it
+            with patch_property(IconScoreBase, 'msg', Message(token_receivers[0])):
+                self.assertRaises(RevertException, self.irc_token.enableHolderIndex)
+            with patch_property(IconScoreBase, 'msg', Message(self.token_owner)):
+                # failure case: the index is not enabled yet
+                self.assertRaises(RevertException, self.irc_token.addHolders, str(self.token_owner))
+
+                self.irc_token.enableHolderIndex()
+                self.assertRaises(RevertException, self.irc_token.enableHolderIndex)
+            with patch_property(IconScoreBase, 'msg', Message(token_receivers[0])):
+                self.assertRaises(RevertException, self.irc_token.addHolders, str(self.token_owner))
+
+            # balance changes after enabling are indexed
+            self.irc_token._transfer(self.token_owner, token_receivers[2], 10, b'None')
+            self.assertEqual([token_receivers[2]], self.irc_token.getHolders(0, 10))
+
+            with patch_property(IconScoreBase, 'msg', Message(self.token_owner)):
+                # accounts without balance and those already indexed are ignored
+                accounts = [self.token_owner] + token_receivers + [empty_account]
+                self.irc_token.addHolders(",".join(str(account) for account in accounts))
+                self.assertEqual(4, self.irc_token.getHolderCount())
+                self.assertEqual(set([self.token_owner] + token_receivers), set(self.irc_token.getHolders(0, 10)))
+
+                # failure case: too many accounts at once
+                accounts = [Address.from_string("hx" + f"{i:040x}") for i in range(1, 102)]
+                self.assertRaises(RevertException, self.irc_token.addHolders,
+                                  ",".join(str(account) for account in accounts))
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+from collections import namedtuple
+from unittest.mock import patch
+
+from iconservice import Address, IconScoreBase
+from iconservice.base.exception import IconServiceBaseException
+from iconservice.base.message import Message
+from iconservice.iconscore.icon_score_constant import CONST_BIT_FLAG, ConstBitFlag
+from iconservice.iconscore.icon_score_event_log import EventLogEmitter
+
+from tests import MultiPatch, create_db
+
+# emitted event log format, the arguments are in the order of the parameters of the event
+EventLog = namedtuple("EventLog", "score_address, signature, arguments")
+
+# transaction result format, failure is the exception which reverted the transaction or None
+TransactionResult = namedtuple("TransactionResult", "status, return_value, failure, event_logs")
+
+
+class LocalChain:
+    """
+    In-memory chain which runs SCOREs in the test process without the engine of a node.
+
+    SCOREs call each other through `create_interface_score` with the message sender of every call,
+    read the block height and the timestamp of the current block and emit event logs as on a node.
+    A failing transaction is reverted as a whole, leaving no change in any SCORE.
+
+    usage:
+        with LocalChain() as chain:
+            owner = chain.create_account()
+            token = chain.deploy(owner, IRCToken, {'_name': 'Token', ..})
+            result = chain.transaction(owner, token, 'transfer', {'_to': to, '_value': 10})
+    """
+
+    BLOCK_INTERVAL = 2 * 10 ** 6
+
+    def __init__(self):
+        # score address -> score
+        self._scores = {}
+        # score address -> owner
+        self._owners = {}
+        # message senders of the calls in progress
+        self._senders = []
+        # event logs of the transaction in progress
+        self._event_logs = []
+        self._address_count = 0
+        self.block_height = 0
+        self.timestamp = self.BLOCK_INTERVAL
+        # event logs of the succeeded transactions
+        self.event_logs = []
+
+        chain = self
+        self._patcher = MultiPatch([
+            patch.object(IconScoreBase, 'msg', new=property(lambda score: Message(chain._senders[-1]))),
+            patch.object(IconScoreBase, 'block_height', new=property(lambda score: chain.block_height)),
+            patch.object(IconScoreBase, 'now', new=lambda score: chain.timestamp),
+            patch.object(IconScoreBase, 'get_owner', new=lambda score, address: chain._owners.get(address)),
+            patch.object(IconScoreBase, 'create_interface_score',
+                         new=lambda score, address, interface_cls: ScoreHandle(chain, score.address, address)),
+            patch.object(EventLogEmitter, 'emit_event_log', new=self._emit_event_log),
+        ])
+
+    def start(self) -> 'LocalChain':
+        self._patcher.start()
+        return self
+
+    def stop(self) -> None:
+        self._patcher.stop()
+
+    def __enter__(self) -> 'LocalChain':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _create_address(self, prefix: str) -> Address:
+        self._address_count += 1
+        digest = hashlib.sha3_256(self._address_count.to_bytes(8, 'big')).hexdigest()
+        return Address.from_string(prefix + digest[:40])
+
+    def create_account(self) -> Address:
+        """
+        Creates an address of an externally owned account
+
+        :return: account address
+        """
+        return self._create_address('hx')
+
+    def get_score(self, address: Address) -> IconScoreBase:
+        """
+        Returns the deployed SCORE, to inspect its state directly
+
+        :param address: score address
+        :return: score
+        """
+        return self._scores[address]
+
+    def next_block(self, count: int = 1) -> None:
+        """
+        Moves to the next block, the following transactions are executed in it
+
+        :param count: number of blocks to move
+        """
+        self.block_height += count
+        self.timestamp += self.BLOCK_INTERVAL * count
+
+    def deploy(self, from_: Address, score_class: type, params: dict = None) -> Address:
+        """
+        Deploys a SCORE and calls its `on_install`
+
+        :param from_: deployer, who becomes the owner of the score
+        :param score_class: score class
+        :param params: parameters of `on_install`
+        :return: score address
+        """
+        address = self._create_address('cx')
+        self._owners[address] = from_
+        self._scores[address] = score_class(create_db(address))
+        try:
+            result = self._execute(from_, lambda: self._scores[address].on_install(**(params or {})))
+            if not result.status:
+                raise result.failure
+        except BaseException:
+            del self._scores[address]
+            del self._owners[address]
+            raise
+        return address
+
+    def transaction(self, from_: Address, to: Address, method: str, params: dict = None) -> TransactionResult:
+        """
+        Calls an external function of a SCORE in a transaction
+
+        :param from_: transaction sender
+        :param to: score address
+        :param method: name of the external function
+        :param params: parameters of the function
+        :return: transaction result, the changes are reverted if it failed
+        :raises Exception: an error other than IconServiceBaseException, after the changes are reverted
+        """
+        return self._execute(from_, lambda: self._call(to, method, (), params or {}))
+
+    def query(self, to: Address, method: str, params: dict = None):
+        """
+        Calls an external function of a SCORE without a transaction
+
+        :param to: score address
+        :param method: name of the external function
+        :param params: parameters of the function
+        :return: return value of the function
+        """
+        self._senders.append(None)
+        try:
+            return self._call(to, method, (), params or {})
+        finally:
+            self._senders.pop()
+
+    def call(self, from_: Address, to: Address, method: str, args: tuple, kwargs: dict):
+        """
+        Calls an external function of a SCORE from a SCORE, as an interface SCORE does
+
+        :param from_: calling score address
+        :param to: called score address
+        :param method: name of the external function
+        :param args: positional arguments
+        :param kwargs: keyword arguments
+        :return: return value of the function
+        """
+        self._senders.append(from_)
+        try:
+            return self._call(to, method, args, kwargs)
+        finally:
+            self._senders.pop()
+
+    def _call(self, to: Address, method: str, args: tuple, kwargs: dict):
+        score = self._scores.get(to)
+        if score is None:
+            raise ScoreNotFoundException(f'score not found: {to}')
+
+        function = getattr(type(score), method, None)
+        if not getattr(function, CONST_BIT_FLAG, 0) & ConstBitFlag.External:
+            raise MethodNotFoundException(f'external function not found: {method}')
+        return function(score, *args, **kwargs)
+
+    def _execute(self, from_: Address, function) -> TransactionResult:
+        # the whole state is small enough to be copied for every transaction
+        backup = {address: dict(score.db._context_db.memory_db) for address, score in self._scores.items()}
+        self._event_logs = []
+        self._senders.append(from_)
+        try:
+            return_value = function()
+        except IconServiceBaseException as e:
+            self._revert(backup)
+            return TransactionResult(False, None, e, [])
+        except Exception:
+            # other errors are bugs of the SCOREs rather than failed transactions
+            self._revert(backup)
+            raise
+        finally:
+            self._senders.pop()
+
+        self.event_logs.extend(self._event_logs)
+        return TransactionResult(True, return_value, None, self._event_logs)
+
+    def _revert(self, backup: dict) -> None:
+        for address, memory_db in backup.items():
+            score = self._scores[address]
+            score.db._context_db.memory_db = memory_db
+            # SCOREs may keep values read from the db such as the size of an ArrayDB
+            self._scores[address] = type(score)(score.db)
+
+    # noinspection PyUnusedLocal
+    def _emit_event_log(self, context, score_address: Address, event_signature: str, arguments: list,
+                        indexed_args_count: int) -> None:
+        self._event_logs.append(EventLog(score_address, event_signature, arguments))
+
+
+class ScoreHandle:
+    """
+    Interface SCORE of the local chain, which calls the external functions of the SCORE it points to
+    """
+
+    def __init__(self, chain: LocalChain, from_: Address, address: Address):
+        self._chain = chain
+        self._from = from_
+        self._address = address
+
+    def __getattr__(self, name: str):
+        def call(*args, **kwargs):
+            return self._chain.call(self._from, self._address, name, args, kwargs)
+
+        return call
+
+
+class ScoreNotFoundException(Exception):
+    pass
+
+
+class MethodNotFoundException(Exception):
+    pass
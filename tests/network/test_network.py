@@ -37,9 +37,17 @@ if TYPE_CHECKING:
 # noinspection PyUnresolvedReferences
 class TestNetwork(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(Network)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(Network)
-        self.patcher.start()
+        self.patcher.reset()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.network_score = Network(create_db(self.score_address))
@@ -54,9 +62,6 @@ class TestNetwork(unittest.TestCase):
             self.network_score.on_install()
             TokenHolder.on_install.assert_called_with(self.network_score)
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_check_valid_path(self):
         # success case: input the valid path
         path = [self.connector_token_list[0], self.flexible_token_address_list[0], self.connector_token_list[1]]
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from offchain.pool import PoolState
+
+
+def create_call(pool: PoolState):
+    """
+    Creates a function answering the readonly calls like a node with the state of the pool
+
+    :param pool: state of the pool to answer with
+    :return: function calling a readonly method, `call(score address, method, params)`
+    """
+    connector_tokens = list(pool.connectors)
+
+    def call(score: str, method: str, params: dict):
+        if score == pool.token and method == 'totalSupply':
+            return hex(pool.token_supply)
+        assert score == pool.converter
+        if method == 'getToken':
+            return pool.token
+        if method == 'getConnectorTokenCount':
+            return hex(len(connector_tokens))
+        if method == 'getConnectorAt':
+            return connector_tokens[int(params['_index'], 16)]
+        if method == 'getConnector':
+            connector = pool.connectors[params['_address']]
+            return {'virtualBalance': '0x0', 'weight': hex(connector.weight),
+                    'isVirtualBalanceEnabled': hex(connector.is_virtual_balance_enabled),
+                    'isPurchaseEnabled': hex(connector.is_purchase_enabled), 'isSet': '0x1'}
+        if method == 'getConnectorBalance':
+            return hex(pool.connectors[params['_connectorToken']].balance)
+        if method == 'getConversionFee':
+            return hex(pool.conversion_fee)
+        if method == 'isActive':
+            return hex(pool.is_active)
+        if method == 'isConversionsEnabled':
+            return hex(pool.conversions_enabled)
+        raise ValueError(method)
+
+    return call
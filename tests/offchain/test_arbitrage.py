@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+from offchain.arbitrage import ArbitrageDetector, Hop
+from offchain.events import PriceDataUpdate
+from offchain.pool import ConnectorState, PoolState, PoolCache
+from offchain.quote import get_return
+
+CONVERTER1 = "cx" + "1" * 40
+CONVERTER2 = "cx" + "2" * 40
+CONVERTER3 = "cx" + "3" * 40
+FLEXIBLE_TOKEN1 = "cx" + "4" * 40
+FLEXIBLE_TOKEN2 = "cx" + "5" * 40
+FLEXIBLE_TOKEN3 = "cx" + "6" * 40
+TOKEN_A = "cx" + "a" * 40
+TOKEN_B = "cx" + "b" * 40
+TOKEN_C = "cx" + "c" * 40
+BALANCE = 10 ** 24
+
+
+def create_pool(converter: str, token: str, balances: dict, conversion_fee: int = 1000) -> PoolState:
+    weight = 1000000 // len(balances)
+    return PoolState(converter, token, BALANCE, conversion_fee,
+                     {connector_token: ConnectorState(balance, weight) for connector_token, balance in balances.items()})
+
+
+def get_cycle_return(cache: PoolCache, cycle: tuple, amount: int) -> int:
+    for hop in cycle:
+        amount = get_return(cache.get(hop.converter), hop.from_token, hop.to_token, amount)['amount']
+    return amount
+
+
+class TestArbitrageDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PoolCache({
+            CONVERTER1: create_pool(CONVERTER1, FLEXIBLE_TOKEN1, {TOKEN_A: BALANCE, TOKEN_B: BALANCE}),
+            CONVERTER2: create_pool(CONVERTER2, FLEXIBLE_TOKEN2, {TOKEN_A: BALANCE, TOKEN_B: BALANCE}),
+            CONVERTER3: create_pool(CONVERTER3, FLEXIBLE_TOKEN3, {TOKEN_C: BALANCE}),
+        }, 10)
+        self.detector = ArbitrageDetector(self.cache)
+
+    def test_no_opportunity(self):
+        # the same prices with fees
+        self.assertEqual([], self.detector.get_opportunities())
+        self.assertLess(0, self.detector.get_cycle_count())
+
+    def test_opportunity(self):
+        # token b gets cheaper in converter 2
+        records = [PriceDataUpdate(11, 0, None, CONVERTER2, TOKEN_B, BALANCE, BALANCE * 12 // 10, 500000)]
+        opportunities = self.detector.update(records, 11)
+        self.assertEqual(opportunities, self.detector.get_opportunities())
+
+        best = opportunities[0]
+        self.assertEqual(TOKEN_A, best.cycle[0].from_token)
+        self.assertEqual(TOKEN_A, best.cycle[-1].to_token)
+        self.assertIn(CONVERTER2, [hop.converter for hop in best.cycle])
+        self.assertEqual(best.return_amount, get_cycle_return(self.cache, best.cycle, best.amount))
+        self.assertEqual(best.return_amount - best.amount, best.profit)
+        self.assertLess(0, best.profit)
+
+        # the amount is optimal
+        for ratio in [0.9, 0.99, 1.01, 1.1]:
+            amount = int(best.amount * ratio)
+            self.assertLessEqual(get_cycle_return(self.cache, best.cycle, amount) - amount, best.profit)
+
+        # the cycles pass each converter once
+        for opportunity in opportunities:
+            converters = [hop.converter for hop in opportunity.cycle]
+            self.assertEqual(len(converters), len(set(converters)))
+
+        # the prices get back
+        records = [PriceDataUpdate(12, 0, None, CONVERTER2, TOKEN_B, BALANCE, BALANCE, 500000)]
+        self.assertEqual([], self.detector.update(records, 12))
+        self.assertEqual([], self.detector.get_opportunities())
+
+    def test_update_incrementally(self):
+        with patch.object(ArbitrageDetector, '_evaluate', autospec=True,
+                          side_effect=ArbitrageDetector._evaluate) as evaluate:
+            # no cycle passes converter 3
+            records = [PriceDataUpdate(11, 0, None, CONVERTER3, TOKEN_C, BALANCE, BALANCE * 2, 1000000)]
+            self.assertEqual([], self.detector.update(records, 11))
+            evaluate.assert_not_called()
+
+            records = [PriceDataUpdate(12, 0, None, CONVERTER1, TOKEN_A, BALANCE, BALANCE * 2, 500000)]
+            self.detector.update(records, 12)
+            cycles = [call[0][1] for call in evaluate.call_args_list]
+            self.assertTrue(all(CONVERTER1 in [hop.converter for hop in cycle] for cycle in cycles))
+            self.assertEqual(self.detector.get_cycle_count(), len(cycles))
+
+    def test_rebuild_on_new_connector(self):
+        self.assertEqual([], self.detector.get_opportunities())
+        cycle_count = self.detector.get_cycle_count()
+
+        # converter 3 gets token a and b as connectors, with token a cheaper than the other converters
+        records = [PriceDataUpdate(11, 0, None, CONVERTER3, TOKEN_A, BALANCE, BALANCE * 2, 500000),
+                   PriceDataUpdate(11, 0, None, CONVERTER3, TOKEN_B, BALANCE, BALANCE, 500000)]
+        opportunities = self.detector.update(records, 11)
+        self.assertLess(cycle_count, self.detector.get_cycle_count())
+        self.assertIn(CONVERTER3, [hop.converter for hop in opportunities[0].cycle])
+
+    def test_base_tokens(self):
+        detector = ArbitrageDetector(self.cache, base_tokens=[TOKEN_B])
+        records = [PriceDataUpdate(11, 0, None, CONVERTER2, TOKEN_B, BALANCE, BALANCE * 12 // 10, 500000)]
+        opportunities = detector.update(records, 11)
+        self.assertLess(0, len(opportunities))
+        for opportunity in opportunities:
+            self.assertEqual(TOKEN_B, opportunity.cycle[0].from_token)
+            self.assertEqual(TOKEN_B, opportunity.cycle[-1].to_token)
+
+    def test_get_hops_of_disabled_purchase(self):
+        self.cache.get(CONVERTER1).connectors[TOKEN_B].is_purchase_enabled = False
+        detector = ArbitrageDetector(self.cache)
+        for cycle in detector._cycles:
+            for hop in cycle:
+                if hop.converter == CONVERTER1:
+                    self.assertNotEqual(Hop(CONVERTER1, TOKEN_B, FLEXIBLE_TOKEN1), hop)
+                    self.assertNotEqual(Hop(CONVERTER1, TOKEN_A, TOKEN_B), hop)
+
+    def test_benchmark_update(self):
+        # converters with a flexible token and 2 connectors among 20 tokens, and a block updating 10 of them
+        rng = random.Random(0)
+        tokens = ["cx" + "{:040x}".format(i) for i in range(20)]
+        pools = {}
+        for i in range(100):
+            converter, token = "cx" + "{:040x}".format(1000 + i), "cx" + "{:040x}".format(2000 + i)
+            connector_tokens = rng.sample(tokens, 2)
+            pools[converter] = create_pool(converter, token, {t: BALANCE for t in connector_tokens})
+        detector = ArbitrageDetector(PoolCache(pools, 10))
+
+        converters = rng.sample(sorted(pools), 10)
+        records = []
+        for converter in converters:
+            connector_token = next(iter(pools[converter].connectors))
+            balance = BALANCE * rng.randrange(90, 110) // 100
+            records.append(PriceDataUpdate(11, 0, None, converter, connector_token, BALANCE, balance, 500000))
+
+        begin = time.perf_counter()
+        opportunities = detector.update(records, 11)
+        elapsed = time.perf_counter() - begin
+        print('{} cycles, {} opportunities, update = {:.3f} ms'.format(
+            detector.get_cycle_count(), len(opportunities), elapsed * 1000))
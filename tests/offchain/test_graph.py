@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+
+from offchain.events import GRAPH_EVENT_SIGNATURES, OwnerUpdate, NewFlexibleToken, ConnectorAdd, AddressUpdate, \
+    parse_event_log
+from offchain.graph import GraphIndex, ZERO_SCORE_ADDRESS
+
+REGISTRY = "cx" + "1" * 40
+CONVERTER = "cx" + "2" * 40
+FLEXIBLE_TOKEN = "cx" + "3" * 40
+CONNECTOR_TOKEN1 = "cx" + "4" * 40
+CONNECTOR_TOKEN2 = "cx" + "5" * 40
+NETWORK = "cx" + "6" * 40
+OWNER = "hx" + "7" * 40
+
+
+class TestGraphIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GraphIndex(REGISTRY)
+
+    def _deploy(self, block_height: int) -> list:
+        """Returns the records of deploying a converter with a connector and activating it"""
+        return [
+            NewFlexibleToken(block_height, 0, None, FLEXIBLE_TOKEN, FLEXIBLE_TOKEN),
+            ConnectorAdd(block_height, 0, None, CONVERTER, CONNECTOR_TOKEN1, 500000, 0),
+            ConnectorAdd(block_height, 0, None, CONVERTER, CONNECTOR_TOKEN2, 500000, 1),
+            OwnerUpdate(block_height, 0, None, FLEXIBLE_TOKEN, OWNER, CONVERTER),
+        ]
+
+    def test_apply(self):
+        self.assertTrue(self.index.apply_all(self._deploy(1), 1))
+        self.assertEqual(1, self.index.block_height)
+
+        self.assertEqual(CONVERTER, self.index.get_converter(FLEXIBLE_TOKEN))
+        self.assertEqual(FLEXIBLE_TOKEN, self.index.get_flexible_token(CONVERTER))
+        self.assertEqual((CONNECTOR_TOKEN1, CONNECTOR_TOKEN2), self.index.get_connectors(CONVERTER))
+        for token in [FLEXIBLE_TOKEN, CONNECTOR_TOKEN1, CONNECTOR_TOKEN2]:
+            self.assertEqual({CONVERTER}, self.index.get_pools(token))
+        self.assertEqual(frozenset(), self.index.get_pools(NETWORK))
+
+        # events at or below the block height of the index are included already
+        self.assertFalse(self.index.apply(OwnerUpdate(1, 0, None, FLEXIBLE_TOKEN, CONVERTER, OWNER)))
+        self.assertEqual(CONVERTER, self.index.get_converter(FLEXIBLE_TOKEN))
+
+        # the owner takes back the flexible token to add a connector, the converter keeps its connectors
+        pools = self.index.get_pools(FLEXIBLE_TOKEN)
+        self.assertTrue(self.index.apply(OwnerUpdate(2, 0, None, FLEXIBLE_TOKEN, CONVERTER, OWNER)))
+        self.assertIsNone(self.index.get_converter(FLEXIBLE_TOKEN))
+        self.assertIsNone(self.index.get_flexible_token(CONVERTER))
+        self.assertEqual(frozenset(), self.index.get_pools(FLEXIBLE_TOKEN))
+        self.assertEqual({CONVERTER}, self.index.get_pools(CONNECTOR_TOKEN1))
+        # the returned set is not changed
+        self.assertEqual({CONVERTER}, pools)
+
+        self.assertTrue(self.index.apply(OwnerUpdate(3, 0, None, FLEXIBLE_TOKEN, OWNER, CONVERTER)))
+        self.assertEqual(CONVERTER, self.index.get_converter(FLEXIBLE_TOKEN))
+        self.assertEqual({CONVERTER}, self.index.get_pools(FLEXIBLE_TOKEN))
+
+    def test_apply_other_scores(self):
+        # owner updates of other scores than flexible tokens
+        self.assertFalse(self.index.apply(OwnerUpdate(1, 0, None, NETWORK, OWNER, CONVERTER)))
+        self.assertIsNone(self.index.get_flexible_token(CONVERTER))
+        # a connector added again
+        self.index.apply_all(self._deploy(1), 1)
+        self.assertFalse(self.index.apply(ConnectorAdd(2, 0, None, CONVERTER, CONNECTOR_TOKEN1, 500000, 0)))
+        self.assertEqual((CONNECTOR_TOKEN1, CONNECTOR_TOKEN2), self.index.get_connectors(CONVERTER))
+
+    def test_address_update(self):
+        self.assertTrue(self.index.apply(AddressUpdate(1, 0, None, REGISTRY, 'Network', NETWORK)))
+        self.assertEqual(NETWORK, self.index.get_address('Network'))
+        # other registries are not followed
+        self.assertFalse(self.index.apply(AddressUpdate(2, 0, None, CONVERTER, 'Network', CONVERTER)))
+        self.assertEqual(NETWORK, self.index.get_address('Network'))
+
+        self.assertTrue(self.index.apply(AddressUpdate(3, 0, None, REGISTRY, 'Network', ZERO_SCORE_ADDRESS)))
+        self.assertIsNone(self.index.get_address('Network'))
+
+    def test_add_pool(self):
+        self.index.add_pool(CONVERTER, FLEXIBLE_TOKEN, [CONNECTOR_TOKEN1, CONNECTOR_TOKEN2])
+        self.assertEqual(CONVERTER, self.index.get_converter(FLEXIBLE_TOKEN))
+        self.assertEqual([FLEXIBLE_TOKEN], self.index.get_flexible_tokens())
+        self.assertEqual([CONVERTER], self.index.get_converters())
+        self.assertEqual({CONVERTER}, self.index.get_pools(CONNECTOR_TOKEN2))
+
+    def test_parse_event_log(self):
+        event_logs = [
+            {"scoreAddress": FLEXIBLE_TOKEN, "indexed": ["NewFlexibleToken(Address)"], "data": [FLEXIBLE_TOKEN]},
+            {"scoreAddress": CONVERTER, "indexed": ["ConnectorAdd(Address,int,bool)", CONNECTOR_TOKEN1],
+             "data": ["0x7a120", "0x0"]},
+            {"scoreAddress": FLEXIBLE_TOKEN, "indexed": ["OwnerUpdate(Address,Address)", OWNER, CONVERTER],
+             "data": []},
+            {"scoreAddress": REGISTRY, "indexed": ["AddressUpdate(str,Address)", "Network"], "data": [NETWORK]},
+            {"scoreAddress": CONVERTER, "indexed": ["ConversionsEnable(bool)"], "data": ["0x1"]},
+        ]
+        records = [parse_event_log(event_log, 1, 0, None, GRAPH_EVENT_SIGNATURES) for event_log in event_logs]
+        self.assertEqual([
+            NewFlexibleToken(1, 0, None, FLEXIBLE_TOKEN, FLEXIBLE_TOKEN),
+            ConnectorAdd(1, 0, None, CONVERTER, CONNECTOR_TOKEN1, 500000, 0),
+            OwnerUpdate(1, 0, None, FLEXIBLE_TOKEN, OWNER, CONVERTER),
+            AddressUpdate(1, 0, None, REGISTRY, 'Network', NETWORK),
+            None,
+        ], records)
+
+        self.index.apply_all([record for record in records if record is not None], 1)
+        self.assertEqual(CONVERTER, self.index.get_converter(FLEXIBLE_TOKEN))
+        self.assertEqual(NETWORK, self.index.get_address('Network'))
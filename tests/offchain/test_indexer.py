@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from os import path
+from tempfile import TemporaryDirectory
+
+from offchain.indexer import EventIndexer, read_blocks
+from offchain.store import ColumnarStore
+
+CONVERTER = "cx" + "1" * 40
+FLEXIBLE_TOKEN = "cx" + "2" * 40
+CONNECTOR_TOKEN = "cx" + "3" * 40
+TRADER = "hx" + "4" * 40
+# 2019-06-01 00:00:00 UTC in microseconds
+DAY_BEGIN = 1559347200 * 10 ** 6
+HOUR = 60 * 60 * 10 ** 6
+
+
+def create_buy_block(height: int, timestamp: int, amount: int) -> dict:
+    """Creates a block with a conversion from the connector token to the flexible token"""
+    return_amount = amount * 2
+    event_logs = [
+        {"scoreAddress": FLEXIBLE_TOKEN, "indexed": ["Issuance(int)"], "data": [hex(return_amount)]},
+        {"scoreAddress": FLEXIBLE_TOKEN,
+         "indexed": ["Transfer(Address,Address,int,bytes)", FLEXIBLE_TOKEN, TRADER, hex(return_amount)],
+         "data": ["0x4e6f6e65"]},
+        {"scoreAddress": CONVERTER,
+         "indexed": ["Conversion(Address,Address,Address,int,int,int)", CONNECTOR_TOKEN, FLEXIBLE_TOKEN, TRADER],
+         "data": [hex(amount), hex(return_amount), hex(amount // 100)]},
+        {"scoreAddress": CONVERTER,
+         "indexed": ["PriceDataUpdate(Address,int,int,int)", CONNECTOR_TOKEN],
+         "data": [hex(1000 + height), hex(500 + height), hex(500000)]},
+        {"scoreAddress": CONVERTER, "indexed": ["ConversionsEnable(bool)"], "data": ["0x1"]},
+    ]
+    return {
+        "height": height,
+        "time_stamp": hex(timestamp),
+        "transactions": [
+            {"txHash": "0x" + "%064x" % height, "status": "0x1", "eventLogs": event_logs},
+            {"txHash": "0x" + "%064x" % (height + 10 ** 6), "status": "0x0", "eventLogs": event_logs},
+        ]
+    }
+
+
+class TestEventIndexer(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.store_dir = path.join(self.temp_dir.name, 'store')
+        self.indexer = EventIndexer(ColumnarStore(self.store_dir))
+        # a block every 6 hours for 2 days
+        self.blocks = [create_buy_block(height, DAY_BEGIN + height * 6 * HOUR, (height + 1) * 100)
+                       for height in range(8)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_blocks(self):
+        dump_path = path.join(self.temp_dir.name, 'blocks.json')
+        with open(dump_path, 'w') as f:
+            json.dump(self.blocks, f)
+        self.assertEqual(self.blocks, list(read_blocks(dump_path)))
+
+        lines_path = path.join(self.temp_dir.name, 'blocks.jsonl')
+        with open(lines_path, 'w') as f:
+            f.write('\n'.join(json.dumps(block) for block in self.blocks))
+        self.assertEqual(self.blocks, list(read_blocks(lines_path)))
+
+    def test_queries(self):
+        self.assertEqual(8, self.indexer.ingest(self.blocks, commit_interval=3))
+
+        # the first day, amounts of 100 to 400
+        volume = self.indexer.get_volume(CONVERTER, DAY_BEGIN, DAY_BEGIN + 24 * HOUR - 1)
+        self.assertEqual({CONNECTOR_TOKEN: 1000, FLEXIBLE_TOKEN: 2000}, volume)
+        fees = self.indexer.get_fees(CONVERTER, DAY_BEGIN, DAY_BEGIN + 24 * HOUR - 1)
+        self.assertEqual({FLEXIBLE_TOKEN: 10}, fees)
+
+        # range scan across the days
+        volume = self.indexer.get_volume(CONVERTER, DAY_BEGIN + 18 * HOUR, DAY_BEGIN + 30 * HOUR)
+        self.assertEqual({CONNECTOR_TOKEN: 1500, FLEXIBLE_TOKEN: 3000}, volume)
+
+        history = self.indexer.get_price_history(
+            CONVERTER, CONNECTOR_TOKEN, DAY_BEGIN + 30 * HOUR, DAY_BEGIN + 48 * HOUR)
+        self.assertEqual([{'block_height': height, 'timestamp': DAY_BEGIN + height * 6 * HOUR,
+                           'token_supply': 1000 + height, 'connector_balance': 500 + height,
+                           'connector_weight': 500000} for height in (5, 6, 7)], history)
+        self.assertEqual([], self.indexer.get_price_history(CONVERTER, TRADER, DAY_BEGIN, DAY_BEGIN + 48 * HOUR))
+
+        # token events are partitioned by the token
+        store = ColumnarStore(self.store_dir)
+        issuances = store.scan('Issuance', FLEXIBLE_TOKEN, DAY_BEGIN, DAY_BEGIN + 48 * HOUR, ['amount'])
+        self.assertEqual([(height + 1) * 200 for height in range(8)], [row['amount'] for row in issuances])
+        self.assertEqual([FLEXIBLE_TOKEN], store.get_scores('Transfer'))
+
+    def test_resume(self):
+        self.assertEqual(5, self.indexer.ingest(self.blocks[:5]))
+
+        # blocks ingested already are skipped
+        indexer = EventIndexer(ColumnarStore(self.store_dir))
+        self.assertEqual(3, indexer.ingest(self.blocks))
+        volume = indexer.get_volume(CONVERTER, DAY_BEGIN, DAY_BEGIN + 48 * HOUR)
+        self.assertEqual({CONNECTOR_TOKEN: 3600, FLEXIBLE_TOKEN: 7200}, volume)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from collections import OrderedDict
+
+from offchain.events import PriceDataUpdate
+from offchain.oracle import PriceOracle, PriceSeries, get_price
+
+CONVERTER = "cx" + "1" * 40
+CONNECTOR_TOKEN = "cx" + "2" * 40
+# 2019-06-01 00:00:00 UTC in microseconds
+DAY_BEGIN = 1559347200 * 10 ** 6
+MINUTE = 60 * 10 ** 6
+
+
+class TestPriceOracle(unittest.TestCase):
+
+    def test_get_price(self):
+        # 50% weight doubles the price
+        self.assertEqual(2.0, get_price(1000, 1000, 500000))
+        self.assertIsNone(get_price(0, 1000, 500000))
+
+    def test_candles(self):
+        series = PriceSeries()
+        series.update(DAY_BEGIN + 10 * 10 ** 6, 2.0)
+        series.update(DAY_BEGIN + 20 * 10 ** 6, 4.0)
+        series.update(DAY_BEGIN + 30 * 10 ** 6, 1.0)
+        series.update(DAY_BEGIN + 3 * MINUTE, 3.0)
+
+        minutes = series.resolutions['1m']
+        self.assertEqual(1, len(minutes.candles))
+        candle = minutes.candles[0]
+        self.assertEqual((2.0, 4.0, 1.0, 1.0, 3), (candle.open, candle.high, candle.low, candle.close,
+                                                   candle.update_count))
+        # 2.0 for 10s, 4.0 for 10s and 1.0 for 30s from the first update
+        self.assertAlmostEqual((20 + 40 + 30) / 50, candle.twap)
+
+        # the minutes without update are not materialized
+        self.assertEqual(DAY_BEGIN + 3 * MINUTE, minutes.current.start)
+        # 1.0 holds for the 2 minutes without update
+        self.assertAlmostEqual(1.0, series.get_twap(DAY_BEGIN + MINUTE, DAY_BEGIN + 3 * MINUTE))
+        self.assertAlmostEqual(2.0, series.get_twap(DAY_BEGIN + 2 * MINUTE, DAY_BEGIN + 4 * MINUTE))
+
+        # every resolution aggregates the same updates
+        day = series.resolutions['1d'].current
+        self.assertEqual((2.0, 4.0, 1.0, 3.0, 4), (day.open, day.high, day.low, day.close, day.update_count))
+
+        self.assertRaises(ValueError, series.update, DAY_BEGIN, 1.0)
+
+    def test_compaction(self):
+        series = PriceSeries(OrderedDict([('1m', (60, 8)), ('1h', (60 * 60, None))]))
+        for minute in range(120):
+            series.update(DAY_BEGIN + minute * MINUTE, float(minute % 7 + 1))
+
+        # the retained minutes are between the retention and its quarter more
+        minutes = series.resolutions['1m']
+        self.assertTrue(8 <= len(minutes.candles) <= 10)
+        self.assertEqual(DAY_BEGIN + 119 * MINUTE, minutes.current.start)
+        self.assertEqual(1, len(series.resolutions['1h'].candles))
+
+        # the first hour is answered by the hourly candles after the minutes are compacted
+        expected = sum(minute % 7 + 1 for minute in range(60)) / 60
+        self.assertAlmostEqual(expected, series.get_twap(DAY_BEGIN, DAY_BEGIN + 60 * MINUTE))
+        self.assertAlmostEqual(expected, series.resolutions['1h'].candles[0].twap)
+        self.assertRaises(ValueError, series.get_twap, DAY_BEGIN + MINUTE, DAY_BEGIN + 2 * MINUTE)
+
+    def test_update_record(self):
+        oracle = PriceOracle()
+        for minute in range(3):
+            oracle.update_record(PriceDataUpdate(minute, DAY_BEGIN + minute * MINUTE, None, CONVERTER,
+                                                 CONNECTOR_TOKEN, 1000, 1000 * (minute + 1), 1000000))
+
+        series = oracle.get_series(CONVERTER, CONNECTOR_TOKEN)
+        self.assertEqual([1.0, 2.0], [candle.close for candle in series.resolutions['1m'].candles])
+        self.assertAlmostEqual(2.0, series.get_twap(DAY_BEGIN, DAY_BEGIN + 3 * MINUTE))
+        self.assertIsNone(oracle.get_series(CONVERTER, CONVERTER))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from offchain.events import PriceDataUpdate, ConversionFeeUpdate, ConnectorUpdate, ConnectorPurchasesDisable, \
+    ConversionsEnable, OwnerUpdate, Transfer
+from offchain.pool import ConnectorState, PoolState, PoolCache, collect_pool_state
+from tests.offchain import create_call
+
+CONVERTER = "cx" + "1" * 40
+FLEXIBLE_TOKEN = "cx" + "2" * 40
+CONNECTOR_TOKEN1 = "cx" + "3" * 40
+CONNECTOR_TOKEN2 = "cx" + "4" * 40
+
+
+class TestPoolState(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = PoolState(CONVERTER, FLEXIBLE_TOKEN, 1000, 3000, {
+            CONNECTOR_TOKEN1: ConnectorState(500, 500000),
+            CONNECTOR_TOKEN2: ConnectorState(700, 500000, True, False),
+        })
+
+    def test_collect_pool_state(self):
+        self.assertEqual(self.pool, collect_pool_state(create_call(self.pool), CONVERTER))
+
+        self.pool.is_active = False
+        self.pool.conversions_enabled = False
+        self.assertEqual(self.pool, collect_pool_state(create_call(self.pool), CONVERTER))
+
+    def test_apply(self):
+        cache = PoolCache({CONVERTER: self.pool}, 10)
+
+        # events at or below the block height of the cache are included already
+        self.assertFalse(cache.apply(ConversionFeeUpdate(10, 0, None, CONVERTER, 3000, 1000)))
+        self.assertEqual(3000, self.pool.conversion_fee)
+
+        records = [
+            PriceDataUpdate(11, 0, None, CONVERTER, CONNECTOR_TOKEN1, 1100, 600, 500000),
+            ConversionFeeUpdate(11, 0, None, CONVERTER, 3000, 1000),
+            Transfer(12, 0, None, FLEXIBLE_TOKEN, CONVERTER, CONNECTOR_TOKEN1, 10),
+        ]
+        self.assertEqual({CONVERTER}, cache.apply_all(records, 12))
+        self.assertEqual(12, cache.block_height)
+        self.assertEqual(1100, self.pool.token_supply)
+        self.assertEqual(ConnectorState(600, 500000), self.pool.connectors[CONNECTOR_TOKEN1])
+        self.assertEqual(ConnectorState(700, 500000, True, False), self.pool.connectors[CONNECTOR_TOKEN2])
+        self.assertEqual(1000, self.pool.conversion_fee)
+
+    def test_apply_configuration(self):
+        cache = PoolCache({CONVERTER: self.pool}, 10)
+        owner = "hx" + "5" * 40
+
+        records = [
+            ConnectorUpdate(11, 0, None, CONVERTER, CONNECTOR_TOKEN1, 300000, 1, 900),
+            ConnectorPurchasesDisable(11, 0, None, CONVERTER, CONNECTOR_TOKEN2, 0),
+            ConversionsEnable(11, 0, None, CONVERTER, 0),
+        ]
+        self.assertEqual({CONVERTER}, cache.apply_all(records, 11))
+        self.assertEqual(ConnectorState(900, 300000, True, True), self.pool.connectors[CONNECTOR_TOKEN1])
+        self.assertEqual(ConnectorState(700, 500000, True, True), self.pool.connectors[CONNECTOR_TOKEN2])
+        self.assertFalse(self.pool.conversions_enabled)
+
+        # the converter is active while it owns the flexible token
+        self.assertEqual({CONVERTER}, cache.apply_all([OwnerUpdate(12, 0, None, FLEXIBLE_TOKEN, CONVERTER, owner)]))
+        self.assertFalse(self.pool.is_active)
+        self.assertEqual({CONVERTER}, cache.apply_all([OwnerUpdate(13, 0, None, FLEXIBLE_TOKEN, owner, CONVERTER)]))
+        self.assertTrue(self.pool.is_active)
+
+        # the ownership of the converter itself does not change the state
+        self.assertEqual(set(), cache.apply_all([OwnerUpdate(14, 0, None, CONVERTER, owner, "hx" + "6" * 40)]))
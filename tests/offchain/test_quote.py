@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+
+from contracts.formula import formula
+from offchain.pool import ConnectorState, PoolState
+from offchain.quote import QuoteError, get_return, estimate_return, get_spot_rate
+
+CONVERTER = "cx" + "1" * 40
+FLEXIBLE_TOKEN = "cx" + "2" * 40
+CONNECTOR_TOKEN1 = "cx" + "3" * 40
+CONNECTOR_TOKEN2 = "cx" + "4" * 40
+CONNECTOR_TOKEN3 = "cx" + "5" * 40
+
+
+class TestQuote(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = PoolState(CONVERTER, FLEXIBLE_TOKEN, 10 ** 24, 3000, {
+            CONNECTOR_TOKEN1: ConnectorState(5 * 10 ** 23, 300000),
+            CONNECTOR_TOKEN2: ConnectorState(7 * 10 ** 23, 500000),
+            CONNECTOR_TOKEN3: ConnectorState(2 * 10 ** 23, 200000, True, False),
+        })
+
+    def test_get_return(self):
+        amount = 10 ** 21
+        calculated = formula.calculate_purchase_return(10 ** 24, 5 * 10 ** 23, 300000, amount)
+        final = calculated * 997000 // 1000000
+        self.assertEqual({'amount': final, 'fee': calculated - final},
+                         get_return(self.pool, CONNECTOR_TOKEN1, FLEXIBLE_TOKEN, amount))
+
+        calculated = formula.calculate_sale_return(10 ** 24, 2 * 10 ** 23, 200000, amount)
+        final = calculated * 997000 // 1000000
+        self.assertEqual({'amount': final, 'fee': calculated - final},
+                         get_return(self.pool, FLEXIBLE_TOKEN, CONNECTOR_TOKEN3, amount))
+
+        # the fee is taken twice from a cross connector conversion
+        calculated = formula.calculate_cross_connector_return(5 * 10 ** 23, 300000, 7 * 10 ** 23, 500000, amount)
+        final = calculated * 997000 ** 2 // 1000000 ** 2
+        self.assertEqual({'amount': final, 'fee': calculated - final},
+                         get_return(self.pool, CONNECTOR_TOKEN1, CONNECTOR_TOKEN2, amount))
+
+    def test_get_return_rejected(self):
+        self.assertRaises(QuoteError, get_return, self.pool, CONNECTOR_TOKEN1, CONNECTOR_TOKEN1, 1)
+        self.assertRaises(QuoteError, get_return, self.pool, CONVERTER, FLEXIBLE_TOKEN, 1)
+        # purchase is disabled with the connector
+        self.assertRaises(QuoteError, get_return, self.pool, CONNECTOR_TOKEN3, FLEXIBLE_TOKEN, 1)
+        self.assertRaises(QuoteError, get_return, self.pool, CONNECTOR_TOKEN1, CONNECTOR_TOKEN3, 1)
+        # more than the supply
+        self.assertRaises(QuoteError, get_return, self.pool, FLEXIBLE_TOKEN, CONNECTOR_TOKEN1, 10 ** 24 + 1)
+
+        # the converter does not own the flexible token
+        self.pool.is_active = False
+        for from_token, to_token in [(CONNECTOR_TOKEN1, FLEXIBLE_TOKEN), (FLEXIBLE_TOKEN, CONNECTOR_TOKEN1),
+                                     (CONNECTOR_TOKEN1, CONNECTOR_TOKEN2)]:
+            with self.assertRaisesRegex(QuoteError, 'required active'):
+                get_return(self.pool, from_token, to_token, 1)
+
+    def test_estimate_return(self):
+        for from_token, to_token in [(CONNECTOR_TOKEN1, FLEXIBLE_TOKEN), (FLEXIBLE_TOKEN, CONNECTOR_TOKEN3),
+                                     (CONNECTOR_TOKEN1, CONNECTOR_TOKEN2), (CONNECTOR_TOKEN2, CONNECTOR_TOKEN1)]:
+            for amount in [10 ** 15, 10 ** 21, 10 ** 23]:
+                exact = get_return(self.pool, from_token, to_token, amount)['amount']
+                self.assertAlmostEqual(1, estimate_return(self.pool, from_token, to_token, amount) / exact, 9)
+
+            # the marginal rate is the return per unit of a small amount
+            small_amount = 10 ** 12
+            self.assertAlmostEqual(
+                1, estimate_return(self.pool, from_token, to_token, small_amount) / small_amount /
+                get_spot_rate(self.pool, from_token, to_token), 6)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+from iconservice import Address, IconScoreBase
+from iconservice.base.exception import IconServiceBaseException
+
+from contracts.converter.converter import Converter
+from offchain.pool import ConnectorState, PoolState
+from offchain.quote import QuoteError, get_final_amount, get_return
+from tests import MultiPatch, create_db
+from tests.seed_runner import get_seeds, is_soak_run, run_seeds
+
+# random states quoted from every seed and trades per state.
+# DEX_SOAK runs more states from random seeds on every CPU, DEX_PARITY_CASES overrides the number of states,
+# and a diverging seed can be replayed with DEX_PARITY_SEED
+CASE_COUNT = int(os.environ.get('DEX_PARITY_CASES', 2000 if is_soak_run() else 250))
+TRADE_COUNT = 10
+MAX_REPORTED_DIVERGENCES = 10
+
+MAX_WEIGHT = 1000000
+MAX_CONVERSION_FEE = 1000000
+CONNECTOR_COUNT = 4
+
+CONVERTER = Address.from_string("cx" + "1" * 40)
+OWNER = Address.from_string("hx" + "1" * 40)
+FLEXIBLE_TOKEN = Address.from_string("cx" + "2" * 40)
+CONNECTOR_TOKENS = [Address.from_string("cx" + "{:040x}".format(0xa0 + i)) for i in range(CONNECTOR_COUNT)]
+# a token which is never a connector, to quote invalid conversions
+OTHER_TOKEN = Address.from_string("cx" + "f" * 40)
+
+
+class TokenStub:
+    """Stand-in of a token SCORE answering the calls the converter makes while quoting"""
+
+    def __init__(self):
+        self.owner = CONVERTER
+        self.total_supply = 0
+        self.balance = 0
+
+    def getOwner(self) -> Address:
+        return self.owner
+
+    def totalSupply(self) -> int:
+        return self.total_supply
+
+    def balanceOf(self, _owner: Address) -> int:
+        return self.balance
+
+
+def generate_amount(rng: random.Random) -> int:
+    """Returns an amount spread over the magnitudes, with the edge values more likely"""
+    choice = rng.random()
+    if choice < 0.05:
+        return rng.choice([0, 1, 2])
+    if choice < 0.1:
+        return rng.randrange(1, 10 ** 6)
+    return int(rng.random() * 10 ** rng.randint(1, 30)) + 1
+
+
+def generate_case(rng: random.Random) -> tuple:
+    """
+    Generates a converter state and the trades to quote at it
+
+    :param rng: random generator
+    :return: (PoolState, list of (from token, to token, amount))
+    """
+    conversion_fee = rng.choice([0, 1, 1000, 3000, MAX_CONVERSION_FEE - 1, MAX_CONVERSION_FEE,
+                                 rng.randrange(MAX_CONVERSION_FEE + 1)])
+    connectors = {}
+    remaining_weight = MAX_WEIGHT
+    for connector_token in CONNECTOR_TOKENS[:rng.randint(1, CONNECTOR_COUNT)]:
+        if remaining_weight == 0:
+            break
+        weight = rng.choice([remaining_weight, remaining_weight // 2 or 1, rng.randint(1, remaining_weight)])
+        remaining_weight -= weight
+        connectors[connector_token] = ConnectorState(
+            generate_amount(rng), weight, rng.random() < 0.2, rng.random() < 0.9)
+    pool = PoolState(CONVERTER, FLEXIBLE_TOKEN, generate_amount(rng), conversion_fee, connectors,
+                     rng.random() < 0.95)
+
+    tokens = [FLEXIBLE_TOKEN] + list(connectors)
+    trades = []
+    for _ in range(TRADE_COUNT):
+        choice = rng.random()
+        if choice < 0.05:
+            from_token, to_token = rng.sample(tokens + [OTHER_TOKEN], 2)
+        elif choice < 0.1:
+            from_token = to_token = rng.choice(tokens)
+        else:
+            from_token, to_token = rng.sample(tokens, 2)
+        # amounts relative to the balance are mostly convertible, the others mostly hit the edges
+        from_state = connectors.get(from_token)
+        from_balance = pool.token_supply if from_token == FLEXIBLE_TOKEN else from_state.balance if from_state else 0
+        amount = int(from_balance * rng.random() ** 4) + 1 if rng.random() < 0.5 else generate_amount(rng)
+        trades.append((from_token, to_token, amount))
+    return pool, trades
+
+
+def _outcome(function, *args) -> tuple:
+    # a revert of the converter and a QuoteError of the engine are the same outcome
+    try:
+        result = function(*args)
+    except (IconServiceBaseException, QuoteError):
+        return 'revert',
+    except Exception as e:
+        return 'error', type(e).__name__
+    return ('ok',) + (tuple(sorted(result.items())) if isinstance(result, dict) else (result,))
+
+
+class ParityHarness:
+    """
+    A Converter instance quoting states written straight into its storage, next to the off-chain engine.
+    The token SCOREs it calls are stubs, so a state is set up without any transaction.
+    """
+
+    def __init__(self):
+        self._tokens = {token: TokenStub() for token in [FLEXIBLE_TOKEN] + CONNECTOR_TOKENS + [OTHER_TOKEN]}
+        self._patcher = MultiPatch([
+            patch.object(IconScoreBase, 'get_owner', return_value=OWNER),
+            patch.object(Converter, 'create_interface_score',
+                         side_effect=lambda address, interface: self._tokens[address]),
+        ])
+        self._patcher.start()
+        self.converter = Converter(create_db(CONVERTER))
+        self.converter._token.set(FLEXIBLE_TOKEN)
+
+    def close(self) -> None:
+        self._patcher.stop()
+
+    def set_state(self, pool: PoolState) -> None:
+        self._tokens[FLEXIBLE_TOKEN].total_supply = pool.token_supply
+        self._tokens[FLEXIBLE_TOKEN].owner = CONVERTER if pool.is_active else OWNER
+        self.converter._conversion_fee.set(pool.conversion_fee)
+        for connector_token in CONNECTOR_TOKENS:
+            connector = self.converter._connectors[connector_token]
+            state = pool.connectors.get(connector_token)
+            connector.is_set.set(state is not None)
+            if state is None:
+                continue
+
+            connector.weight.set(state.weight)
+            connector.is_virtual_balance_enabled.set(state.is_virtual_balance_enabled)
+            connector.is_purchase_enabled.set(state.is_purchase_enabled)
+            # the balance which is not in use is set apart, so that reading the wrong one diverges
+            connector.virtual_balance.set(state.balance if state.is_virtual_balance_enabled else state.balance + 1)
+            self._tokens[connector_token].balance = \
+                state.balance + 1 if state.is_virtual_balance_enabled else state.balance
+
+    def check_trade(self, pool: PoolState, from_token: Address, to_token: Address, amount: int) -> list:
+        """
+        Quotes the trade with the converter and the engine, and returns where they diverge
+
+        :return: list of (check name, converter outcome, engine outcome)
+        """
+        divergences = []
+        expected = _outcome(get_return, pool, from_token, to_token, amount)
+        actual = _outcome(self.converter.getReturn, from_token, to_token, amount)
+        if actual != expected:
+            divergences.append(('getReturn', actual, expected))
+
+        # on conversion, the deposit is in the actual balance of the converter before the return is calculated
+        if from_token != to_token and from_token in pool.connectors:
+            from_token_stub = self._tokens[from_token]
+            from_token_stub.balance += amount
+            try:
+                if to_token == FLEXIBLE_TOKEN:
+                    actual = _outcome(self.converter.get_purchase_return, from_token, amount, True)
+                elif to_token != OTHER_TOKEN:
+                    actual = _outcome(self.converter.get_cross_connector_return, from_token, to_token, amount, True)
+            finally:
+                from_token_stub.balance -= amount
+            if actual != expected:
+                divergences.append(('conversion', actual, expected))
+
+        for magnitude in (1, 2):
+            expected = get_final_amount(pool.conversion_fee, amount, magnitude)
+            actual = self.converter.getFinalAmount(amount, magnitude)
+            if actual != expected:
+                divergences.append((f'getFinalAmount({magnitude})', actual, expected))
+        return divergences
+
+
+def check_seed(seed: int) -> tuple:
+    """
+    Quotes random states and trades from the seed with the converter and the engine
+
+    :param seed: random seed
+    :return: (seed, number of quoted trades, list of divergences up to MAX_REPORTED_DIVERGENCES)
+    """
+    rng = random.Random(seed)
+    harness = ParityHarness()
+    divergences = []
+    case_count = 0
+    try:
+        for case in range(CASE_COUNT):
+            case_count += 1
+            pool, trades = generate_case(rng)
+            harness.set_state(pool)
+            for trade in trades:
+                for check, actual, expected in harness.check_trade(pool, *trade):
+                    divergences.append((case, pool, trade, check, actual, expected))
+            if len(divergences) >= MAX_REPORTED_DIVERGENCES:
+                break
+    finally:
+        harness.close()
+    return seed, case_count * TRADE_COUNT, divergences[:MAX_REPORTED_DIVERGENCES]
+
+
+class TestQuoteParity(unittest.TestCase):
+
+    def test_conversion_balance_adjustment(self):
+        # the deposit is taken out of the actual balance only, the virtual balance does not include it yet
+        harness = ParityHarness()
+        try:
+            for is_virtual_balance_enabled in (False, True):
+                pool = PoolState(CONVERTER, FLEXIBLE_TOKEN, 10 ** 24, 3000, {
+                    CONNECTOR_TOKENS[0]: ConnectorState(10 ** 21, 500000, is_virtual_balance_enabled),
+                    CONNECTOR_TOKENS[1]: ConnectorState(10 ** 21, 500000),
+                })
+                harness.set_state(pool)
+                self.assertEqual([], harness.check_trade(pool, CONNECTOR_TOKENS[0], FLEXIBLE_TOKEN, 10 ** 20))
+                self.assertEqual([], harness.check_trade(pool, CONNECTOR_TOKENS[0], CONNECTOR_TOKENS[1], 10 ** 20))
+        finally:
+            harness.close()
+
+    def test_quote_parity(self):
+        seeds = get_seeds('DEX_PARITY_SEED')
+        begin = time.perf_counter()
+        results = run_seeds(check_seed, seeds)
+        elapsed = time.perf_counter() - begin
+
+        trade_count = sum(count for _, count, _ in results)
+        print('{} trades quoted in {:.3f} s, {:.0f} trades/s'.format(trade_count, elapsed, trade_count / elapsed))
+        failures = [(seed, divergences) for seed, _, divergences in results if divergences]
+        for seed, divergences in failures:
+            print('seed = {}'.format(seed))
+            for case, pool, trade, check, actual, expected in divergences:
+                print('    case {} {}: {} converter = {}, engine = {}\n        {}'.format(
+                    case, check, trade, actual, expected, pool))
+        if failures:
+            self.fail("TEST FAILED: {} of {} seeds diverged".format(len(failures), len(seeds)))
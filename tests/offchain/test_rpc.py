@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import unittest
+
+from offchain.pool import ConnectorState, PoolState
+from offchain.rpc import AsyncRpcClient, DexClient, JsonRpcError
+from tests.offchain import create_call
+
+NETWORK = "cx" + "9" * 40
+
+
+class LocalNode:
+    """Stand-in JSON-RPC server answering `icx_call` with a function, over HTTP/1.1 keep-alive"""
+
+    def __init__(self, call) -> None:
+        self._call = call
+        self._server = None
+        self.connection_count = 0
+        self.request_count = 0
+        self.call_count = 0
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}/api/v3'
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _answer(self, request: dict) -> dict:
+        self.call_count += 1
+        data = request['params']['data']
+        try:
+            result = self._call(request['params']['to'], data['method'], data.get('params', {}))
+        except ValueError as e:
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32032, 'message': str(e)}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connection_count += 1
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+            request = json.loads(await reader.readexactly(int(headers['content-length'])))
+
+            self.request_count += 1
+            self._concurrent_requests += 1
+            self.max_concurrent_requests = max(self.max_concurrent_requests, self._concurrent_requests)
+            # yields to let the concurrent requests in
+            await asyncio.sleep(0.01)
+            self._concurrent_requests -= 1
+
+            if isinstance(request, list):
+                response = [self._answer(item) for item in reversed(request)]
+            else:
+                response = self._answer(request)
+            body = json.dumps(response).encode()
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         b'Content-Length: %d\r\n\r\n' % len(body) + body)
+            await writer.drain()
+        writer.close()
+
+
+class TestAsyncRpcClient(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.pools = [PoolState("cx" + "%040x" % index, "cx" + "%040x" % (index + 1000), 10 ** 20 + index, 3000,
+                                {"cx" + "%040x" % (index * 100 + i): ConnectorState(10 ** 18 + i, 500000)
+                                 for i in range(2)})
+                      for index in range(1, 101)]
+        calls = {pool.converter: create_call(pool) for pool in self.pools}
+        calls.update({pool.token: create_call(pool) for pool in self.pools})
+
+        def call(score: str, method: str, params: dict):
+            if score == NETWORK and method == 'getExpectedReturnByPath':
+                return hex(int(params['_amount'], 16) * 2)
+            if score not in calls:
+                raise ValueError(f'invalid score: {score}')
+            return calls[score](score, method, params)
+
+        self.node = LocalNode(call)
+        self.loop.run_until_complete(self.node.start())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.node.stop())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def test_call(self):
+        async def run():
+            async with AsyncRpcClient(self.node.url) as client:
+                dex_client = DexClient(client, NETWORK)
+                self.assertEqual(200, await dex_client.get_expected_return_by_path(
+                    [self.pools[0].token, self.pools[0].converter, self.pools[1].token], 100))
+                self.assertEqual(3000, await dex_client.get_conversion_fee(self.pools[0].converter))
+                with self.assertRaises(JsonRpcError):
+                    await client.call("cx" + "f" * 40, 'getConversionFee')
+
+                # every call reuses a single connection
+                self.assertEqual(1, client.pool.opened_count)
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(1, self.node.connection_count)
+
+    def test_call_batch(self):
+        async def run():
+            async with AsyncRpcClient(self.node.url, batch_size=30) as client:
+                calls = [(pool.converter, 'getConversionFee', None) for pool in self.pools]
+                calls.append(("cx" + "f" * 40, 'getConversionFee', None))
+                results = await client.call_batch(calls, return_exceptions=True)
+
+                # the responses are matched to the calls by id
+                self.assertEqual(['0xbb8'] * 100, results[:100])
+                self.assertIsInstance(results[100], JsonRpcError)
+                with self.assertRaises(JsonRpcError):
+                    await client.call_batch(calls)
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(8, self.node.request_count)
+
+    def test_get_pool_states(self):
+        async def run():
+            async with AsyncRpcClient(self.node.url, max_connections=4) as client:
+                pools = await DexClient(client).get_pool_states([pool.converter for pool in self.pools])
+                self.assertEqual(self.pools, pools)
+                self.assertEqual(4, client.pool.opened_count)
+
+        self.loop.run_until_complete(run())
+        # 3 batch requests per pool, at most 4 at a time over 4 connections
+        self.assertEqual(300, self.node.request_count)
+        self.assertEqual(4, self.node.connection_count)
+        self.assertEqual(4, self.node.max_concurrent_requests)
+
+    def test_client_created_outside_loop(self):
+        # the client is created before any loop runs it, as `offchain.service.create_collect` does
+        client = AsyncRpcClient(self.node.url, max_connections=4)
+        converters = [pool.converter for pool in self.pools[:20]]
+
+        async def run():
+            return await asyncio.gather(*(client.call(converter, 'getConversionFee') for converter in converters))
+
+        # more requests than the connections wait on the pool in a loop of another thread
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            future = asyncio.run_coroutine_threadsafe(run(), other_loop)
+            self.assertEqual(['0xbb8'] * 20, self.loop.run_until_complete(asyncio.wrap_future(future)))
+            other_loop.call_soon_threadsafe(client.close)
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+
+        # and then in the loop of this thread
+        self.assertEqual(['0xbb8'] * 20, self.loop.run_until_complete(run()))
+        client.close()
+        self.assertEqual(4, self.node.max_concurrent_requests)
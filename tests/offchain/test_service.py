@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+import unittest
+from http.client import HTTPConnection
+from unittest.mock import Mock
+
+from offchain.events import ConnectorAdd, ConversionFeeUpdate, ConversionsEnable, OwnerUpdate, PriceDataUpdate
+from offchain.loadgen import create_targets, percentile, run_load
+from offchain.pool import ConnectorState, PoolCache, PoolState
+from offchain.quote import QuoteError, get_return
+from offchain.service import QuoteServer, QuoteService
+
+CONVERTER1 = "cx" + "1" * 40
+CONVERTER2 = "cx" + "2" * 40
+FLEXIBLE_TOKEN1 = "cx" + "4" * 40
+FLEXIBLE_TOKEN2 = "cx" + "5" * 40
+TOKEN_A = "cx" + "a" * 40
+TOKEN_B = "cx" + "b" * 40
+TOKEN_C = "cx" + "c" * 40
+BALANCE = 10 ** 24
+
+
+def create_pool(converter: str, token: str, connector_tokens: list) -> PoolState:
+    return PoolState(converter, token, BALANCE, 3000,
+                     {connector_token: ConnectorState(BALANCE, 500000) for connector_token in connector_tokens})
+
+
+class TestQuoteService(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PoolCache({
+            CONVERTER1: create_pool(CONVERTER1, FLEXIBLE_TOKEN1, [TOKEN_A, TOKEN_B]),
+            CONVERTER2: create_pool(CONVERTER2, FLEXIBLE_TOKEN2, [TOKEN_B, TOKEN_C]),
+        }, 10)
+        self.collect = Mock()
+        self.service = QuoteService(self.cache, collect=self.collect)
+
+    def test_get_return(self):
+        expected = get_return(self.cache.get(CONVERTER1), TOKEN_A, TOKEN_B, 10 ** 18)
+        self.assertEqual(expected, self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18))
+        self.assertEqual((0, 1), (self.service.hit_count, self.service.miss_count))
+
+        # the second quote is served from the cache, as a copy
+        self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)['amount'] = 0
+        self.assertEqual(expected, self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18))
+        self.assertEqual((2, 1), (self.service.hit_count, self.service.miss_count))
+
+        # failure case: errors of the converter are raised and not cached
+        self.assertRaises(QuoteError, self.service.get_return, CONVERTER1, TOKEN_A, TOKEN_C, 10 ** 18)
+        self.assertRaises(QuoteError, self.service.get_return, CONVERTER1, TOKEN_A, TOKEN_C, 10 ** 18)
+
+        # failure case: converters not known by the events are not collected
+        self.assertRaises(QuoteError, self.service.get_return, "cx" + "9" * 40, TOKEN_A, TOKEN_B, 10 ** 18)
+        self.collect.assert_not_called()
+
+    def test_get_expected_return_by_path(self):
+        path = [TOKEN_A, FLEXIBLE_TOKEN1, TOKEN_B, FLEXIBLE_TOKEN2, TOKEN_C]
+        amount = get_return(self.cache.get(CONVERTER1), TOKEN_A, TOKEN_B, 10 ** 18)['amount']
+        amount = get_return(self.cache.get(CONVERTER2), TOKEN_B, TOKEN_C, amount)['amount']
+        self.assertEqual(amount, self.service.get_expected_return_by_path(path, 10 ** 18))
+        self.assertEqual(amount, self.service.get_expected_return_by_path(path, 10 ** 18))
+
+        # failure case: invalid paths are rejected as the network does
+        self.assertRaises(QuoteError, self.service.get_expected_return_by_path, path[:2], 10 ** 18)
+        self.assertRaises(QuoteError, self.service.get_expected_return_by_path,
+                          [TOKEN_A, FLEXIBLE_TOKEN1, TOKEN_B, FLEXIBLE_TOKEN1, TOKEN_A], 10 ** 18)
+        self.assertRaises(QuoteError, self.service.get_expected_return_by_path, path, 0)
+        self.assertRaises(QuoteError, self.service.get_expected_return_by_path,
+                          [TOKEN_A, TOKEN_B, TOKEN_C], 10 ** 18)
+
+    def test_apply_all(self):
+        path = [TOKEN_A, FLEXIBLE_TOKEN1, TOKEN_B, FLEXIBLE_TOKEN2, TOKEN_C]
+        prev_return = self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+        prev_path_return = self.service.get_expected_return_by_path(path, 10 ** 18)
+        self.service.get_return(CONVERTER2, TOKEN_B, TOKEN_C, 10 ** 18)
+
+        # records at or below the block height are already in the states
+        self.assertEqual(set(), self.service.apply_all([ConversionFeeUpdate(10, 0, None, CONVERTER1, 3000, 0)], 10))
+
+        changed = self.service.apply_all([PriceDataUpdate(11, 0, None, CONVERTER1, TOKEN_B, BALANCE, BALANCE * 2,
+                                                          500000)], 11)
+        self.assertEqual({CONVERTER1}, changed)
+        self.assertEqual(11, self.service.block_height)
+        self.assertGreater(self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)['amount'],
+                           prev_return['amount'])
+        self.assertGreater(self.service.get_expected_return_by_path(path, 10 ** 18), prev_path_return)
+
+        # quotes of the other converters stay in the cache
+        hit_count = self.service.hit_count
+        self.service.get_return(CONVERTER2, TOKEN_B, TOKEN_C, 10 ** 18)
+        self.assertEqual(hit_count + 1, self.service.hit_count)
+
+        self.service.apply_all([ConversionFeeUpdate(12, 0, None, CONVERTER2, 3000, 0)], 12)
+        self.assertEqual(0, self.service.get_return(CONVERTER2, TOKEN_B, TOKEN_C, 10 ** 18)['fee'])
+
+    def test_apply_all_connector_add(self):
+        new_pool = create_pool(CONVERTER1, FLEXIBLE_TOKEN1, [TOKEN_A, TOKEN_B, TOKEN_C])
+        self.collect.return_value = new_pool
+        self.assertRaises(QuoteError, self.service.get_return, CONVERTER1, TOKEN_A, TOKEN_C, 10 ** 18)
+
+        # the converter getting a new connector is collected again on its next quote
+        self.service.apply_all([ConnectorAdd(11, 0, None, CONVERTER1, TOKEN_C, 500000, False)], 11)
+        self.collect.assert_not_called()
+        self.assertEqual(get_return(new_pool, TOKEN_A, TOKEN_C, 10 ** 18),
+                         self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_C, 10 ** 18))
+        self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+        self.collect.assert_called_once_with(CONVERTER1)
+
+    def test_apply_all_reactivation(self):
+        owner = "hx" + "1" * 40
+        withdrawn_pool = create_pool(CONVERTER1, FLEXIBLE_TOKEN1, [TOKEN_A, TOKEN_B])
+        withdrawn_pool.connectors[TOKEN_B].balance //= 2
+        self.collect.return_value = withdrawn_pool
+
+        # the owner withdraws a connector while the converter is inactive, which emits no converter event
+        self.service.apply_all([OwnerUpdate(11, 0, None, FLEXIBLE_TOKEN1, CONVERTER1, owner)], 11)
+        self.assertRaises(QuoteError, self.service.get_return, CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+        self.collect.assert_not_called()
+
+        # the converter becoming active again is collected again on its next quote
+        self.assertEqual({CONVERTER1},
+                         self.service.apply_all([OwnerUpdate(12, 0, None, FLEXIBLE_TOKEN1, owner, CONVERTER1)], 12))
+        self.assertEqual(get_return(withdrawn_pool, TOKEN_A, TOKEN_B, 10 ** 18),
+                         self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18))
+        self.collect.assert_called_once_with(CONVERTER1)
+
+    def test_apply_all_owner_update(self):
+        path = [TOKEN_B, FLEXIBLE_TOKEN2, TOKEN_C]
+        self.service.get_expected_return_by_path(path, 10 ** 18)
+
+        # the converter gives up the ownership of its flexible token, which drops the cached paths
+        self.service.apply_all([OwnerUpdate(11, 0, None, FLEXIBLE_TOKEN2, CONVERTER2, "hx" + "1" * 40)], 11)
+        self.assertRaises(QuoteError, self.service.get_expected_return_by_path, path, 10 ** 18)
+
+    def test_apply_all_configuration(self):
+        owner = "hx" + "1" * 40
+        prev_return = self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+
+        # the connector update is parsed from the block and the cached quote is dropped
+        self.service.ingest([{'height': '0xb', 'time_stamp': '0x0', 'transactions': [
+            {'txHash': '0x01', 'status': '0x1', 'eventLogs': [
+                {'scoreAddress': CONVERTER1, 'indexed': ['ConnectorUpdate(Address,int,bool,int)', TOKEN_B],
+                 'data': [hex(500000), '0x1', hex(BALANCE * 2)]}]}]}])
+        self.assertGreater(self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)['amount'],
+                           prev_return['amount'])
+
+        # the conversions through the converter are rejected while they are disabled
+        self.service.apply_all([ConversionsEnable(12, 0, None, CONVERTER1, 0)], 12)
+        self.assertRaisesRegex(QuoteError, 'required conversions enabled',
+                               self.service.get_return, CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+        self.service.apply_all([ConversionsEnable(13, 0, None, CONVERTER1, 1)], 13)
+        self.service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+
+        # and while the converter does not own its flexible token
+        self.service.apply_all([OwnerUpdate(14, 0, None, FLEXIBLE_TOKEN1, CONVERTER1, owner)], 14)
+        self.assertRaisesRegex(QuoteError, 'required active',
+                               self.service.get_return, CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+        self.collect.assert_not_called()
+
+    def test_cache_size(self):
+        service = QuoteService(self.cache, cache_size=2)
+        for amount in range(1, 4):
+            service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, amount * 10 ** 18)
+        service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 10 ** 18)
+        self.assertEqual((0, 4), (service.hit_count, service.miss_count))
+        service.get_return(CONVERTER1, TOKEN_A, TOKEN_B, 3 * 10 ** 18)
+        self.assertEqual((1, 4), (service.hit_count, service.miss_count))
+
+    def test_ingest(self):
+        blocks = [{
+            'height': '0xb',
+            'time_stamp': '0x0',
+            'transactions': [
+                {'txHash': '0x01', 'status': '0x1', 'eventLogs': [
+                    {'scoreAddress': CONVERTER1, 'indexed': ['ConversionFeeUpdate(int,int)'],
+                     'data': ['0xbb8', '0x0']}]},
+                {'txHash': '0x02', 'status': '0x0', 'eventLogs': [
+                    {'scoreAddress': CONVERTER2, 'indexed': ['ConversionFeeUpdate(int,int)'],
+                     'data': ['0xbb8', '0x0']}]},
+            ]}]
+        self.assertEqual(1, self.service.ingest(blocks))
+        self.assertEqual(0, self.service.ingest(blocks))
+        self.assertEqual(11, self.service.block_height)
+        self.assertEqual(0, self.cache.get(CONVERTER1).conversion_fee)
+        self.assertEqual(3000, self.cache.get(CONVERTER2).conversion_fee)
+
+
+class TestQuoteServer(unittest.TestCase):
+
+    def setUp(self):
+        pools = {}
+        for index in range(100):
+            converter, token = "cx" + "{:040x}".format(1000 + index), "cx" + "{:040x}".format(2000 + index)
+            pools[converter] = create_pool(converter, token, [TOKEN_A, "cx" + "{:040x}".format(index)])
+        self.cache = PoolCache(pools, 10)
+        self.service = QuoteService(self.cache)
+        self.server = QuoteServer(self.service)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        address = self.server.server_address
+        self.connection = HTTPConnection(address[0], address[1])
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _request(self, method: str, target: str, body: bytes = None) -> tuple:
+        self.connection.request(method, target, body)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_get(self):
+        converter = "cx" + "{:040x}".format(1000)
+        token_b = "cx" + "{:040x}".format(0)
+        expected = get_return(self.cache.get(converter), TOKEN_A, token_b, 10 ** 18)
+        status, response = self._request(
+            'GET', f'/getReturn?_converter={converter}&_fromToken={TOKEN_A}&_toToken={token_b}&_amount=0xde0b6b3a7640000')
+        self.assertEqual(200, status)
+        self.assertEqual({'amount': hex(expected['amount']), 'fee': hex(expected['fee'])}, response['result'])
+
+        token = "cx" + "{:040x}".format(2000)
+        status, response = self._request('GET', f'/getExpectedReturnByPath?_path={TOKEN_A},{token},{token_b}'
+                                                f'&_amount=0xde0b6b3a7640000')
+        self.assertEqual((200, hex(expected['amount'])), (status, response['result']))
+
+        status, response = self._request('GET', '/status')
+        self.assertEqual({'blockHeight': '0xa', 'poolCount': '0x64', 'hitCount': '0x1', 'missCount': '0x2'},
+                         response['result'])
+
+        # failure case: errors are answered with 4xx on the same connection
+        status, response = self._request('GET', f'/getReturn?_converter={converter}&_fromToken={TOKEN_A}')
+        self.assertEqual((400, 'missing parameter: _toToken'), (status, response['error']['message']))
+        status, response = self._request('GET', f'/getReturn?_converter={converter}&_fromToken={TOKEN_A}'
+                                                f'&_toToken={TOKEN_A}&_amount=0x1')
+        self.assertEqual(400, status)
+        status, response = self._request('GET', '/unknown')
+        self.assertEqual(404, status)
+
+    def test_post_blocks(self):
+        converter = "cx" + "{:040x}".format(1000)
+        block = {'height': '0xb', 'time_stamp': '0x0', 'transactions': [
+            {'txHash': '0x01', 'status': '0x1', 'eventLogs': [
+                {'scoreAddress': converter, 'indexed': ['ConversionFeeUpdate(int,int)'], 'data': ['0xbb8', '0x0']}]}]}
+        status, response = self._request('POST', '/blocks', json.dumps(block).encode())
+        self.assertEqual((200, '0x1'), (status, response['result']))
+        self.assertEqual(0, self.cache.get(converter).conversion_fee)
+
+        status, response = self._request('POST', '/blocks', b'{}')
+        self.assertEqual(400, status)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, percentile(values, 0.5))
+        self.assertEqual(99, percentile(values, 0.99))
+        self.assertEqual(100, percentile(values, 1))
+        self.assertEqual(0, percentile([], 0.99))
+
+    def test_benchmark_load(self):
+        targets = create_targets(self.cache, 1000)
+        result = run_load(self.server.url, targets, 5000, 4)
+        print('{requests} requests, {errors} errors, {throughput:.0f} req/s, '
+              'p50 = {p50:.3f} ms, p99 = {p99:.3f} ms'.format(**result))
+        self.assertEqual(5000, result['requests'])
+        self.assertEqual(0, result['errors'])
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from os import path
+from tempfile import TemporaryDirectory
+
+from offchain.events import PriceDataUpdate
+from offchain.pool import ConnectorState, PoolState
+from offchain.snapshot import Snapshot, export_snapshot, write_snapshot, encode_address, decode_address
+from tests.offchain import create_call
+
+
+def create_pool(index: int) -> PoolState:
+    converter = "cx" + "%040x" % (index * 7919)
+    connectors = {"cx" + "%040x" % (index * 1000 + i): ConnectorState(10 ** 30 + i, 1000000 // 3, i == 0, i != 1)
+                  for i in range(3)}
+    return PoolState(converter, "cx" + "%040x" % (index + 10 ** 6), 10 ** 25 + index, index, connectors,
+                     index % 5 != 0, index % 7 != 0)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.snapshot_path = path.join(self.temp_dir.name, 'snapshot.bin')
+        self.pools = [create_pool(index) for index in range(1, 51)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_address(self):
+        for address in ["hx" + "0" * 40, "cx" + "ab" * 20]:
+            self.assertEqual(21, len(encode_address(address)))
+            self.assertEqual(address, decode_address(encode_address(address)))
+
+    def test_export(self):
+        calls = {pool.converter: create_call(pool) for pool in self.pools}
+        tokens = {pool.token: pool.converter for pool in self.pools}
+
+        def call(score: str, method: str, params: dict):
+            return calls[tokens.get(score, score)](score, method, params)
+
+        converters = [pool.converter for pool in self.pools]
+        self.assertEqual(50, export_snapshot(self.snapshot_path, call, converters, 100, max_workers=4))
+
+        with Snapshot(self.snapshot_path) as snapshot:
+            self.assertEqual(100, snapshot.block_height)
+            self.assertEqual(50, len(snapshot))
+            self.assertEqual(sorted(converters), sorted(snapshot.get_converters()))
+            for pool in self.pools:
+                self.assertEqual(pool, snapshot.get(pool.converter))
+            self.assertIsNone(snapshot.get("cx" + "f" * 40))
+
+    def test_load(self):
+        write_snapshot(self.snapshot_path, self.pools, 100)
+
+        with Snapshot(self.snapshot_path) as snapshot:
+            cache = snapshot.load()
+        self.assertEqual(100, cache.block_height)
+        self.assertEqual({pool.converter: pool for pool in self.pools}, cache.pools)
+
+        # the events after the snapshot are applied
+        pool = self.pools[0]
+        connector_token = list(pool.connectors)[1]
+        cache.apply_all([PriceDataUpdate(100, 0, None, pool.converter, connector_token, 1, 1, 1),
+                         PriceDataUpdate(101, 0, None, pool.converter, connector_token, 2000, 3000, 1000000 // 3)],
+                        101)
+        self.assertEqual(2000, cache.get(pool.converter).token_supply)
+        self.assertEqual(ConnectorState(3000, 1000000 // 3, False, False),
+                         cache.get(pool.converter).connectors[connector_token])
+
+    def test_invalid_file(self):
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(b'\0' * 64)
+        self.assertRaises(ValueError, Snapshot, self.snapshot_path)
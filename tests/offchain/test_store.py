@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from bisect import bisect_left, bisect_right
+from tempfile import TemporaryDirectory
+
+from offchain.events import Conversion
+from offchain.store import ColumnarStore, get_day, get_days
+
+CONVERTER = "cx" + "1" * 40
+TOKEN1 = "cx" + "2" * 40
+TOKEN2 = "cx" + "3" * 40
+TRADER = "hx" + "4" * 40
+# 2019-06-01 00:00:00 UTC in microseconds
+DAY_BEGIN = 1559347200 * 10 ** 6
+HOUR = 60 * 60 * 10 ** 6
+
+
+def create_conversion(block_height: int, timestamp: int, amount: int) -> Conversion:
+    return Conversion(block_height, timestamp, "0x" + "%064x" % block_height, CONVERTER,
+                      TOKEN1, TOKEN2, TRADER, amount, amount * 2, 10 ** 30)
+
+
+class TestColumnarStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.store = ColumnarStore(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_days(self):
+        self.assertEqual('20190601', get_day(DAY_BEGIN))
+        self.assertEqual('20190601', get_day(DAY_BEGIN + 24 * HOUR - 1))
+        self.assertEqual(['20190601', '20190602', '20190603'], get_days(DAY_BEGIN, DAY_BEGIN + 48 * HOUR))
+
+    def test_partitions(self):
+        # 4 conversions a day for 3 days
+        for block_height in range(12):
+            self.store.append(create_conversion(block_height, DAY_BEGIN + block_height * 6 * HOUR, block_height))
+        self.store.commit(11)
+
+        for day in ['20190601', '20190602', '20190603']:
+            partition = self.store.get_partition('Conversion', CONVERTER, day)
+            self.assertEqual(4, partition.get_row_count())
+        self.assertEqual([CONVERTER], self.store.get_scores('Conversion'))
+
+        # the rows are decoded as appended
+        rows = list(self.store.scan('Conversion', CONVERTER, DAY_BEGIN, DAY_BEGIN + 72 * HOUR))
+        self.assertEqual([create_conversion(block_height, DAY_BEGIN + block_height * 6 * HOUR, block_height)
+                          ._asdict() for block_height in range(12)],
+                         [dict(row, score=CONVERTER) for row in rows])
+
+        # range scan across the partitions
+        rows = self.store.scan('Conversion', CONVERTER, DAY_BEGIN + 18 * HOUR, DAY_BEGIN + 30 * HOUR, ['amount'])
+        self.assertEqual([3, 4, 5], [row['amount'] for row in rows])
+
+    def test_uncommitted_rows(self):
+        for block_height in range(4):
+            self.store.append(create_conversion(block_height, DAY_BEGIN + block_height, block_height))
+        self.store.commit(3)
+
+        # an ingestion interrupted after appending the rows of the blocks 4 and 5
+        store = ColumnarStore(self.temp_dir.name)
+        store.get_partition('Conversion', CONVERTER, '20190601').append(
+            [dict(create_conversion(block_height, DAY_BEGIN + block_height, 0)._asdict())
+             for block_height in (4, 5)])
+
+        store = ColumnarStore(self.temp_dir.name)
+        self.assertEqual(4, len(list(store.scan('Conversion', CONVERTER, DAY_BEGIN, DAY_BEGIN + HOUR))))
+
+        # the rows are cut on the next commit
+        store.append(create_conversion(4, DAY_BEGIN + 4, 4))
+        store.commit(4)
+        self.assertEqual(5, store.get_partition('Conversion', CONVERTER, '20190601').get_row_count())
+        rows = store.scan('Conversion', CONVERTER, DAY_BEGIN, DAY_BEGIN + HOUR, ['amount'])
+        self.assertEqual([0, 1, 2, 3, 4], [row['amount'] for row in rows])
+
+    def test_find_rows(self):
+        # several conversions in the same blocks
+        block_heights = [1, 1, 2, 4, 4, 4, 7, 8, 8, 10]
+        for index, block_height in enumerate(block_heights):
+            self.store.append(create_conversion(block_height, DAY_BEGIN + index, index))
+        self.store.commit(10)
+        partition = self.store.get_partition('Conversion', CONVERTER, '20190601')
+
+        reads = []
+        read_column = partition.read_column
+        partition.read_column = lambda *args: reads.append(args) or read_column(*args)
+        for low, high in [(0, 0), (1, 1), (3, 4), (4, 8), (5, 6), (0, 100), (11, 20), (8, 2)]:
+            begin = bisect_left(block_heights, low)
+            end = max(begin, bisect_right(block_heights, high))
+            self.assertEqual((begin, end), partition.find_rows('block_height', low, high, len(block_heights)))
+        # only the probed values are read, not the whole column
+        self.assertEqual([], reads)
+
+        self.assertEqual((0, 0), partition.find_rows('block_height', 0, 10, 0))
+        self.assertEqual((3, 6), partition.find_rows('block_height', 4, 10, 6))
@@ -15,6 +15,7 @@
 
 import unittest
 from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, Mock, patch
 
 from iconservice import *
 from iconservice.base.exception import RevertException
@@ -22,7 +23,7 @@ from iconservice.base.message import Message
 
 from contracts.score_registry.score_registry import ScoreRegistry
 from contracts.utility.owned import Owned
-from tests import patch_property, ScorePatcher, create_db
+from tests import patch_property, ScorePatcher, create_db, MultiPatch
 
 if TYPE_CHECKING:
     from iconservice.base.address import Address
@@ -31,9 +32,17 @@ if TYPE_CHECKING:
 # noinspection PyUnresolvedReferences
 class TestScoreRegistry(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(ScoreRegistry)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(ScoreRegistry)
-        self.patcher.start()
+        self.patcher.reset()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.registry_score = ScoreRegistry(create_db(self.score_address))
@@ -48,9 +57,6 @@ class TestScoreRegistry(unittest.TestCase):
                 (self.score_address,
                  self.registry_score._score_address[self.registry_score.SCORE_REGISTRY.encode()])
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_getAddress(self):
         # success case: search the registered score address
         registered_score_name = self.registry_score.SCORE_REGISTRY
@@ -62,6 +68,26 @@ class TestScoreRegistry(unittest.TestCase):
         actual_registered_address = self.registry_score.getAddress(unregistered_score_name)
         self.assertEqual(ZERO_SCORE_ADDRESS, actual_registered_address)
 
+    def test_getAddress_single_read(self):
+        score_address = MagicMock(wraps=self.registry_score._score_address)
+        score_address.__getitem__.side_effect = self.registry_score._score_address.__getitem__
+        with patch.object(self.registry_score, '_score_address', score_address):
+            self.registry_score.getAddress(self.registry_score.SCORE_REGISTRY)
+            self.registry_score.getAddress(self.registry_score.NETWORK)
+        self.assertEqual(2, score_address.__getitem__.call_count)
+
+    def test_getAddresses(self):
+        score_names = [self.registry_score.SCORE_REGISTRY, self.registry_score.NETWORK]
+
+        # success case: unregistered names are mapped to the zero score address
+        self.assertEqual({self.registry_score.SCORE_REGISTRY: self.score_address,
+                          self.registry_score.NETWORK: ZERO_SCORE_ADDRESS},
+                         self.registry_score.getAddresses(", ".join(score_names)))
+        self.assertEqual({}, self.registry_score.getAddresses(""))
+
+        # failure case: too many names at once
+        self.assertRaises(RevertException, self.registry_score.getAddresses, ",".join(score_names * 51))
+
     def test_registerAddress(self):
         eoa_address = Address.from_string("hx" + "3" * 40)
         network_id = self.registry_score.NETWORK
@@ -109,3 +135,90 @@ class TestScoreRegistry(unittest.TestCase):
             self.assertEqual(None, self.registry_score._score_address[network_id])
 
             self.registry_score.AddressUpdate.assert_called_with(network_id, ZERO_SCORE_ADDRESS)
+
+    def _create_converter_interface(self, flexible_token: 'Address', connector_tokens: list) -> Mock:
+        return Mock(getToken=Mock(return_value=flexible_token),
+                    getConnectorTokenCount=Mock(return_value=len(connector_tokens)),
+                    getConnectorAt=Mock(side_effect=lambda index: connector_tokens[index]))
+
+    def test_registerConverter(self):
+        converter = Address.from_string("cx" + "2" * 40)
+        flexible_token = Address.from_string("cx" + "3" * 40)
+        connector_tokens = [Address.from_string("cx" + "4" * 40), Address.from_string("cx" + "5" * 40)]
+        converter_interface = self._create_converter_interface(flexible_token, connector_tokens)
+
+        with MultiPatch([patch.object(ScoreRegistry, 'create_interface_score', return_value=converter_interface),
+                         patch_property(IconScoreBase, 'msg', Message(self.registry_owner))]):
+            # failure case: only SCORE address can be registered
+            self.assertRaises(RevertException,
+                              self.registry_score.registerConverter, Address.from_string("hx" + "2" * 40))
+
+            # success case: register the converter with its flexible token and connector tokens
+            self.registry_score.registerConverter(converter)
+            self.registry_score.ConverterAdd.assert_called_with(converter, flexible_token)
+            self.assertEqual(1, self.registry_score.getConverterCount())
+            self.assertEqual([converter], self.registry_score.getConverters(0, 100))
+            self.assertEqual([flexible_token], self.registry_score.getFlexibleTokens(0, 100))
+            self.assertEqual(converter, self.registry_score.getConverter(flexible_token))
+            for connector_token in connector_tokens:
+                self.assertEqual([converter], self.registry_score.getConvertersByConnector(connector_token, 0, 100))
+
+            # success case: registering again refreshes the connector tokens only
+            self.registry_score.ConverterAdd.reset_mock()
+            new_connector_token = Address.from_string("cx" + "6" * 40)
+            connector_tokens[1] = new_connector_token
+            self.registry_score.registerConverter(converter)
+            self.registry_score.ConverterAdd.assert_not_called()
+            self.assertEqual(1, self.registry_score.getConverterCount())
+            self.assertEqual([], self.registry_score.getConvertersByConnector(Address.from_string("cx" + "5" * 40),
+                                                                              0, 100))
+            self.assertEqual([converter], self.registry_score.getConvertersByConnector(new_connector_token, 0, 100))
+
+            # failure case: the flexible token is registered with another converter
+            self.assertRaises(RevertException,
+                              self.registry_score.registerConverter, Address.from_string("cx" + "7" * 40))
+
+        self.registry_score.require_owner_only.assert_called()
+
+    def test_unregisterConverter(self):
+        connector_token = Address.from_string("cx" + "4" * 40)
+        converters = [Address.from_string("cx" + str(index) * 40) for index in range(5, 8)]
+        flexible_tokens = [Address.from_string("cx" + chr(ord('a') + index) * 40) for index in range(3)]
+
+        with patch_property(IconScoreBase, 'msg', Message(self.registry_owner)):
+            for converter, flexible_token in zip(converters, flexible_tokens):
+                converter_interface = self._create_converter_interface(flexible_token, [connector_token])
+                with patch.object(ScoreRegistry, 'create_interface_score', return_value=converter_interface):
+                    self.registry_score.registerConverter(converter)
+
+            # failure case: try to unregister not registered converter
+            self.assertRaises(RevertException,
+                              self.registry_score.unregisterConverter, Address.from_string("cx" + "8" * 40))
+
+            # success case: the last converter takes the place of the removed one
+            self.registry_score.unregisterConverter(converters[0])
+            self.registry_score.ConverterRemove.assert_called_with(converters[0], flexible_tokens[0])
+            self.assertEqual([converters[2], converters[1]], self.registry_score.getConverters(0, 100))
+            self.assertEqual([flexible_tokens[2], flexible_tokens[1]], self.registry_score.getFlexibleTokens(0, 100))
+            self.assertEqual(ZERO_SCORE_ADDRESS, self.registry_score.getConverter(flexible_tokens[0]))
+            self.assertEqual(2, self.registry_score.getConverterCountByConnector(connector_token))
+            self.assertEqual([converters[2], converters[1]],
+                             self.registry_score.getConvertersByConnector(connector_token, 0, 100))
+
+    def test_getConverters_page(self):
+        converters = [Address.from_string("cx" + f'{index:040x}') for index in range(1, 4)]
+        with patch_property(IconScoreBase, 'msg', Message(self.registry_owner)):
+            for index, converter in enumerate(converters):
+                flexible_token = Address.from_string("cx" + f'{index + 100:040x}')
+                converter_interface = self._create_converter_interface(flexible_token, [])
+                with patch.object(ScoreRegistry, 'create_interface_score', return_value=converter_interface):
+                    self.registry_score.registerConverter(converter)
+
+        self.assertEqual(converters[:2], self.registry_score.getConverters(0, 2))
+        self.assertEqual(converters[2:], self.registry_score.getConverters(2, 2))
+        self.assertEqual([], self.registry_score.getConverters(3, 2))
+
+        # failure case: invalid offset and limit
+        self.assertRaises(RevertException, self.registry_score.getConverters, -1, 2)
+        self.assertRaises(RevertException, self.registry_score.getConverters, 0, 0)
+        self.assertRaises(RevertException, self.registry_score.getConverters, 0, 101)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+from multiprocessing import Pool
+
+# a soak run draws random seeds and runs them on every CPU, otherwise the fixed seeds run in this process
+SOAK_ENV = 'DEX_SOAK'
+DEFAULT_SEEDS = [1, 2, 3, 4]
+
+
+def is_soak_run() -> bool:
+    return bool(os.environ.get(SOAK_ENV))
+
+
+def get_seeds(replay_env: str) -> list:
+    """
+    Returns the seeds to run, which are the seed to replay if it is set in the environment variable,
+    random seeds as many as the CPUs on a soak run, or the fixed seeds
+
+    :param replay_env: name of the environment variable of the seed to replay
+    :return: list of seeds
+    """
+    if replay_env in os.environ:
+        return [int(os.environ[replay_env])]
+    if is_soak_run():
+        return [random.randrange(2 ** 32) for _ in range(os.cpu_count() or 1)]
+    return list(DEFAULT_SEEDS)
+
+
+def run_seeds(check_seed: callable, seeds: list) -> list:
+    """
+    Runs the check on every seed, in a process pool on a soak run
+
+    :param check_seed: function taking a seed, defined at module level to be sent to the processes
+    :param seeds: list of seeds
+    :return: list of the results, in the order of the seeds
+    """
+    if not is_soak_run() or len(seeds) == 1:
+        return [check_seed(seed) for seed in seeds]
+
+    with Pool(min(os.cpu_count() or 1, len(seeds))) as pool:
+        return pool.map(check_seed, seeds)
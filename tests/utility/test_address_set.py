@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice import *
+
+from contracts.utility.address_set import AddressSet
+from tests import create_db
+
+
+class TestAddressSet(unittest.TestCase):
+
+    def setUp(self):
+        self.db = create_db(Address.from_string("cx" + "1" * 40))
+        self.address_set = AddressSet('holders', self.db)
+        self.addresses = [Address.from_string("hx" + str(i) * 40) for i in range(1, 5)]
+
+    def test_add(self):
+        for address in self.addresses:
+            self.assertTrue(self.address_set.add(address))
+        self.assertFalse(self.address_set.add(self.addresses[0]))
+
+        self.assertEqual(len(self.addresses), len(self.address_set))
+        self.assertEqual(self.addresses, self.address_set.slice(0, 10))
+        for address in self.addresses:
+            self.assertIn(address, self.address_set)
+
+    def test_remove(self):
+        for address in self.addresses:
+            self.address_set.add(address)
+
+        # the last address is moved into the position of the removed one
+        self.assertTrue(self.address_set.remove(self.addresses[1]))
+        self.assertNotIn(self.addresses[1], self.address_set)
+        self.assertEqual([self.addresses[0], self.addresses[3], self.addresses[2]], self.address_set.slice(0, 10))
+
+        # removes the last address
+        self.assertTrue(self.address_set.remove(self.addresses[2]))
+        self.assertEqual([self.addresses[0], self.addresses[3]], self.address_set.slice(0, 10))
+
+        self.assertFalse(self.address_set.remove(self.addresses[2]))
+
+        # the positions are kept consistent after removal
+        self.assertTrue(self.address_set.remove(self.addresses[3]))
+        self.assertTrue(self.address_set.remove(self.addresses[0]))
+        self.assertEqual(0, len(self.address_set))
+
+        self.assertTrue(self.address_set.add(self.addresses[2]))
+        self.assertEqual([self.addresses[2]], self.address_set.slice(0, 10))
+
+    def test_slice(self):
+        for address in self.addresses:
+            self.address_set.add(address)
+
+        self.assertEqual(self.addresses[1:3], self.address_set.slice(1, 2))
+        self.assertEqual(self.addresses[3:], self.address_set.slice(3, 2))
+        self.assertEqual([], self.address_set.slice(4, 2))
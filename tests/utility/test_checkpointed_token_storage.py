@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice import *
+
+from contracts.utility.checkpointed_token_storage import CheckpointedTokenStorage
+from tests import create_db, count_db_access
+
+
+class TestCheckpointedTokenStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.db = create_db(Address.from_string("cx" + "1" * 40))
+        self.balances = DictDB('balances', self.db, value_type=int)
+        self.total_supply = VarDB('total_supply', self.db, value_type=int)
+        self.block_height = 0
+        self.token_storage = CheckpointedTokenStorage(self.balances, self.total_supply, self.db,
+                                                      lambda: self.block_height)
+
+        self.holder = Address.from_string("hx" + "2" * 40)
+        self.receiver = Address.from_string("hx" + "3" * 40)
+
+    def test_start_on_install(self):
+        # a token can be installed at the block height 0
+        self.token_storage.start()
+        self.assertTrue(self.token_storage.is_started())
+        self.assertEqual(0, self.token_storage.get_start_height())
+        self.token_storage.issue(self.holder, 100)
+
+        self.block_height = 10
+        self.token_storage.start()
+        self.assertEqual(0, self.token_storage.get_start_height())
+        self.token_storage.transfer(self.holder, self.receiver, 30)
+
+        self.assertEqual(100, self.token_storage.get_balance_at(self.holder, 9))
+        self.assertEqual(70, self.token_storage.get_balance_at(self.holder, 10))
+        self.assertEqual(0, self.token_storage.get_balance_at(self.receiver, 9))
+        self.assertEqual(30, self.token_storage.get_balance_at(self.receiver, 10))
+        self.assertEqual(100, self.token_storage.get_total_supply_at(10))
+
+    def test_start_on_update(self):
+        # balances and the total supply of a token deployed without the checkpoints
+        self.balances[self.holder] = 100
+        self.balances[self.receiver] = 10
+        self.total_supply.set(110)
+
+        self.block_height = 20
+        self.token_storage.start()
+        self.assertEqual(20, self.token_storage.get_start_height())
+
+        # values which have not changed since the start are the current ones
+        self.assertEqual(100, self.token_storage.get_balance_at(self.holder, 20))
+        self.assertEqual(10, self.token_storage.get_balance_at(self.receiver, 25))
+        self.assertEqual(110, self.token_storage.get_total_supply_at(25))
+
+        # the value held since before the start is recorded at the start height with the first change
+        self.block_height = 30
+        self.token_storage.transfer(self.holder, self.receiver, 40)
+        self.token_storage.destroy(self.receiver, 50)
+        self.assertEqual(2, len(self.token_storage.get_balance_checkpoints(self.holder)))
+        self.assertEqual(2, len(self.token_storage.get_total_supply_checkpoints()))
+
+        expected = [(20, 100, 10, 110), (29, 100, 10, 110), (30, 60, 0, 60), (40, 60, 0, 60)]
+        for height, holder_balance, receiver_balance, total_supply in expected:
+            self.assertEqual(holder_balance, self.token_storage.get_balance_at(self.holder, height))
+            self.assertEqual(receiver_balance, self.token_storage.get_balance_at(self.receiver, height))
+            self.assertEqual(total_supply, self.token_storage.get_total_supply_at(height))
+
+    def test_start_on_update_in_same_block(self):
+        self.balances[self.holder] = 100
+        self.total_supply.set(100)
+
+        self.block_height = 20
+        self.token_storage.start()
+        self.token_storage.transfer(self.holder, self.receiver, 40)
+
+        # the change in the start block overwrites the value held before
+        self.assertEqual(1, len(self.token_storage.get_balance_checkpoints(self.holder)))
+        self.assertEqual(60, self.token_storage.get_balance_at(self.holder, 20))
+        self.assertEqual(40, self.token_storage.get_balance_at(self.receiver, 20))
+
+    def test_single_access(self):
+        # the checkpoints are kept in another db, to count the access to the balances and the total supply only
+        db = create_db(Address.from_string("cx" + "5" * 40))
+        balances = DictDB('balances', db, value_type=int)
+        total_supply = VarDB('total_supply', db, value_type=int)
+        token_storage = CheckpointedTokenStorage(balances, total_supply, self.db, lambda: self.block_height)
+        token_storage.start()
+        balances[self.holder] = 100
+        total_supply.set(100)
+
+        self.block_height = 1
+        for operation, amount in [(token_storage.issue, 50), (token_storage.destroy, 30)]:
+            get_counter, put_counter = count_db_access(db)
+            operation(self.holder, amount)
+
+            # the balance of the holder and the total supply are read once and written once
+            self.assertEqual(2, len(get_counter))
+            self.assertEqual(2, len(put_counter))
+            self.assertTrue(all(count == 1 for count in get_counter.values()))
+            self.assertTrue(all(count == 1 for count in put_counter.values()))
+
+        self.assertEqual(120, balances[self.holder])
+        self.assertEqual(100, token_storage.get_total_supply_at(0))
+        self.assertEqual(120, token_storage.get_total_supply_at(self.block_height))
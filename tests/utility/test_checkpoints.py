@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice import *
+
+from contracts.utility.checkpoints import Checkpoints
+from tests import create_db
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.db = create_db(Address.from_string("cx" + "1" * 40))
+        self.checkpoints = Checkpoints('balance', self.db)
+
+    def test_record(self):
+        self.checkpoints.record(10, 100)
+        self.checkpoints.record(10, 200)
+        self.assertEqual(1, len(self.checkpoints))
+
+        self.checkpoints.record(11, 300)
+        self.assertEqual(2, len(Checkpoints('balance', self.db)))
+
+    def test_get_at(self):
+        self.assertEqual(0, self.checkpoints.get_at(10))
+
+        for height in range(10, 110, 10):
+            self.checkpoints.record(height, height * 2)
+
+        self.assertEqual(0, self.checkpoints.get_at(9))
+        for height in range(10, 110, 10):
+            self.assertEqual(height * 2, self.checkpoints.get_at(height))
+            self.assertEqual(height * 2, self.checkpoints.get_at(height + 9))
+        self.assertEqual(200, self.checkpoints.get_at(1000))
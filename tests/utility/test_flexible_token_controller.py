@@ -29,9 +29,17 @@ from tests import MultiPatch, patch_property, ScorePatcher, create_db, assert_in
 # noinspection PyUnresolvedReferences
 class TestFlexibleTokenController(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(IcxToken)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(IcxToken)
-        self.patcher.start()
+        self.patcher.reset()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.flexible_token_address = Address.from_string("cx" + "2" * 40)
@@ -46,9 +54,6 @@ class TestFlexibleTokenController(unittest.TestCase):
             TokenHolder.on_install.assert_called_with(self.score)
             mocks[1].assert_called()
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_transferTokenOwnership(self):
         new_owner = Address.from_string("hx" + "3" * 40)
 
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice import *
+
+from contracts.utility.holder_index import HolderIndex
+from contracts.utility.token_storage import TokenStorage
+from tests import create_db, count_db_access
+
+
+class TestHolderIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.db = create_db(Address.from_string("cx" + "1" * 40))
+        self.balances = DictDB('balances', self.db, value_type=int)
+        self.total_supply = VarDB('total_supply', self.db, value_type=int)
+        self.holder_index = HolderIndex(self.db)
+        self.holder_index.enable()
+        self.token_storage = TokenStorage(self.balances, self.total_supply, self.holder_index)
+
+        self.holder = Address.from_string("hx" + "2" * 40)
+        self.receiver1 = Address.from_string("hx" + "3" * 40)
+        self.receiver2 = Address.from_string("hx" + "4" * 40)
+        self.token_storage.issue(self.holder, 100)
+
+    def _get_holders(self) -> list:
+        return HolderIndex(self.db).holders.slice(0, 10)
+
+    def test_transitions(self):
+        self.assertEqual([self.holder], self._get_holders())
+
+        self.token_storage.transfer(self.holder, self.receiver1, 30)
+        self.token_storage.transfer_batch(self.holder, {self.receiver1: 10, self.receiver2: 10})
+        self.assertEqual([self.holder, self.receiver1, self.receiver2], self._get_holders())
+
+        # transitions to zero balance
+        self.token_storage.transfer(self.holder, self.receiver2, 50)
+        self.assertEqual([self.receiver2, self.receiver1], self._get_holders())
+        self.token_storage.destroy(self.receiver1, 40)
+        self.assertEqual([self.receiver2], self._get_holders())
+
+        # zero value does not make a holder
+        self.token_storage.transfer(self.receiver1, self.holder, 0)
+        self.token_storage.issue(self.receiver1, 0)
+        self.assertEqual([self.receiver2], self._get_holders())
+
+    def test_transfer_between_holders(self):
+        self.token_storage.transfer(self.holder, self.receiver1, 30)
+
+        # the index is not touched without transitions from or to zero balance
+        get_counter, put_counter = count_db_access(self.db)
+        token_storage = TokenStorage(self.balances, self.total_supply, HolderIndex(self.db))
+        token_storage.transfer(self.holder, self.receiver1, 30)
+        self.assertEqual(2, len(get_counter))
+        self.assertEqual(2, len(put_counter))
+
+    def test_disabled(self):
+        db = create_db(Address.from_string("cx" + "5" * 40))
+        holder_index = HolderIndex(db)
+        token_storage = TokenStorage(DictDB('balances', db, value_type=int),
+                                     VarDB('total_supply', db, value_type=int),
+                                     holder_index)
+        token_storage.issue(self.holder, 100)
+
+        self.assertFalse(holder_index.is_enabled())
+        self.assertEqual(0, len(HolderIndex(db).holders))
+
+    def test_enable_after_balances(self):
+        db = create_db(Address.from_string("cx" + "6" * 40))
+        holder_index = HolderIndex(db)
+        token_storage = TokenStorage(DictDB('balances', db, value_type=int),
+                                     VarDB('total_supply', db, value_type=int),
+                                     holder_index)
+        token_storage.issue(self.holder, 100)
+        token_storage.transfer(self.holder, self.receiver1, 100)
+
+        holder_index.enable()
+        # the holder which has not been backfilled moves its whole balance
+        token_storage.transfer(self.receiver1, self.receiver2, 100)
+        self.assertEqual([self.receiver2], HolderIndex(db).holders.slice(0, 10))
+
+        # only accounts holding a balance are backfilled, once
+        self.assertFalse(holder_index.add_holder(self.holder, 0))
+        self.assertTrue(holder_index.add_holder(self.receiver1, 10))
+        self.assertFalse(holder_index.add_holder(self.receiver1, 10))
+        self.assertEqual([self.receiver2, self.receiver1], HolderIndex(db).holders.slice(0, 10))
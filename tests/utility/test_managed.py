@@ -25,9 +25,17 @@ from tests import patch_property, ScorePatcher, create_db
 
 class TestManaged(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(Managed)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(Managed)
-        self.patcher.start()
+        self.patcher.reset()
 
         score_address = Address.from_string("cx" + "1" * 40)
         self.score = Managed(create_db(score_address))
@@ -38,9 +46,6 @@ class TestManaged(unittest.TestCase):
             self.assertEqual(self.sender, self.score._manager.get())
             self.assertEqual(ZERO_SCORE_ADDRESS, self.score._new_manager.get())
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_getManager(self):
         actual_manager = self.score.getManager()
         self.assertEqual(self.score._manager.get(), actual_manager)
@@ -26,9 +26,17 @@ from tests import patch_property, ScorePatcher, create_db
 
 class TestOwned(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(Owned)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(Owned)
-        self.patcher.start()
+        self.patcher.reset()
 
         score_address = Address.from_string("cx" + "1" * 40)
         self.score = Owned(create_db(score_address))
@@ -39,9 +47,6 @@ class TestOwned(unittest.TestCase):
             self.assertEqual(self.sender, self.score._owner.get())
             self.assertEqual(ZERO_SCORE_ADDRESS, self.score._new_owner.get())
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_getOwner(self):
         actual_owner = self.score.getOwner()
         self.assertEqual(self.score._owner.get(), actual_owner)
@@ -44,6 +44,21 @@ class ABCToken3(ABCToken1):
         pass
 
 
+class ABCToken4(ABC):
+    DECIMALS = 18
+
+    @abstractmethod
+    def transfer(self, _to: Address, _value: int, _data: bytes = None):
+        pass
+
+
+class ABCToken5(ABC):
+
+    @abstractmethod
+    def transfer(self, _to: Address, _value: int, _data: bytes = None):
+        pass
+
+
 ScoreInterface = ProxyScore(ABCToken1)
 
 
@@ -72,6 +87,47 @@ class TestProxyScore(unittest.TestCase):
         # asserts parent function exists
         self.assertTrue(hasattr(InheritedScoreInterface, 'transfer'))
 
+    def test_proxy_lazy_creation(self):
+        LazyScoreInterface = ProxyScore(ABCToken4)
+        proxy_class_cache = ProxyScore.__dict__.get('_proxy_class_cache', {})
+
+        # the interface SCORE class is not created on declaration
+        self.assertNotIn(ABCToken4, proxy_class_cache)
+        self.assertEqual('ProxyScore(ABCToken4)', LazyScoreInterface.__name__)
+
+        # constants of the abc class do not create it either
+        self.assertEqual(18, LazyScoreInterface.DECIMALS)
+        self.assertNotIn(ABCToken4, ProxyScore.__dict__.get('_proxy_class_cache', {}))
+
+        # the interface SCORE class is created on the first use
+        score = LazyScoreInterface(Mock(Address), Mock(IconScoreBase))
+        self.assertIn(ABCToken4, ProxyScore.__dict__['_proxy_class_cache'])
+        self.assertIsInstance(score, ABCToken4)
+        self.assertIs(ProxyScore.__dict__['_proxy_class_cache'][ABCToken4], LazyScoreInterface.get_proxy_class())
+
+    def test_proxy_class_compatibility(self):
+        CompatibleScoreInterface = ProxyScore(ABCToken5)
+
+        class Token5(ABCToken5):
+            def transfer(self, _to: Address, _value: int, _data: bytes = None):
+                pass
+
+        # objects which are not of the abc class do not create the interface SCORE class
+        self.assertNotIsInstance(object(), CompatibleScoreInterface)
+        self.assertFalse(issubclass(int, CompatibleScoreInterface))
+        self.assertNotIn(ABCToken5, ProxyScore.__dict__.get('_proxy_class_cache', {}))
+
+        # the handle works as the interface SCORE class in isinstance and issubclass checks
+        score = CompatibleScoreInterface(Mock(Address), Mock(IconScoreBase))
+        self.assertIsInstance(score, CompatibleScoreInterface)
+        self.assertTrue(issubclass(CompatibleScoreInterface.get_proxy_class(), CompatibleScoreInterface))
+        self.assertNotIsInstance(score, ScoreInterface)
+        self.assertNotIsInstance(Token5(), CompatibleScoreInterface)
+        self.assertFalse(issubclass(Token5, CompatibleScoreInterface))
+
+        self.assertEqual('ProxyScore(ABCToken5)', CompatibleScoreInterface.__qualname__)
+        self.assertEqual(ABCToken5.__module__, CompatibleScoreInterface.__module__)
+
     def test_proxy_call(self):
         # tests the proxy call
 
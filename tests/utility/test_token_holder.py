@@ -28,9 +28,17 @@ from tests import patch_property, ScorePatcher, create_db, MultiPatch
 
 
 class TestTokenHolder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = ScorePatcher(TokenHolder)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
-        self.patcher = ScorePatcher(TokenHolder)
-        self.patcher.start()
+        self.patcher.reset()
 
         self.score_address = Address.from_string("cx" + "1" * 40)
         self.token_holder = TokenHolder(create_db(self.score_address))
@@ -40,9 +48,6 @@ class TestTokenHolder(unittest.TestCase):
             self.token_holder.on_install()
             Owned.on_install.assert_called_with(self.token_holder)
 
-    def tearDown(self):
-        self.patcher.stop()
-
     def test_withdrawTokens(self):
         token_address = Address.from_string("cx" + "2" * 40)
         token_receiver = Address.from_string("hx" + "3" * 40)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice import *
+from iconservice.base.exception import RevertException
+
+from contracts.utility.token_storage import TokenStorage
+from tests import create_db, count_db_access
+
+
+class TestTokenStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.db = create_db(Address.from_string("cx" + "1" * 40))
+        self.balances = DictDB('balances', self.db, value_type=int)
+        self.total_supply = VarDB('total_supply', self.db, value_type=int)
+        self.token_storage = TokenStorage(self.balances, self.total_supply)
+
+        self.holder = Address.from_string("hx" + "2" * 40)
+        self.receiver1 = Address.from_string("hx" + "3" * 40)
+        self.receiver2 = Address.from_string("cx" + "4" * 40)
+
+        self.balances[self.holder] = 100
+        self.balances[self.receiver1] = 10
+        self.total_supply.set(110)
+
+        # counts the storage access from here
+        self.get_counter, self.put_counter = count_db_access(self.db)
+
+    def _assert_single_access(self, touched_key_count: int):
+        # each touched key is read once and written once
+        self.assertEqual(touched_key_count, len(self.get_counter))
+        self.assertEqual(touched_key_count, len(self.put_counter))
+        self.assertTrue(all(count == 1 for count in self.get_counter.values()))
+        self.assertTrue(all(count == 1 for count in self.put_counter.values()))
+
+    def test_transfer(self):
+        self.token_storage.transfer(self.holder, self.receiver1, 30)
+        # balances of the sender and the receiver
+        self._assert_single_access(2)
+
+        self.assertEqual(70, self.balances[self.holder])
+        self.assertEqual(40, self.balances[self.receiver1])
+
+    def test_transfer_out_of_balance(self):
+        self.assertRaises(RevertException, self.token_storage.transfer, self.holder, self.receiver1, 101)
+
+        # only the sender's balance is read and nothing is written
+        self.assertEqual(1, len(self.get_counter))
+        self.assertEqual(0, len(self.put_counter))
+
+    def test_transfer_batch(self):
+        self.token_storage.transfer_batch(self.holder, {self.receiver1: 30, self.receiver2: 20})
+        # balances of the sender and both receivers
+        self._assert_single_access(3)
+
+        self.assertEqual(50, self.balances[self.holder])
+        self.assertEqual(40, self.balances[self.receiver1])
+        self.assertEqual(20, self.balances[self.receiver2])
+
+    def test_transfer_batch_to_sender(self):
+        self.token_storage.transfer_batch(self.holder, {self.receiver1: 30, self.holder: 20})
+        self._assert_single_access(2)
+
+        self.assertEqual(70, self.balances[self.holder])
+        self.assertEqual(40, self.balances[self.receiver1])
+
+        self.assertRaises(RevertException,
+                          self.token_storage.transfer_batch, self.holder, {self.receiver1: 60, self.receiver2: 50})
+
+    def test_issue(self):
+        self.token_storage.issue(self.receiver2, 50)
+        # balance of the receiver and the total supply
+        self._assert_single_access(2)
+
+        self.assertEqual(50, self.balances[self.receiver2])
+        self.assertEqual(160, self.total_supply.get())
+
+    def test_destroy(self):
+        self.token_storage.destroy(self.holder, 40)
+        # balance of the holder and the total supply
+        self._assert_single_access(2)
+
+        self.assertEqual(60, self.balances[self.holder])
+        self.assertEqual(70, self.total_supply.get())
+
+        self.assertRaises(RevertException, self.token_storage.destroy, self.holder, 61)